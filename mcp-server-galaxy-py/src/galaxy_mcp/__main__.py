@@ -24,8 +24,18 @@ def run() -> None:
         "--path",
         help="Optional HTTP path when using streamable transports.",
     )
+    parser.add_argument(
+        "--disable-prefetch",
+        action="store_true",
+        help="Don't warm the tool panel and IWC caches in the background "
+        "(useful when a server is started per tool call).",
+    )
     args = parser.parse_args()
 
+    if args.disable_prefetch:
+        os.environ["GALAXY_MCP_DISABLE_PREFETCH"] = "1"
+    server.prefetch_caches()
+
     selected = (args.transport or os.environ.get("GALAXY_MCP_TRANSPORT") or "stdio").lower()
     if selected in {"streamable-http", "sse"}:
         server.run_http_server(
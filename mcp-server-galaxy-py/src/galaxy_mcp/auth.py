@@ -2,14 +2,23 @@
 
 from __future__ import annotations
 
+import asyncio
 import base64
+import bisect
+import functools
+import gzip
 import hashlib
+import hmac
+import html
 import inspect
 import json
 import logging
 import secrets
+import string
 import textwrap
+import threading
 import time
+from collections import OrderedDict
 from collections.abc import Callable
 from dataclasses import dataclass
 from pathlib import Path
@@ -17,8 +26,7 @@ from typing import Any
 from urllib.parse import urlparse
 
 import anyio
-import requests
-from bioblend.galaxy import GalaxyInstance
+import httpx
 from cryptography.fernet import Fernet, InvalidToken
 from fastmcp.server.auth.auth import (
     AccessToken as FastMCPAccessToken,
@@ -57,11 +65,34 @@ except ImportError:  # pragma: no cover - Python < 3.12 without typing.override
             return func
 
 
+try:  # pragma: no cover - optional speedup
+    import orjson  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - orjson not installed
+    orjson = None  # type: ignore[assignment]
+
+try:  # pragma: no cover - optional speedup
+    import rfernet  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - rfernet not installed
+    rfernet = None  # type: ignore[assignment]
+
+
 logger = logging.getLogger(__name__)
 
 AUTH_CODE_TTL_SECONDS = 5 * 60
 ACCESS_TOKEN_TTL_SECONDS = 60 * 60
 REFRESH_TOKEN_TTL_SECONDS = 7 * 24 * 60 * 60
+TOKEN_CACHE_TTL_SECONDS = 60
+TOKEN_CACHE_MAX_ENTRIES = 4096
+MAX_PENDING_TRANSACTIONS = 1024
+API_KEY_CACHE_TTL_SECONDS = 60
+API_KEY_CACHE_MAX_ENTRIES = 256
+MAX_CONCURRENT_LOGINS = 20
+# Registrations arriving within this window are written to the client registry together
+CLIENT_REGISTRY_FLUSH_DELAY_SECONDS = 0.25
+
+# Pre-encoded bodies for the login handler's fixed error responses
+_MISSING_TXN_BODY = b"Missing transaction identifier."
+_STALE_TXN_BODY = b"Authorization request is no longer valid."
 
 LOGIN_PATH = "/galaxy-auth/login"
 RESOURCE_METADATA_PATH = "/.well-known/oauth-protected-resource"
@@ -104,6 +135,269 @@ GALAXY_LOGO_DATA_URI = (
 )
 
 
+# The login page, dedented and given its logos once at import.
+_LOGIN_FORM_TEMPLATE = (
+    textwrap.dedent(
+        """
+    <html lang="en">
+        <head>
+            <meta charset="utf-8" />
+            <meta name="viewport" content="width=device-width, initial-scale=1" />
+            <title>Authorize ChatGPT for Galaxy</title>
+            <style>
+                :root {{ color-scheme: light dark; }}
+                body {{
+                    margin: 0;
+                    min-height: 100vh;
+                    display: flex;
+                    align-items: center;
+                    justify-content: center;
+                    background:
+                        radial-gradient(
+                            circle at 20% 20%,
+                            #4c6ef5 0%,
+                            #2a2f4f 60%,
+                            #0b0d26 100%
+                        );
+                    font-family: "Segoe UI", system-ui, -apple-system, sans-serif;
+                    color: #101223;
+                }}
+                .card {{
+                    width:
+                        min(440px, calc(100% - 40px));
+                    background: rgba(255, 255, 255, 0.96);
+                    border-radius: 18px;
+                    box-shadow: 0 18px 45px rgba(14, 20, 56, 0.25);
+                    padding: 34px 38px;
+                    box-sizing: border-box;
+                }}
+                .logo-strip {{
+                    display: flex;
+                    align-items: center;
+                    justify-content: center;
+                    gap: 18px;
+                    margin-bottom: 20px;
+                }}
+                .logo {{
+                    position: relative;
+                    width: 72px;
+                    height: 72px;
+                    border-radius: 18px;
+                    flex: 0 0 72px;
+                    display: flex;
+                    align-items: center;
+                    justify-content: center;
+                    overflow: hidden;
+                }}
+                .logo::after {{
+                    content: "";
+                    position: absolute;
+                    inset: 0;
+                    background-size: cover;
+                    background-position: center;
+                    background-repeat: no-repeat;
+                }}
+                .logo-chatgpt::after {{
+                    background-image:
+                        url("{chatgpt_logo}");
+                }}
+                .logo-galaxy::after {{
+                    background-image:
+                        url("{galaxy_logo}");
+                }}
+                .arrow {{
+                    font-size: 2.5rem;
+                    color: rgba(20, 33, 92, 0.85);
+                }}
+                .card h1 {{
+                    margin: 0 0 12px;
+                    font-size: 1.6rem;
+                    color: #14215c;
+                }}
+                .card p {{
+                    margin: 0 0 18px;
+                    line-height: 1.5;
+                }}
+                form {{
+                    display: grid;
+                    gap: 16px;
+                }}
+                label {{
+                    font-weight: 600;
+                    font-size: 0.95rem;
+                    color: #202552;
+                }}
+                input {{
+                    width: 100%;
+                    padding: 12px 14px;
+                    border-radius: 10px;
+                    border: 1px solid rgba(20, 33, 92, 0.25);
+                    font-size: 1rem;
+                    transition: border-color 0.2s ease, box-shadow 0.2s ease;
+                    background: rgba(255, 255, 255, 0.95);
+                }}
+                input:focus {{
+                    outline: none;
+                    border-color: #4c6ef5;
+                    box-shadow: 0 0 0 3px rgba(76, 110, 245, 0.25);
+                }}
+                button {{
+                    margin-top: 8px;
+                    padding: 13px 16px;
+                    border-radius: 12px;
+                    border: none;
+                    background: linear-gradient(135deg, #4c6ef5, #5f9bff);
+                    color: white;
+                    font-size: 1rem;
+                    font-weight: 600;
+                    cursor: pointer;
+                    transition: transform 0.2s ease, box-shadow 0.2s ease;
+                }}
+                button:hover {{
+                    transform: translateY(-1px);
+                    box-shadow: 0 12px 24px rgba(19, 64, 216, 0.3);
+                }}
+                .fine-print {{
+                    margin-top: 12px;
+                    font-size: 0.85rem;
+                    color: #4b4f70;
+                }}
+                .alert {{
+                    padding: 12px 16px;
+                    border-radius: 10px;
+                    background: rgba(220, 53, 69, 0.1);
+                    color: #9e1c2f;
+                    border: 1px solid rgba(220, 53, 69, 0.35);
+                    margin-bottom: 18px;
+                }}
+                @media (prefers-color-scheme: dark) {{
+                    .card {{
+                        background: rgba(16, 18, 35, 0.88);
+                        color: #eef0ff;
+                    }}
+                    label {{ color: #c9d1ff; }}
+                    input {{
+                        background: rgba(10, 12, 26, 0.9);
+                        color: #eef0ff;
+                        border-color: rgba(128, 140, 255, 0.35);
+                    }}
+                    .fine-print {{ color: rgba(216, 220, 255, 0.75); }}
+                    .arrow {{ color: rgba(224, 231, 255, 0.9); }}
+                }}
+            </style>
+        </head>
+        <body>
+            <main class="card" role="dialog" aria-labelledby="title">
+                <div class="logo-strip" aria-hidden="true">
+                    <div class="logo logo-chatgpt"></div>
+                    <span class="arrow">→</span>
+                    <div class="logo logo-galaxy"></div>
+                </div>
+                <h1 id="title">Allow ChatGPT to access Galaxy</h1>
+                <p>Sign in to <strong>{galaxy_url}</strong>.</p>
+                <p class="fine-print">Scopes: <strong>{scopes_text}</strong></p>
+                {error_html}
+                <form method="post">
+                    <div>
+                        <label for="username">Galaxy username or email</label>
+                        <input
+                            id="username"
+                            name="username"
+                            type="text"
+                            autocomplete="username"
+                            autofocus
+                            required
+                        />
+                    </div>
+                    <div>
+                        <label for="password">Galaxy password</label>
+                        <input
+                            id="password"
+                            name="password"
+                            type="password"
+                            autocomplete="current-password"
+                            required
+                        />
+                    </div>
+                    <button type="submit">Allow access</button>
+                </form>
+                <p class="fine-print">
+                    Need help? Visit
+                    <a href="{galaxy_url}" target="_blank" rel="noopener">
+                        {galaxy_url}
+                    </a>
+                </p>
+            </main>
+        </body>
+    </html>
+    """
+    )
+    .replace("{chatgpt_logo}", CHATGPT_LOGO_DATA_URI)
+    .replace("{galaxy_logo}", GALAXY_LOGO_DATA_URI)
+)
+
+# The template pre-encoded as (literal bytes, placeholder name) pairs, so a render only
+# joins bytes instead of formatting and re-encoding the whole page.
+_LOGIN_FORM_PARTS = tuple(
+    (literal.encode("utf-8"), field)
+    for literal, field, _, _ in string.Formatter().parse(_LOGIN_FORM_TEMPLATE)
+)
+
+
+@functools.lru_cache(maxsize=4)
+def _accepted_kwargs(func: Callable[..., Any]) -> frozenset[str]:
+    """Parameter names of ``func``, probed once since they vary across FastMCP releases."""
+    return frozenset(inspect.signature(func).parameters)
+
+
+@functools.lru_cache(maxsize=8)
+def _derive_fernet_key(secret: str) -> bytes:
+    """Derive the Fernet key for a session secret.
+
+    Memoized so rebuilding a provider reuses the key; the secret already lives for the
+    process lifetime in the provider's cipher.
+    """
+    digest = hashlib.sha256(secret.encode("utf-8")).digest()
+    return base64.urlsafe_b64encode(digest)
+
+
+@functools.lru_cache(maxsize=64)
+def _format_scopes(scopes: tuple[str, ...]) -> bytes:
+    """Escaped scope list as shown on the login page; clients tend to request the same set."""
+    return html.escape(", ".join(scopes) if scopes else "galaxy:full").encode("utf-8")
+
+
+@functools.lru_cache(maxsize=32)
+def _format_error(error: str) -> bytes:
+    """Escaped alert block for the login page; errors come from a small set of messages."""
+    return b'<div class="alert" role="alert">' + html.escape(error).encode("utf-8") + b"</div>"
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip, honoring q-values such as ``gzip;q=0``."""
+    qualities: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.strip().lower()] = quality
+    # An explicit gzip entry wins over the "*" wildcard
+    return qualities.get("gzip", qualities.get("x-gzip", qualities.get("*", 0.0))) > 0
+
+
+def _dump_json(data: Any) -> bytes:
+    """Serialize to compact, key-sorted JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(data, separators=(",", ":"), sort_keys=True).encode("utf-8")
+
+
 class GalaxyAuthenticationError(Exception):
     """Raised when Galaxy authentication fails."""
 
@@ -122,7 +416,7 @@ class AuthorizationTransaction:
     created_at: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class GalaxyCredentials:
     """Decoded Galaxy credentials from an access token."""
 
@@ -135,6 +429,33 @@ class GalaxyCredentials:
     client_id: str
 
 
+class _TokenCipher:
+    """
+    Fernet encryption for token payloads, backed by ``rfernet`` when it is installed.
+
+    rfernet is a Rust implementation of the same Fernet spec, so tokens issued by
+    either backend decrypt with the other. Decryption failures raise ``InvalidToken``
+    regardless of the backend.
+    """
+
+    def __init__(self, key: bytes):
+        self._rust = rfernet is not None
+        self._fernet: Any = rfernet.Fernet(key.decode("ascii")) if self._rust else Fernet(key)
+
+    def encrypt(self, data: bytes) -> str:
+        if self._rust:
+            return self._fernet.encrypt(data)
+        return self._fernet.encrypt(data).decode("utf-8")
+
+    def decrypt(self, token: str) -> bytes:
+        if not self._rust:
+            return self._fernet.decrypt(token.encode("utf-8"))
+        try:
+            return bytes(self._fernet.decrypt(token))
+        except rfernet.DecryptionError as exc:
+            raise InvalidToken from exc
+
+
 class GalaxyOAuthProvider(OAuthProvider):
     """OAuth provider that authenticates users against a Galaxy instance."""
 
@@ -154,8 +475,7 @@ class GalaxyOAuthProvider(OAuthProvider):
         if not normalized_base_url:
             raise ValueError("base_url must be a non-empty string")
 
-        super_init = super().__init__
-        super_params = inspect.signature(super_init).parameters
+        super_params = _accepted_kwargs(OAuthProvider.__init__)
         super_kwargs: dict[str, Any] = {}
         if "base_url" in super_params:
             super_kwargs["base_url"] = normalized_base_url
@@ -170,17 +490,45 @@ class GalaxyOAuthProvider(OAuthProvider):
         if "required_scopes" in super_params:
             super_kwargs["required_scopes"] = required_scopes or ["galaxy:full"]
 
-        super_init(**super_kwargs)
+        super().__init__(**super_kwargs)
 
         self.base_url = normalized_base_url
         self.required_scopes = required_scopes or ["galaxy:full"]
         self._galaxy_url = galaxy_url if galaxy_url.endswith("/") else f"{galaxy_url}/"
+        # URLs derived from the configuration, built once instead of per OAuth request.
+        self._galaxy_url_stripped = self._galaxy_url.rstrip("/")
+        self._galaxy_url_html = html.escape(self._galaxy_url_stripped).encode("utf-8")
+        self._login_page_gzip: bytes | None = None
+        self._login_url = f"{normalized_base_url}{LOGIN_PATH}"
+        self._auth_baseauth_url = f"{self._galaxy_url}api/authenticate/baseauth"
+        base_path = self._normalize_base_path(urlparse(normalized_base_url).path)
+        self._login_paths = frozenset(self.get_login_paths(base_path))
+        self._metadata_paths = frozenset(self.get_resource_metadata_paths(base_path))
+        self._oauth_paths = self._login_paths | self._metadata_paths
+        self._current_user_url = f"{self._galaxy_url}api/users/current"
+        # Keep-alive client for logins against Galaxy, created on first use.
+        self._http: httpx.AsyncClient | None = None
+        # (username, keyed password digest) -> (cache expiry, API key), so a user who
+        # re-runs the login flow shortly after doesn't trigger another baseauth call.
+        # The digest is keyed with a per-process salt and passwords are never stored.
+        self._api_key_cache: dict[tuple[str, bytes], tuple[float, str]] = {}
+        self._credential_salt = secrets.token_bytes(32)
+        # Bounds how many logins talk to Galaxy at once, matching the keep-alive pool
+        # so bursts queue here instead of opening extra connections and threads.
+        self._login_limit = asyncio.Semaphore(MAX_CONCURRENT_LOGINS)
         self._transactions: dict[str, AuthorizationTransaction] = {}
         self._clients: dict[str, OAuthClientInformationFull] = {}
-        self._fernet = Fernet(self._derive_key(session_secret))
+        # Client IDs kept in sorted order so registry writes don't re-sort every client
+        self._sorted_client_ids: list[str] = []
+        self._fernet = _TokenCipher(self._derive_key(session_secret))
+        # (expected_type, token) -> (epoch cache expiry, payload); tokens are stateless, so
+        # entries never need invalidating and simply age out.
+        self._token_cache: dict[tuple[str, str], tuple[float, dict[str, Any]]] = {}
         self._client_registry_path = (
             Path(client_registry_path).expanduser() if client_registry_path else None
         )
+        self._registry_dirty = False
+        self._registry_flush_task: asyncio.Task[None] | None = None
 
         self._load_client_registry()
 
@@ -194,8 +542,8 @@ class GalaxyOAuthProvider(OAuthProvider):
 
     @override
     async def register_client(self, client_info: OAuthClientInformationFull) -> None:
-        self._clients[client_info.client_id] = client_info
-        await self._persist_client_registry()
+        self._add_client(client_info)
+        self._schedule_registry_flush()
 
     @override
     async def authorize(
@@ -212,13 +560,13 @@ class GalaxyOAuthProvider(OAuthProvider):
             scopes=params.scopes if params.scopes else (self.required_scopes or []),
             created_at=time.time(),
         )
+        self._prune_transactions()
         self._transactions[txn_id] = transaction
 
-        base_url = str(self.base_url)
         login_url = construct_redirect_uri(
-            f"{base_url.rstrip('/')}{LOGIN_PATH}",
+            self._login_url,
             txn=txn_id,
-            galaxy=self._galaxy_url.rstrip("/"),
+            galaxy=self._galaxy_url_stripped,
         )
         logger.debug("Created authorization transaction %s for client %s", txn_id, client.client_id)
         return login_url
@@ -264,7 +612,7 @@ class GalaxyOAuthProvider(OAuthProvider):
             raise GalaxyAuthenticationError("Authorization code issued for a different client.")
 
         galaxy_payload = payload["galaxy"]
-        return self._issue_tokens(
+        return await self._issue_tokens(
             client_id=client.client_id, scopes=payload["scopes"], galaxy_payload=galaxy_payload
         )
 
@@ -306,7 +654,7 @@ class GalaxyOAuthProvider(OAuthProvider):
             raise GalaxyAuthenticationError("Refresh token issued for a different client.")
 
         resolved_scopes = scopes or payload["scopes"]
-        return self._issue_tokens(
+        return await self._issue_tokens(
             client_id=client.client_id, scopes=resolved_scopes, galaxy_payload=payload["galaxy"]
         )
 
@@ -331,6 +679,7 @@ class GalaxyOAuthProvider(OAuthProvider):
 
     @override
     async def revoke_token(self, token: AccessToken | RefreshToken) -> None:
+        drop_session(token.token)
         # Stateless tokens cannot be selectively revoked without external storage.
         logger.debug(
             "Revocation requested for token, but stateless tokens cannot be revoked individually."
@@ -396,26 +745,23 @@ class GalaxyOAuthProvider(OAuthProvider):
         """
         routes = super().get_routes(mcp_path, mcp_endpoint)  # type: ignore[misc]
 
-        base_path = self._normalize_base_path(
-            urlparse(str(self.base_url)).path if self.base_url else None
-        )
-        login_paths = self.get_login_paths(base_path)
-        metadata_paths = self.get_resource_metadata_paths(base_path)
-
-        routes = [
-            route
-            for route in routes
-            if not (isinstance(route, Route) and route.path in login_paths | metadata_paths)
-        ]
-
-        existing_paths = {route.path for route in routes if isinstance(route, Route)}
+        # Single pass: drop the parent's OAuth routes and note the paths that remain
+        filtered: list[Route] = []
+        existing_paths: set[str] = set()
+        for route in routes:
+            if isinstance(route, Route):
+                if route.path in self._oauth_paths:
+                    continue
+                existing_paths.add(route.path)
+            filtered.append(route)
+        routes = filtered
 
-        for path in login_paths:
+        for path in self._login_paths:
             if path not in existing_paths:
                 routes.append(Route(path, endpoint=self.handle_login, methods=["GET", "POST"]))
                 existing_paths.add(path)
 
-        for path in metadata_paths:
+        for path in self._metadata_paths:
             if path not in existing_paths:
                 routes.append(Route(path, endpoint=self.handle_resource_metadata, methods=["GET"]))
                 existing_paths.add(path)
@@ -431,10 +777,10 @@ class GalaxyOAuthProvider(OAuthProvider):
             if not path.exists():
                 return
 
-            raw = path.read_text(encoding="utf-8")
+            raw = path.read_bytes()
             if not raw.strip():
                 return
-            payload = json.loads(raw)
+            payload = orjson.loads(raw) if orjson is not None else json.loads(raw)
             if not isinstance(payload, list):
                 logger.warning("Client registry at %s is not a list; ignoring contents.", path)
                 return
@@ -445,25 +791,45 @@ class GalaxyOAuthProvider(OAuthProvider):
                 except Exception as exc:  # pragma: no cover - defensive
                     logger.warning("Failed to load client entry from registry: %s", exc)
                     continue
-                self._clients[client.client_id] = client
+                self._add_client(client)
         except Exception as exc:  # pragma: no cover - defensive
             logger.warning("Failed to load client registry from %s: %s", path, exc)
 
+    def _add_client(self, client: OAuthClientInformationFull) -> None:
+        if client.client_id not in self._clients:
+            bisect.insort(self._sorted_client_ids, client.client_id)
+        self._clients[client.client_id] = client
+
+    def _schedule_registry_flush(self) -> None:
+        if not self._client_registry_path:
+            return
+        self._registry_dirty = True
+        if self._registry_flush_task is None or self._registry_flush_task.done():
+            self._registry_flush_task = asyncio.get_running_loop().create_task(
+                self._flush_client_registry()
+            )
+
+    async def _flush_client_registry(self) -> None:
+        await asyncio.sleep(CLIENT_REGISTRY_FLUSH_DELAY_SECONDS)
+        # Registrations made while a write is in flight mark the registry dirty again
+        # and are picked up by the next pass instead of starting a second writer.
+        while self._registry_dirty:
+            self._registry_dirty = False
+            await self._persist_client_registry()
+
     async def _persist_client_registry(self) -> None:
         if not self._client_registry_path:
             return
 
         path = self._client_registry_path
-        clients_data = [
-            client.model_dump(mode="json")
-            for client in sorted(self._clients.values(), key=lambda c: c.client_id)
-        ]
+        # Snapshot on the event loop; dumping and encoding happen in the worker thread.
+        clients = [self._clients[client_id] for client_id in self._sorted_client_ids]
 
         def _write() -> None:
+            blob = _dump_json([client.model_dump(mode="json") for client in clients])
             path.parent.mkdir(parents=True, exist_ok=True)
             tmp_path = path.with_suffix(path.suffix + ".tmp")
-            with tmp_path.open("w", encoding="utf-8") as fh:
-                json.dump(clients_data, fh, separators=(",", ":"), sort_keys=True)
+            tmp_path.write_bytes(blob)
             tmp_path.replace(path)
 
         try:
@@ -482,14 +848,50 @@ class GalaxyOAuthProvider(OAuthProvider):
 
         return payload
 
+    def decode_credentials(self, token: str) -> GalaxyCredentials | None:
+        """Decode an access token straight into the Galaxy credentials it carries."""
+        payload = self.decode_access_token(token)
+        if payload is None:
+            return None
+
+        galaxy_payload = payload["galaxy"]
+        return GalaxyCredentials(
+            galaxy_url=galaxy_payload["url"],
+            api_key=galaxy_payload["api_key"],
+            username=galaxy_payload["username"],
+            user_email=galaxy_payload.get("user_email"),
+            expires_at=payload["exp"],
+            scopes=payload["scopes"],
+            client_id=payload["client_id"],
+        )
+
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
 
+    def _get_transaction(self, txn_id: str) -> AuthorizationTransaction | None:
+        transaction = self._transactions.get(txn_id)
+        if transaction and transaction.created_at + AUTH_CODE_TTL_SECONDS < time.time():
+            self._transactions.pop(txn_id, None)
+            return None
+        return transaction
+
+    def _prune_transactions(self) -> None:
+        """Drop abandoned authorization transactions and keep room for a new one.
+
+        Transactions are inserted in creation order, so expired entries are always
+        at the front of the dict and pruning stops at the first live one.
+        """
+        cutoff = time.time() - AUTH_CODE_TTL_SECONDS
+        while self._transactions:
+            oldest_id, oldest = next(iter(self._transactions.items()))
+            if oldest.created_at >= cutoff and len(self._transactions) < MAX_PENDING_TRANSACTIONS:
+                break
+            del self._transactions[oldest_id]
+
     def _derive_key(self, secret: str | None) -> bytes:
         if secret:
-            digest = hashlib.sha256(secret.encode("utf-8")).digest()
-            return base64.urlsafe_b64encode(digest)
+            return _derive_fernet_key(secret)
         key = Fernet.generate_key()
         logger.warning(
             "GALAXY_MCP_SESSION_SECRET is not set; generated a volatile secret. "
@@ -498,17 +900,34 @@ class GalaxyOAuthProvider(OAuthProvider):
         return key
 
     def _encrypt_payload(self, payload: dict[str, Any]) -> str:
-        serialized = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode("utf-8")
-        return self._fernet.encrypt(serialized).decode("utf-8")
+        return self._fernet.encrypt(_dump_json(payload))
 
     def _decrypt_payload(self, token: str, *, expected_type: str) -> dict[str, Any]:
-        data = self._fernet.decrypt(token.encode("utf-8"))
-        payload: dict[str, Any] = json.loads(data.decode("utf-8"))
+        cache_key = (expected_type, token)
+        now = time.time()
+        cached = self._token_cache.get(cache_key)
+        if cached is not None:
+            cached_until, cached_payload = cached
+            if cached_until > now:
+                return cached_payload
+            self._token_cache.pop(cache_key, None)
+
+        data = self._fernet.decrypt(token)
+        payload: dict[str, Any] = orjson.loads(data) if orjson is not None else json.loads(data)
         if payload.get("typ") != expected_type:
             raise InvalidToken("Token type mismatch")
+
+        exp = payload.get("exp", 0)
+        if exp > now:
+            if len(self._token_cache) >= TOKEN_CACHE_MAX_ENTRIES:
+                # Drop the oldest entry; dicts preserve insertion order.
+                self._token_cache.pop(next(iter(self._token_cache)), None)
+            # Entries end at the cache TTL or the token's own expiry, whichever is first,
+            # so a hit needs a single clock read.
+            self._token_cache[cache_key] = (min(now + TOKEN_CACHE_TTL_SECONDS, exp), payload)
         return payload
 
-    def _issue_tokens(
+    async def _issue_tokens(
         self, *, client_id: str, scopes: list[str], galaxy_payload: dict[str, Any]
     ) -> OAuthToken:
         now = int(time.time())
@@ -519,7 +938,6 @@ class GalaxyOAuthProvider(OAuthProvider):
             "galaxy": galaxy_payload,
             "exp": now + ACCESS_TOKEN_TTL_SECONDS,
             "iat": now,
-            "nonce": secrets.token_urlsafe(8),
         }
 
         refresh_payload = {
@@ -529,11 +947,13 @@ class GalaxyOAuthProvider(OAuthProvider):
             "galaxy": galaxy_payload,
             "exp": now + REFRESH_TOKEN_TTL_SECONDS,
             "iat": now,
-            "nonce": secrets.token_urlsafe(8),
         }
 
-        access_token = self._encrypt_payload(access_payload)
-        refresh_token = self._encrypt_payload(refresh_payload)
+        # Both tokens are minted in one worker-thread hop so bursts of logins and refreshes
+        # don't serialize their crypto on the event loop.
+        access_token, refresh_token = await anyio.to_thread.run_sync(
+            lambda: (self._encrypt_payload(access_payload), self._encrypt_payload(refresh_payload))
+        )
 
         return OAuthToken(
             access_token=access_token,
@@ -546,14 +966,25 @@ class GalaxyOAuthProvider(OAuthProvider):
     async def _login_handler(self, request: Request) -> Response:
         txn_id = request.query_params.get("txn")
         if not txn_id:
-            return PlainTextResponse("Missing transaction identifier.", status_code=400)
+            return PlainTextResponse(_MISSING_TXN_BODY, status_code=400)
 
-        transaction = self._transactions.get(txn_id)
+        transaction = self._get_transaction(txn_id)
         if not transaction:
-            return PlainTextResponse("Authorization request is no longer valid.", status_code=400)
+            return PlainTextResponse(_STALE_TXN_BODY, status_code=400)
 
         if request.method == "GET":
-            return self._render_login_form(transaction, error=request.query_params.get("error"))
+            error = request.query_params.get("error")
+            if (
+                not error
+                and transaction.scopes == self.required_scopes
+                and _accepts_gzip(request.headers.get("accept-encoding", ""))
+            ):
+                return Response(
+                    self._default_login_page_gzip(),
+                    media_type="text/html",
+                    headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+                )
+            return self._render_login_form(transaction, error=error)
 
         form = await request.form()
         username_field = form.get("username")
@@ -577,14 +1008,18 @@ class GalaxyOAuthProvider(OAuthProvider):
         return RedirectResponse(redirect_url, status_code=303)
 
     async def _authenticate_and_complete(self, txn_id: str, username: str, password: str) -> str:
-        transaction = self._transactions.pop(txn_id, None)
+        transaction = self._get_transaction(txn_id)
+        self._transactions.pop(txn_id, None)
         if not transaction:
             raise GalaxyAuthenticationError(
                 "Authorization request expired. Please restart the flow."
             )
 
-        api_key = await self._get_api_key(username, password)
-        user_info = await self._get_user_info(api_key)
+        # The user lookup needs the minted key, so the two round-trips stay sequential;
+        # concurrency comes from running many logins side by side.
+        async with self._login_limit:
+            api_key = await self._get_api_key(username, password)
+            user_info = await self._get_user_info(api_key)
 
         galaxy_payload = {
             "url": self._galaxy_url,
@@ -603,7 +1038,6 @@ class GalaxyOAuthProvider(OAuthProvider):
             "redirect_uri_provided_explicitly": transaction.redirect_uri_provided_explicitly,
             "galaxy": galaxy_payload,
             "exp": time.time() + AUTH_CODE_TTL_SECONDS,
-            "nonce": secrets.token_urlsafe(8),
         }
 
         code_value = self._encrypt_payload(code_payload)
@@ -613,242 +1047,111 @@ class GalaxyOAuthProvider(OAuthProvider):
             transaction.redirect_uri, code=code_value, state=transaction.state
         )
 
-    async def _get_api_key(self, username: str, password: str) -> str:
-        url = f"{self._galaxy_url}api/authenticate/baseauth"
+    def _http_client(self) -> httpx.AsyncClient:
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                timeout=15, limits=httpx.Limits(max_keepalive_connections=MAX_CONCURRENT_LOGINS)
+            )
+        return self._http
 
-        def _request_api_key() -> str:
-            response = requests.get(url, auth=(username, password), timeout=15)
-            if response.status_code == 401:
-                raise GalaxyAuthenticationError("Invalid Galaxy credentials.")
-            response.raise_for_status()
-            payload = response.json()
-            key = payload.get("api_key")
-            if not key:
-                raise GalaxyAuthenticationError("Galaxy did not return an API key.")
-            return key
+    async def aclose(self) -> None:
+        """Write out pending client registrations and close the pooled HTTP client."""
+        if self._registry_flush_task is not None:
+            await self._registry_flush_task
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
 
-        return await anyio.to_thread.run_sync(_request_api_key)
+    async def _get_api_key(self, username: str, password: str) -> str:
+        cache_key = (
+            username,
+            hmac.new(self._credential_salt, password.encode("utf-8"), hashlib.sha256).digest(),
+        )
+        cached = self._api_key_cache.get(cache_key)
+        if cached is not None:
+            if cached[0] > time.monotonic():
+                return cached[1]
+            self._api_key_cache.pop(cache_key, None)
+
+        response = await self._http_client().get(self._auth_baseauth_url, auth=(username, password))
+        if response.status_code == 401:
+            raise GalaxyAuthenticationError("Invalid Galaxy credentials.")
+        response.raise_for_status()
+        payload = response.json()
+        key = payload.get("api_key")
+        if not key:
+            raise GalaxyAuthenticationError("Galaxy did not return an API key.")
+
+        if len(self._api_key_cache) >= API_KEY_CACHE_MAX_ENTRIES:
+            self._api_key_cache.pop(next(iter(self._api_key_cache)), None)
+        self._api_key_cache[cache_key] = (time.monotonic() + API_KEY_CACHE_TTL_SECONDS, key)
+        return key
 
     async def _get_user_info(self, api_key: str) -> dict[str, Any]:
-        def _fetch() -> dict[str, Any]:
-            gi = GalaxyInstance(url=self._galaxy_url, key=api_key)
-            return gi.users.get_current_user()
-
         try:
-            return await anyio.to_thread.run_sync(_fetch)
-        except Exception as exc:
+            response = await self._http_client().get(
+                self._current_user_url, headers={"x-api-key": api_key}
+            )
+            response.raise_for_status()
+            return response.json()
+        except (httpx.HTTPError, ValueError) as exc:
             raise GalaxyAuthenticationError("Failed to validate API key with Galaxy.") from exc
 
     def _render_login_form(
         self, transaction: AuthorizationTransaction, error: str | None = None
     ) -> HTMLResponse:
-        scopes_text = ", ".join(transaction.scopes) if transaction.scopes else "galaxy:full"
-        error_html = f'<div class="alert" role="alert">{error}</div>' if error else ""
-        html = textwrap.dedent(
-            f"""
-            <html lang="en">
-                <head>
-                    <meta charset="utf-8" />
-                    <meta name="viewport" content="width=device-width, initial-scale=1" />
-                    <title>Authorize ChatGPT for Galaxy</title>
-                    <style>
-                        :root {{ color-scheme: light dark; }}
-                        body {{
-                            margin: 0;
-                            min-height: 100vh;
-                            display: flex;
-                            align-items: center;
-                            justify-content: center;
-                            background:
-                                radial-gradient(
-                                    circle at 20% 20%,
-                                    #4c6ef5 0%,
-                                    #2a2f4f 60%,
-                                    #0b0d26 100%
-                                );
-                            font-family: "Segoe UI", system-ui, -apple-system, sans-serif;
-                            color: #101223;
-                        }}
-                        .card {{
-                            width:
-                                min(440px, calc(100% - 40px));
-                            background: rgba(255, 255, 255, 0.96);
-                            border-radius: 18px;
-                            box-shadow: 0 18px 45px rgba(14, 20, 56, 0.25);
-                            padding: 34px 38px;
-                            box-sizing: border-box;
-                        }}
-                        .logo-strip {{
-                            display: flex;
-                            align-items: center;
-                            justify-content: center;
-                            gap: 18px;
-                            margin-bottom: 20px;
-                        }}
-                        .logo {{
-                            position: relative;
-                            width: 72px;
-                            height: 72px;
-                            border-radius: 18px;
-                            flex: 0 0 72px;
-                            display: flex;
-                            align-items: center;
-                            justify-content: center;
-                            overflow: hidden;
-                        }}
-                        .logo::after {{
-                            content: "";
-                            position: absolute;
-                            inset: 0;
-                            background-size: cover;
-                            background-position: center;
-                            background-repeat: no-repeat;
-                        }}
-                        .logo-chatgpt::after {{
-                            background-image:
-                                url("{CHATGPT_LOGO_DATA_URI}");
-                        }}
-                        .logo-galaxy::after {{
-                            background-image:
-                                url("{GALAXY_LOGO_DATA_URI}");
-                        }}
-                        .arrow {{
-                            font-size: 2.5rem;
-                            color: rgba(20, 33, 92, 0.85);
-                        }}
-                        .card h1 {{
-                            margin: 0 0 12px;
-                            font-size: 1.6rem;
-                            color: #14215c;
-                        }}
-                        .card p {{
-                            margin: 0 0 18px;
-                            line-height: 1.5;
-                        }}
-                        form {{
-                            display: grid;
-                            gap: 16px;
-                        }}
-                        label {{
-                            font-weight: 600;
-                            font-size: 0.95rem;
-                            color: #202552;
-                        }}
-                        input {{
-                            width: 100%;
-                            padding: 12px 14px;
-                            border-radius: 10px;
-                            border: 1px solid rgba(20, 33, 92, 0.25);
-                            font-size: 1rem;
-                            transition: border-color 0.2s ease, box-shadow 0.2s ease;
-                            background: rgba(255, 255, 255, 0.95);
-                        }}
-                        input:focus {{
-                            outline: none;
-                            border-color: #4c6ef5;
-                            box-shadow: 0 0 0 3px rgba(76, 110, 245, 0.25);
-                        }}
-                        button {{
-                            margin-top: 8px;
-                            padding: 13px 16px;
-                            border-radius: 12px;
-                            border: none;
-                            background: linear-gradient(135deg, #4c6ef5, #5f9bff);
-                            color: white;
-                            font-size: 1rem;
-                            font-weight: 600;
-                            cursor: pointer;
-                            transition: transform 0.2s ease, box-shadow 0.2s ease;
-                        }}
-                        button:hover {{
-                            transform: translateY(-1px);
-                            box-shadow: 0 12px 24px rgba(19, 64, 216, 0.3);
-                        }}
-                        .fine-print {{
-                            margin-top: 12px;
-                            font-size: 0.85rem;
-                            color: #4b4f70;
-                        }}
-                        .alert {{
-                            padding: 12px 16px;
-                            border-radius: 10px;
-                            background: rgba(220, 53, 69, 0.1);
-                            color: #9e1c2f;
-                            border: 1px solid rgba(220, 53, 69, 0.35);
-                            margin-bottom: 18px;
-                        }}
-                        @media (prefers-color-scheme: dark) {{
-                            .card {{
-                                background: rgba(16, 18, 35, 0.88);
-                                color: #eef0ff;
-                            }}
-                            label {{ color: #c9d1ff; }}
-                            input {{
-                                background: rgba(10, 12, 26, 0.9);
-                                color: #eef0ff;
-                                border-color: rgba(128, 140, 255, 0.35);
-                            }}
-                            .fine-print {{ color: rgba(216, 220, 255, 0.75); }}
-                            .arrow {{ color: rgba(224, 231, 255, 0.9); }}
-                        }}
-                    </style>
-                </head>
-                <body>
-                    <main class="card" role="dialog" aria-labelledby="title">
-                        <div class="logo-strip" aria-hidden="true">
-                            <div class="logo logo-chatgpt"></div>
-                            <span class="arrow">→</span>
-                            <div class="logo logo-galaxy"></div>
-                        </div>
-                        <h1 id="title">Allow ChatGPT to access Galaxy</h1>
-                        <p>Sign in to <strong>{self._galaxy_url.rstrip("/")}</strong>.</p>
-                        <p class="fine-print">Scopes: <strong>{scopes_text}</strong></p>
-                        {error_html}
-                        <form method="post">
-                            <div>
-                                <label for="username">Galaxy username or email</label>
-                                <input
-                                    id="username"
-                                    name="username"
-                                    type="text"
-                                    autocomplete="username"
-                                    autofocus
-                                    required
-                                />
-                            </div>
-                            <div>
-                                <label for="password">Galaxy password</label>
-                                <input
-                                    id="password"
-                                    name="password"
-                                    type="password"
-                                    autocomplete="current-password"
-                                    required
-                                />
-                            </div>
-                            <button type="submit">Allow access</button>
-                        </form>
-                        <p class="fine-print">
-                            Need help? Visit
-                            <a href="{self._galaxy_url.rstrip("/")}" target="_blank" rel="noopener">
-                                {self._galaxy_url.rstrip("/")}
-                            </a>
-                        </p>
-                    </main>
-                </body>
-            </html>
-            """
-        )
-        return HTMLResponse(html)
+        return HTMLResponse(self._login_page_body(tuple(transaction.scopes), error))
+
+    def _default_login_page_gzip(self) -> bytes:
+        """Gzipped login page for the common case: default scopes and no error.
+
+        That page is identical for every visitor, so it is compressed once and reused.
+        """
+        if self._login_page_gzip is None:
+            body = self._login_page_body(tuple(self.required_scopes), None)
+            self._login_page_gzip = gzip.compress(body, compresslevel=9)
+        return self._login_page_gzip
+
+    def _login_page_body(self, scopes: tuple[str, ...], error: str | None) -> bytes:
+        fields = {
+            "galaxy_url": self._galaxy_url_html,
+            "scopes_text": _format_scopes(scopes),
+            "error_html": _format_error(error) if error else b"",
+        }
+        parts: list[bytes] = []
+        for literal, field in _LOGIN_FORM_PARTS:
+            parts.append(literal)
+            if field:
+                parts.append(fields[field])
+        return b"".join(parts)
 
 
 _AUTH_PROVIDER: GalaxyOAuthProvider | None = None
 
+# Credentials decoded from access tokens, keyed by the raw token and kept in LRU order.
+# Entries are dropped once the token expires.
+SESSION_CACHE_MAX_ENTRIES = 1024
+_session_cache_lock = threading.Lock()
+_session_cache: OrderedDict[str, GalaxyCredentials] = OrderedDict()
+
 
 def configure_auth_provider(provider: GalaxyOAuthProvider) -> None:
     """Register the global auth provider instance."""
     global _AUTH_PROVIDER
     _AUTH_PROVIDER = provider
+    clear_session_cache()
+
+
+def drop_session(token: str) -> None:
+    """Forget the cached credentials for an access token."""
+    with _session_cache_lock:
+        _session_cache.pop(token, None)
+
+
+def clear_session_cache() -> None:
+    """Forget all cached credentials."""
+    with _session_cache_lock:
+        _session_cache.clear()
 
 
 def get_auth_provider() -> GalaxyOAuthProvider | None:
@@ -860,7 +1163,9 @@ def get_active_session(
     get_token: Callable[[], AccessToken | None],
 ) -> tuple[GalaxyCredentials | None, str | None]:
     """Decode the access token from the request and extract Galaxy credentials."""
-    provider = get_auth_provider()
+    # Read the global directly; this runs on every authenticated tool call, and
+    # configure_auth_provider has always run before requests are served.
+    provider = _AUTH_PROVIDER
     if not provider:
         return None, None
 
@@ -868,18 +1173,21 @@ def get_active_session(
     if access_token is None:
         return None, None
 
-    token_payload = provider.decode_access_token(access_token.token)
-    if not token_payload:
+    token = access_token.token
+    with _session_cache_lock:
+        cached = _session_cache.get(token)
+        if cached is not None:
+            if cached.expires_at > time.time():
+                _session_cache.move_to_end(token)
+                return cached, cached.api_key
+            del _session_cache[token]
+
+    credentials = provider.decode_credentials(token)
+    if credentials is None:
         return None, None
 
-    galaxy_payload = token_payload["galaxy"]
-    credentials = GalaxyCredentials(
-        galaxy_url=galaxy_payload["url"],
-        api_key=galaxy_payload["api_key"],
-        username=galaxy_payload["username"],
-        user_email=galaxy_payload.get("user_email"),
-        expires_at=token_payload["exp"],
-        scopes=token_payload["scopes"],
-        client_id=token_payload["client_id"],
-    )
+    with _session_cache_lock:
+        _session_cache[token] = credentials
+        if len(_session_cache) > SESSION_CACHE_MAX_ENTRIES:
+            _session_cache.popitem(last=False)
     return credentials, credentials.api_key
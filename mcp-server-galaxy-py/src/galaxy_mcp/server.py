@@ -1,21 +1,41 @@
 # Galaxy MCP Server
+import asyncio
+import atexit
+import codecs
 import concurrent.futures
+import functools
+import hashlib
+import http.cookiejar
+import json
 import logging
 import os
+import re
+import shutil
+import sys
+import tempfile
 import threading
+import time
 import types
-from functools import lru_cache
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterator
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Literal, cast
+from typing import Any, Literal, TypeVar, cast
+from urllib.parse import urlsplit
+from urllib.request import url2pathname
 
 import requests
+from bioblend import ConnectionError as BioblendConnectionError
 from bioblend.galaxy import GalaxyInstance
 from dotenv import find_dotenv, load_dotenv
 from fastmcp import FastMCP
 from mcp.server.auth.middleware.auth_context import get_access_token
+from mcp.types import ToolAnnotations
+from requests.adapters import HTTPAdapter
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import Response
+from urllib3.util.retry import Retry
 
 from galaxy_mcp.auth import (
     GalaxyOAuthProvider,
@@ -23,27 +43,273 @@ from galaxy_mcp.auth import (
     get_active_session,
 )
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+try:  # pragma: no cover - optional speedup
+    import orjson  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - orjson not installed
+    orjson = None  # type: ignore[assignment]
+
+try:  # pragma: no cover - optional speedup
+    import ahocorasick  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - pyahocorasick not installed
+    ahocorasick = None  # type: ignore[assignment]
+
+# Set up logging on stderr so stdout stays reserved for the stdio MCP transport
+logging.basicConfig(
+    level=os.environ.get("GALAXY_MCP_LOG_LEVEL", "INFO").upper(),
+    stream=sys.stderr,
+)
 logger = logging.getLogger(__name__)
 
+IWC_MANIFEST_URL = os.environ.get(
+    "GALAXY_MCP_IWC_MANIFEST_URL", "https://iwc.galaxyproject.org/workflow_manifest.json"
+)
+
+# Seconds the parsed IWC manifest is served from memory before being refetched
+IWC_CACHE_TTL = float(os.environ.get("GALAXY_MCP_IWC_CACHE_TTL", "300"))
+
+# Seconds tool details and the tool panel are served from memory
+TOOL_CACHE_TTL = float(os.environ.get("GALAXY_MCP_TOOL_CACHE_TTL", "300"))
+
+# Seconds the current user's details are reused for an API key
+USER_CACHE_TTL = float(os.environ.get("GALAXY_MCP_USER_CACHE_TTL", "60"))
+
+# Seconds connect() keeps refusing credentials that Galaxy rejected, without retrying them
+REJECTED_CREDENTIALS_TTL = float(os.environ.get("GALAXY_MCP_REJECTED_CREDENTIALS_TTL", "5"))
+
+# Tool panels and tool details can also be kept on disk so they survive restarts.
+# Disk caching only happens when GALAXY_MCP_TOOL_DISK_CACHE_DIR is set.
+_tool_disk_cache_env = os.environ.get("GALAXY_MCP_TOOL_DISK_CACHE_DIR")
+TOOL_DISK_CACHE_DIR = Path(_tool_disk_cache_env).expanduser() if _tool_disk_cache_env else None
+TOOL_DISK_CACHE_TTL = float(os.environ.get("GALAXY_MCP_TOOL_DISK_CACHE_TTL", "86400"))
+
+# Large tool results can be written to disk and returned as a reference instead of
+# inlined. Automatic offloading only happens when GALAXY_MCP_OFFLOAD_DIR is set.
+_offload_dir_env = os.environ.get("GALAXY_MCP_OFFLOAD_DIR")
+OFFLOAD_DIR = Path(_offload_dir_env).expanduser() if _offload_dir_env else None
+OFFLOAD_THRESHOLD = int(os.environ.get("GALAXY_MCP_OFFLOAD_THRESHOLD", "256000"))
+_SHA256_JSON_NAME = re.compile(r"[0-9a-f]{64}\.json")
+
+# Bytes sent per chunk when BioBlend uploads a file through tus
+UPLOAD_CHUNK_SIZE = int(os.environ.get("GALAXY_MCP_UPLOAD_CHUNK_SIZE", str(10 * 1024 * 1024)))
+
+# (connect, read) timeouts for outbound HTTP calls made outside of BioBlend
+HTTP_TIMEOUT = (3.05, 30)
+
+# Most blocking Galaxy calls async tools may have in flight at once. The limit is
+# process-wide, shared by every user and session of this server, and also keeps
+# them from exhausting asyncio's default worker-thread pool.
+GALAXY_CALL_CONCURRENCY = int(os.environ.get("GALAXY_MCP_GALAXY_CALL_CONCURRENCY", "20"))
+
+
+def _build_http_session() -> requests.Session:
+    """Create a pooled HTTP session with retries for transient server errors."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=20,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.2,
+            status_forcelist=[429, 500, 502, 503, 504],
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Shared session so repeated requests reuse keep-alive connections instead of
+# paying a fresh TCP + TLS handshake on every call.
+_http = _build_http_session()
+atexit.register(_http.close)
+
+
+def get_session() -> requests.Session:
+    """Return the shared HTTP session used for non-BioBlend requests."""
+    return _http
+
+
+def _build_galaxy_session() -> requests.Session:
+    """Create a pooled HTTP session for BioBlend calls against Galaxy servers."""
+    session = requests.Session()
+    # The session is shared between users, so never let Galaxy cookies stick to it.
+    session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+    # Retry idempotent reads on overload/transient errors at the transport level;
+    # once retries run out the last response is returned for BioBlend to report.
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=5,
+            backoff_factor=0.25,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET", "HEAD"],
+            raise_on_status=False,
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_galaxy_http = _build_galaxy_session()
+atexit.register(_galaxy_http.close)
+
+
+def _parse_json_response(response: requests.Response) -> Any:
+    """Decode a JSON response body, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+class _TTLCache:
+    """Thread-safe in-memory cache whose entries expire ``ttl`` seconds after being stored."""
+
+    _MISSING = object()
+
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value for ``key``, or ``_TTLCache._MISSING``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return self._MISSING
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            if len(self._entries) >= self.maxsize:
+                # Dicts keep insertion order, so the first key is the oldest entry
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = (time.monotonic(), value)
+
+    def discard(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
+def _dumps(data: Any) -> bytes:
+    """Serialize to JSON bytes with orjson when available, else the stdlib encoder."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # e.g. integers wider than 64 bits, which orjson refuses to encode
+            pass
+    return json.dumps(data, default=str).encode("utf-8")
+
+
+_offload_lock = threading.Lock()
+# Offload files this process wrote; only these are reused instead of rewritten
+_offloaded_paths: set[Path] = set()
+
+
+@functools.lru_cache(maxsize=1)
+def _private_offload_dir() -> Path:
+    """Create this process's offload directory, used when GALAXY_MCP_OFFLOAD_DIR is unset."""
+    # mkdtemp creates a fresh directory only the current user can access, so other
+    # local users cannot pre-create it or plant files in it
+    path = Path(tempfile.mkdtemp(prefix="galaxy-mcp-offload-"))
+    atexit.register(shutil.rmtree, path, ignore_errors=True)
+    return path
+
+
+def _offload_dir() -> Path:
+    if OFFLOAD_DIR is not None:
+        return OFFLOAD_DIR
+    with _offload_lock:
+        return _private_offload_dir()
+
+
+def _maybe_offload(payload: dict[str, Any], force: bool = False) -> dict[str, Any]:
+    """
+    Write a large payload to the offload directory and return a reference to it.
+
+    Payloads are offloaded when ``force`` is set, or when GALAXY_MCP_OFFLOAD_DIR is
+    configured and the serialized payload exceeds OFFLOAD_THRESHOLD bytes. Anything
+    else is returned unchanged.
+    """
+    if not force and OFFLOAD_DIR is None:
+        return payload
+    data = _dumps(payload)
+    if not force and len(data) <= OFFLOAD_THRESHOLD:
+        return payload
+
+    digest = hashlib.sha256(data).hexdigest()
+    directory = _offload_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    target = directory / f"{digest}.json"
+    with _offload_lock:
+        reuse = target in _offloaded_paths and target.exists()
+    if not reuse:
+        # Files this process did not write are replaced, never trusted; mkstemp opens
+        # a new file exclusively, so a planted file or symlink cannot redirect the write
+        fd, tmp_name = tempfile.mkstemp(dir=directory, prefix=f".{digest}.", suffix=".tmp")
+        with os.fdopen(fd, "wb") as tmp_file:
+            tmp_file.write(data)
+        os.replace(tmp_name, target)
+        with _offload_lock:
+            _offloaded_paths.add(target)
+    return {
+        "ref": target.resolve().as_uri(),
+        "bytes": len(data),
+        "sha256": digest,
+        "keys": sorted(str(key) for key in payload),
+    }
+
+
+def _serialize_tool_result(data: Any) -> str:
+    """Serialize a tool result to JSON text with orjson, falling back for unsupported values."""
+    return _dumps(data).decode("utf-8")
+
+
+# Hints appended by format_error for the HTTP status codes it recognizes
+_HTTP_STATUS_HINTS = {
+    "401": " (Authentication failed - check your API key)",
+    "403": " (Permission denied - check your account permissions)",
+    "404": " (Resource not found - check IDs and URLs)",
+    "500": " (Server error - try again later or contact admin)",
+}
+_HTTP_STATUS_RE = re.compile(r"(?<!\d)(401|403|404|500)(?!\d)")
+
 
 def format_error(action: str, error: Exception, context: dict | None = None) -> str:
     """Format error messages consistently"""
-    if context is None:
-        context = {}
-    msg = f"{action} failed: {str(error)}"
-
-    # Add HTTP status code interpretations
     error_str = str(error)
-    if "401" in error_str:
-        msg += " (Authentication failed - check your API key)"
-    elif "403" in error_str:
-        msg += " (Permission denied - check your account permissions)"
-    elif "404" in error_str:
-        msg += " (Resource not found - check IDs and URLs)"
-    elif "500" in error_str:
-        msg += " (Server error - try again later or contact admin)"
+    msg = f"{action} failed: {error_str}"
+
+    # Add HTTP status code interpretations from a single scan of the error text
+    status = _HTTP_STATUS_RE.search(error_str)
+    if status:
+        msg += _HTTP_STATUS_HINTS[status.group(1)]
 
     # Add context if provided
     if context:
@@ -53,20 +319,68 @@ def format_error(action: str, error: Exception, context: dict | None = None) ->
     return msg
 
 
-# Try to load environment variables from .env file
+@functools.lru_cache(maxsize=64)
+def _normalize_url(url: str) -> str:
+    """Validate a Galaxy base URL and return it with a trailing slash."""
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        raise ValueError(
+            f"Invalid Galaxy URL {url!r}: expected an absolute http(s) URL "
+            "such as https://usegalaxy.org/"
+        )
+    return url if url.endswith("/") else f"{url}/"
+
+
+# Modification time of each .env file when it was last loaded, so connect() only
+# re-reads a file that has changed since
+_dotenv_mtimes: dict[str, int] = {}
+
+
+def _load_dotenv_if_changed(path: str, override: bool = True) -> bool:
+    """Load ``path`` unless it is unchanged since it was last loaded; return whether it was."""
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return False
+    if _dotenv_mtimes.get(path) == mtime:
+        return False
+    load_dotenv(path, override=override)
+    _dotenv_mtimes[path] = mtime
+    return True
+
+
+# Try to load environment variables from .env file. The lookup walks up the
+# directory tree, so its result is kept for connect() to reuse.
 dotenv_path = find_dotenv(usecwd=True)
-if dotenv_path:
-    load_dotenv(dotenv_path)
-    print(f"Loaded environment variables from {dotenv_path}")
+if dotenv_path and _load_dotenv_if_changed(dotenv_path, override=False):
+    logger.info("Loaded environment variables from %s", dotenv_path)
+
+# Galaxy credentials from the environment, read once here and again by
+# _reload_env() when connect() has to fall back to the .env file
+_env_credentials: dict[str, str | None] = {}
+
+
+def _reload_env() -> dict[str, str | None]:
+    """Refresh the cached GALAXY_URL / GALAXY_API_KEY values from os.environ."""
+    _env_credentials.update(
+        url=os.environ.get("GALAXY_URL"), api_key=os.environ.get("GALAXY_API_KEY")
+    )
+    return _env_credentials
+
+
+_reload_env()
 
 # Configure Galaxy target and client state
-raw_galaxy_url = os.environ.get("GALAXY_URL")
-normalized_galaxy_url = (
-    raw_galaxy_url if not raw_galaxy_url or raw_galaxy_url.endswith("/") else f"{raw_galaxy_url}/"
-)
+raw_galaxy_url = _env_credentials["url"]
+normalized_galaxy_url: str | None = None
+if raw_galaxy_url:
+    try:
+        normalized_galaxy_url = _normalize_url(raw_galaxy_url)
+    except ValueError as exc:
+        logger.warning("Ignoring GALAXY_URL from the environment: %s", exc)
 galaxy_state: dict[str, Any] = {
     "url": normalized_galaxy_url,
-    "api_key": os.environ.get("GALAXY_API_KEY"),
+    "api_key": _env_credentials["api_key"],
     "gi": None,
     "connected": False,
 }
@@ -104,11 +418,19 @@ else:
         "OAuth login disabled. Configure GALAXY_MCP_PUBLIC_URL to enable browser-based login."
     )
 
+# Serialize tool results with orjson when installed; otherwise keep FastMCP's default
+tool_serializer = _serialize_tool_result if orjson is not None else None
+
 # Create an MCP server (inject auth provider when available)
 if auth_provider:
-    mcp: FastMCP = FastMCP("Galaxy", auth=auth_provider)
+    mcp: FastMCP = FastMCP("Galaxy", auth=auth_provider, tool_serializer=tool_serializer)
 else:
-    mcp = FastMCP("Galaxy")
+    mcp = FastMCP("Galaxy", tool_serializer=tool_serializer)
+
+# MCP tool annotations let clients tell cacheable reads from calls that change state
+_READ_ONLY_TOOL = ToolAnnotations(readOnlyHint=True, idempotentHint=True)
+_WRITE_TOOL = ToolAnnotations(readOnlyHint=False, destructiveHint=False)
+_DESTRUCTIVE_TOOL = ToolAnnotations(readOnlyHint=False, destructiveHint=True)
 
 # Allow browser preflight CORS requests to bypass FastMCP auth
 
@@ -157,6 +479,16 @@ class _OAuthPublicRoutes:
         return getattr(self._app, item)
 
     async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+
+            async def send_with_cleanup(message):
+                if message["type"] == "lifespan.shutdown.complete":
+                    await self._provider.aclose()
+                await send(message)
+
+            await self._app(scope, receive, send_with_cleanup)
+            return
+
         if scope["type"] != "http":
             await self._app(scope, receive, send)
             return
@@ -193,17 +525,218 @@ def _http_app_with_preflight(self, *args, **kwargs):
 mcp.http_app = types.MethodType(_http_app_with_preflight, mcp)  # type: ignore[method-assign]
 
 
+# GalaxyInstance objects keyed by (url, api_key), reused across connect() calls
+# and OAuth requests so repeated logins don't rebuild clients. The least recently
+# used client is dropped once _GI_CACHE_MAXSIZE credentials are cached.
+_GI_CACHE_MAXSIZE = 256
+_gi_cache_lock = threading.Lock()
+_gi_cache: OrderedDict[tuple[str, str], GalaxyInstance] = OrderedDict()
+_gi_cache_stats: dict[str, float] = {"hits": 0, "misses": 0, "inits": 0, "init_ms": 0.0}
+# users.get_current_user() results keyed by (url, api_key)
+_user_cache = _TTLCache(USER_CACHE_TTL, maxsize=256)
+# Error text of recent 401/403 responses to connect(), keyed by (url, api_key)
+_rejected_credentials_cache = _TTLCache(REJECTED_CREDENTIALS_TTL, maxsize=256)
+
+
+def _pooled_get(gi: GalaxyInstance, url: str, **kwargs: Any) -> requests.Response:
+    """Issue a BioBlend GET request through the shared Galaxy session."""
+    kwargs.setdefault("timeout", gi.timeout)
+    kwargs.setdefault("verify", gi.verify)
+    response = _galaxy_http.get(url, headers=gi.json_headers, **kwargs)
+    if orjson is not None and not kwargs.get("stream"):
+        # BioBlend decodes GET bodies with response.json(); large ones such as the tool
+        # list and tool panel parse several times faster with orjson
+        response.json = functools.partial(_parse_json_response, response)  # type: ignore[method-assign]
+    return response
+
+
+def _pooled_write_kwargs(
+    gi: GalaxyInstance, payload: dict[str, Any] | None, params: dict[str, Any] | None
+) -> dict[str, Any]:
+    """Request arguments BioBlend sends with its JSON POST/PUT/PATCH/DELETE calls."""
+    return {
+        "params": params,
+        "data": json.dumps(payload) if payload is not None else None,
+        "headers": gi.json_headers,
+        "timeout": gi.timeout,
+        "allow_redirects": False,
+        "verify": gi.verify,
+    }
+
+
+def _decode_write_response(response: requests.Response) -> Any:
+    """Decode a write response the way BioBlend does, raising its ConnectionError."""
+    if response.status_code == 200:
+        try:
+            return response.json()
+        except Exception as e:
+            raise BioblendConnectionError(
+                f"Request was successful, but cannot decode the response content: {e}",
+                body=response.content,
+                status_code=response.status_code,
+            ) from e
+    raise BioblendConnectionError(
+        f"Unexpected HTTP status code: {response.status_code}",
+        body=response.text,
+        status_code=response.status_code,
+    )
+
+
+def _pooled_post(
+    gi: GalaxyInstance,
+    url: str,
+    payload: dict[str, Any] | None = None,
+    params: dict[str, Any] | None = None,
+    files_attached: bool = False,
+) -> Any:
+    """Issue a BioBlend POST request through the shared Galaxy session."""
+    if files_attached:
+        # Multipart bodies keep BioBlend's own encoding and connection handling
+        return GalaxyInstance.make_post_request(gi, url, payload, params, files_attached)
+    return _decode_write_response(
+        _galaxy_http.post(url, **_pooled_write_kwargs(gi, payload, params))
+    )
+
+
+def _pooled_put(
+    gi: GalaxyInstance,
+    url: str,
+    payload: dict[str, Any] | None = None,
+    params: dict[str, Any] | None = None,
+) -> Any:
+    """Issue a BioBlend PUT request through the shared Galaxy session."""
+    return _decode_write_response(
+        _galaxy_http.put(url, **_pooled_write_kwargs(gi, payload, params))
+    )
+
+
+def _pooled_patch(
+    gi: GalaxyInstance,
+    url: str,
+    payload: dict[str, Any] | None = None,
+    params: dict[str, Any] | None = None,
+) -> Any:
+    """Issue a BioBlend PATCH request through the shared Galaxy session."""
+    return _decode_write_response(
+        _galaxy_http.patch(url, **_pooled_write_kwargs(gi, payload, params))
+    )
+
+
+def _pooled_delete(
+    gi: GalaxyInstance,
+    url: str,
+    payload: dict[str, Any] | None = None,
+    params: dict[str, Any] | None = None,
+) -> requests.Response:
+    """Issue a BioBlend DELETE request through the shared Galaxy session."""
+    return _galaxy_http.delete(url, **_pooled_write_kwargs(gi, payload, params))
+
+
+def _new_galaxy_instance(url: str, api_key: str) -> GalaxyInstance:
+    """
+    Create a GalaxyInstance whose requests reuse pooled connections.
+
+    BioBlend sends requests through the module-level ``requests`` helpers, which open
+    a fresh connection every time. Overriding the request methods on this client only
+    lets reads and writes (tool runs, uploads, workflow invocations) share the Galaxy
+    session's keep-alive pool without touching BioBlend itself; the session only
+    retries GET/HEAD, so writes are still sent exactly once.
+    """
+    started = time.perf_counter()
+    gi = GalaxyInstance(url=url, key=api_key)
+    gi.make_get_request = functools.partial(_pooled_get, gi)  # type: ignore[method-assign]
+    gi.make_post_request = functools.partial(_pooled_post, gi)  # type: ignore[method-assign]
+    gi.make_put_request = functools.partial(_pooled_put, gi)  # type: ignore[method-assign]
+    gi.make_patch_request = functools.partial(_pooled_patch, gi)  # type: ignore[method-assign]
+    gi.make_delete_request = functools.partial(_pooled_delete, gi)  # type: ignore[method-assign]
+    with _gi_cache_lock:
+        _gi_cache_stats["inits"] += 1
+        _gi_cache_stats["init_ms"] += (time.perf_counter() - started) * 1000
+    return gi
+
+
+def _get_cached_galaxy_instance(url: str, api_key: str) -> GalaxyInstance | None:
+    """Return the cached client for these credentials, recording a hit or miss."""
+    with _gi_cache_lock:
+        gi = _gi_cache.get((url, api_key))
+        if gi is not None:
+            _gi_cache.move_to_end((url, api_key))
+        _gi_cache_stats["hits" if gi is not None else "misses"] += 1
+        return gi
+
+
+def _cache_galaxy_instance(url: str, api_key: str, gi: GalaxyInstance) -> None:
+    with _gi_cache_lock:
+        _gi_cache[(url, api_key)] = gi
+        _gi_cache.move_to_end((url, api_key))
+        while len(_gi_cache) > _GI_CACHE_MAXSIZE:
+            _gi_cache.popitem(last=False)
+
+
+def _get_galaxy_instance(url: str, api_key: str) -> GalaxyInstance:
+    """Return a cached GalaxyInstance for the credentials, creating it if needed."""
+    gi = _get_cached_galaxy_instance(url, api_key)
+    if gi is None:
+        gi = _new_galaxy_instance(url, api_key)
+        _cache_galaxy_instance(url, api_key, gi)
+    return gi
+
+
+def _galaxy_get(
+    base_url: str,
+    api_key: str,
+    path: str,
+    params: dict[str, Any] | None = None,
+    verify: bool | str = True,
+) -> Any:
+    """
+    GET a Galaxy API endpoint directly over the pooled Galaxy session.
+
+    This skips BioBlend's client wrappers for read-only endpoints and decodes the
+    response with orjson when available.
+    """
+    response = _galaxy_http.get(
+        f"{base_url}api/{path}",
+        headers={"x-api-key": api_key},
+        params=params,
+        timeout=HTTP_TIMEOUT,
+        verify=verify,
+    )
+    response.raise_for_status()
+    return _parse_json_response(response)
+
+
+_T = TypeVar("_T")
+
+_galaxy_call_limit = asyncio.Semaphore(GALAXY_CALL_CONCURRENCY)
+
+
+async def _gi_call(fn: Callable[..., _T], *args: Any, **kwargs: Any) -> _T:
+    """Run a blocking BioBlend call in a worker thread so the event loop stays free."""
+    async with _galaxy_call_limit:
+        return await asyncio.to_thread(fn, *args, **kwargs)
+
+
+def clear_galaxy_instance_cache() -> None:
+    """Drop all cached GalaxyInstance objects and reset their counters."""
+    with _gi_cache_lock:
+        _gi_cache.clear()
+        _gi_cache_stats.update(hits=0, misses=0, inits=0, init_ms=0.0)
+    _user_cache.clear()
+    _rejected_credentials_cache.clear()
+
+
 # Initialize Galaxy client if environment variables are set
 if galaxy_state["url"] and galaxy_state["api_key"]:
     try:
-        galaxy_state["gi"] = GalaxyInstance(url=galaxy_state["url"], key=galaxy_state["api_key"])
+        galaxy_state["gi"] = _get_galaxy_instance(galaxy_state["url"], galaxy_state["api_key"])
         galaxy_state["connected"] = True
         logger.info(
             "Galaxy client initialized from environment variables (URL: %s)",
             galaxy_state["url"],
         )
     except Exception as e:
-        logger.warning(f"Failed to initialize Galaxy client from environment variables: {e}")
+        logger.warning("Failed to initialize Galaxy client from environment variables: %s", e)
         logger.warning("You'll need to use connect() to establish a connection.")
 
 
@@ -215,7 +748,7 @@ def _get_request_connection_state() -> dict[str, Any]:
         credentials, api_key = get_active_session(get_access_token)
         if credentials and api_key:
             try:
-                gi = GalaxyInstance(url=credentials.galaxy_url, key=api_key)
+                gi = _get_galaxy_instance(credentials.galaxy_url, api_key)
             except Exception as exc:  # pragma: no cover - defensive logging
                 logger.error("Failed to create Galaxy client for OAuth session: %s", exc)
             else:
@@ -250,7 +783,7 @@ def ensure_connected() -> dict[str, Any]:
     return state
 
 
-@mcp.tool()
+@mcp.tool(annotations=_WRITE_TOOL)
 def connect(url: str | None = None, api_key: str | None = None) -> dict[str, Any]:
     """
     Connect to Galaxy server
@@ -262,12 +795,18 @@ def connect(url: str | None = None, api_key: str | None = None) -> dict[str, Any
     Returns:
         Connection status and user information
     """
+    # Bound up front so the failure handler can tell how far the attempt got
+    use_url: str | None = None
+    use_api_key: str | None = None
+    galaxy_url: str | None = None
+    rejection: Any = _TTLCache._MISSING
     try:
         # Reuse current OAuth session when available
         state = _get_request_connection_state()
         if state["connected"] and state.get("source") == "oauth" and state["gi"]:
             gi: GalaxyInstance = state["gi"]
             user_info = gi.users.get_current_user()
+            _user_cache.set((state["url"], state["api_key"]), user_info)
             return {
                 "connected": True,
                 "user": user_info,
@@ -276,18 +815,25 @@ def connect(url: str | None = None, api_key: str | None = None) -> dict[str, Any
             }
 
         # Use provided parameters or fall back to environment variables
-        use_url = url or os.environ.get("GALAXY_URL")
-        use_api_key = api_key or os.environ.get("GALAXY_API_KEY")
+        use_url = url or _env_credentials["url"]
+        use_api_key = api_key or _env_credentials["api_key"]
 
         # Check if we have the necessary credentials
         if not use_url or not use_api_key:
-            # Try to reload from .env file in case it was added after startup
-            dotenv_path = find_dotenv(usecwd=True)
-            if dotenv_path:
-                load_dotenv(dotenv_path, override=True)
-                # Check again after loading .env
-                use_url = url or os.environ.get("GALAXY_URL")
-                use_api_key = api_key or os.environ.get("GALAXY_API_KEY")
+            # Re-read the .env file found at startup if it was edited since it was loaded.
+            # Searching for a newly created .env walks the directory tree, so only do
+            # that when GALAXY_MCP_RELOAD_ENV=1.
+            env_file = (
+                find_dotenv(usecwd=True)
+                if os.environ.get("GALAXY_MCP_RELOAD_ENV") == "1"
+                else dotenv_path
+            )
+            if env_file:
+                _load_dotenv_if_changed(env_file)
+            # Check again after loading .env, also picking up variables exported since startup
+            env_credentials = _reload_env()
+            use_url = url or env_credentials["url"]
+            use_api_key = api_key or env_credentials["api_key"]
 
             # If still missing credentials, report error
             if not use_url or not use_api_key:
@@ -303,13 +849,22 @@ def connect(url: str | None = None, api_key: str | None = None) -> dict[str, Any
                     f"GALAXY_URL and GALAXY_API_KEY."
                 )
 
-        galaxy_url = use_url if use_url.endswith("/") else f"{use_url}/"
+        galaxy_url = _normalize_url(use_url)
 
-        # Create a new Galaxy instance to test connection
-        gi = GalaxyInstance(url=galaxy_url, key=use_api_key)
+        # Credentials the server just rejected fail fast instead of being sent again
+        rejection = _rejected_credentials_cache.get((galaxy_url, use_api_key))
+        if rejection is not _TTLCache._MISSING:
+            raise ValueError(rejection)
+
+        # Reuse a previously validated client for these credentials when possible
+        cached_gi = _get_cached_galaxy_instance(galaxy_url, use_api_key)
+        gi = cached_gi or _new_galaxy_instance(galaxy_url, use_api_key)
 
         # Test the connection by fetching user info
         user_info = gi.users.get_current_user()
+        if cached_gi is None:
+            _cache_galaxy_instance(galaxy_url, use_api_key, gi)
+        _user_cache.set((galaxy_url, use_api_key), user_info)
 
         # Update galaxy state
         galaxy_state["url"] = galaxy_url
@@ -317,6 +872,9 @@ def connect(url: str | None = None, api_key: str | None = None) -> dict[str, Any
         galaxy_state["gi"] = gi
         galaxy_state["connected"] = True
 
+        # Warm the tool panel and IWC caches while the caller decides what to do next
+        prefetch_caches(galaxy_state)
+
         return {"connected": True, "user": user_info}
     except Exception as e:
         # Reset state on failure
@@ -325,13 +883,29 @@ def connect(url: str | None = None, api_key: str | None = None) -> dict[str, Any
         galaxy_state["gi"] = None
         galaxy_state["connected"] = False
 
-        galaxy_url = locals().get("galaxy_url") or use_url or normalized_galaxy_url or "unknown"
-        error_msg = f"Failed to connect to Galaxy at {galaxy_url}: {str(e)}"
-        if "401" in str(e) or "authentication" in str(e).lower():
+        # Don't keep serving a user for credentials that just failed
+        credentials_key = (galaxy_url, use_api_key)
+        _user_cache.discard(credentials_key)
+
+        error_str = str(e)
+        # Remember credentials Galaxy itself refused; repeats within the TTL don't extend it
+        status = _HTTP_STATUS_RE.search(error_str)
+        if (
+            galaxy_url
+            and status
+            and status.group(1) in ("401", "403")
+            and rejection is _TTLCache._MISSING
+        ):
+            _rejected_credentials_cache.set(credentials_key, error_str)
+
+        failed_url = galaxy_url or use_url or normalized_galaxy_url or "unknown"
+        error_lower = error_str.lower()
+        error_msg = f"Failed to connect to Galaxy at {failed_url}: {error_str}"
+        if "401" in error_str or "authentication" in error_lower:
             error_msg += " Check that your API key is valid and has the necessary permissions."
-        elif "404" in str(e) or "not found" in str(e).lower():
+        elif "404" in error_str or "not found" in error_lower:
             error_msg += " Check that the Galaxy URL is correct and accessible."
-        elif "connection" in str(e).lower() or "timeout" in str(e).lower():
+        elif "connection" in error_lower or "timeout" in error_lower:
             error_msg += " Check your network connection and that the Galaxy server is running."
         else:
             error_msg += " Verify the URL format (should end with /) and API key."
@@ -339,13 +913,88 @@ def connect(url: str | None = None, api_key: str | None = None) -> dict[str, Any
         raise ValueError(error_msg) from e
 
 
-@mcp.tool()
-def search_tools_by_name(query: str) -> dict[str, Any]:
+def _average_ms(total_ms: float, count: float) -> float:
+    return round(total_ms / count, 3) if count else 0.0
+
+
+@mcp.tool(annotations=_READ_ONLY_TOOL)
+def get_cache_stats() -> dict[str, Any]:
+    """
+    Report hit/miss counters and sizes for the server's in-memory caches
+
+    Use this to judge whether the cache TTLs suit your workload.
+
+    Returns:
+        Dictionary keyed by cache name with hits, misses, current size and, where
+        the cache loads data itself, the average load time in milliseconds
+    """
+    with _gi_cache_lock:
+        gi_stats = {
+            "hits": int(_gi_cache_stats["hits"]),
+            "misses": int(_gi_cache_stats["misses"]),
+            "size": len(_gi_cache),
+            "avg_init_ms": _average_ms(_gi_cache_stats["init_ms"], _gi_cache_stats["inits"]),
+        }
+    with _iwc_lock:
+        manifest = _iwc_cache["manifest"]
+        iwc_stats = {
+            "hits": int(_iwc_stats["hits"]),
+            "misses": int(_iwc_stats["misses"]),
+            "size": len(manifest) if manifest is not None else 0,
+            "avg_fetch_ms": _average_ms(_iwc_stats["fetch_ms"], _iwc_stats["fetches"]),
+            "not_modified": int(_iwc_stats["not_modified"]),
+            "ttl_seconds": IWC_CACHE_TTL,
+        }
+    return {
+        "galaxy_instances": gi_stats,
+        "users": {**_user_cache.stats(), "ttl_seconds": USER_CACHE_TTL},
+        "rejected_credentials": {
+            **_rejected_credentials_cache.stats(),
+            "ttl_seconds": REJECTED_CREDENTIALS_TTL,
+        },
+        "iwc_manifest": iwc_stats,
+        "tool_details": {**_tool_details_cache.stats(), "ttl_seconds": TOOL_CACHE_TTL},
+        "tool_panel": {**_tool_panel_cache.stats(), "ttl_seconds": TOOL_CACHE_TTL},
+        "tool_list": {**_tool_list_cache.stats(), "ttl_seconds": TOOL_CACHE_TTL},
+        "panel_tools": {**_panel_tools_cache.stats(), "ttl_seconds": TOOL_CACHE_TTL},
+        "extension_index": {**_extension_index_cache.stats(), "ttl_seconds": TOOL_CACHE_TTL},
+        "tool_tests": {**_tool_tests_cache.stats(), "ttl_seconds": TOOL_CACHE_TTL},
+        "server_info": {**_server_info_cache.stats(), "ttl_seconds": TOOL_CACHE_TTL},
+    }
+
+
+@mcp.tool(annotations=_WRITE_TOOL)
+def reset_cache_stats() -> dict[str, Any]:
+    """
+    Zero the hit/miss counters of every cache without evicting cached data
+
+    Returns:
+        Confirmation that the counters were reset
+    """
+    with _gi_cache_lock:
+        _gi_cache_stats.update(hits=0, misses=0, inits=0, init_ms=0.0)
+    with _iwc_lock:
+        _iwc_stats.update(hits=0, misses=0, fetches=0, fetch_ms=0.0, not_modified=0)
+    _user_cache.reset_stats()
+    _rejected_credentials_cache.reset_stats()
+    _tool_details_cache.reset_stats()
+    _tool_panel_cache.reset_stats()
+    _tool_list_cache.reset_stats()
+    _panel_tools_cache.reset_stats()
+    _extension_index_cache.reset_stats()
+    _tool_tests_cache.reset_stats()
+    _server_info_cache.reset_stats()
+    return {"reset": True}
+
+
+@mcp.tool(annotations=_READ_ONLY_TOOL)
+async def search_tools_by_name(query: str, force_refresh: bool = False) -> dict[str, Any]:
     """
     Search Galaxy tools whose name, ID, or description contains the given query (substring match).
 
     Args:
         query: Search query (tool name, ID, or description to filter on)
+        force_refresh: Fetch the tool list from Galaxy even if a cached copy is still fresh
 
     Returns:
         List of tools matching the query
@@ -354,18 +1003,30 @@ def search_tools_by_name(query: str) -> dict[str, Any]:
     gi: GalaxyInstance = state["gi"]
 
     try:
-        # Get all tools and filter client-side for substring matching
-        # The get_tools(name=query) parameter doesn't support substring matching
-        all_tools = gi.tools.get_tools()
+        cache_key = (state["url"], state["api_key"])
+        search_entries: Any = (
+            _TTLCache._MISSING if force_refresh else _tool_list_cache.get(cache_key)
+        )
+        if search_entries is _TTLCache._MISSING:
+            # Get all tools and filter client-side for substring matching
+            # The get_tools(name=query) parameter doesn't support substring matching
+            search_entries = [
+                (
+                    tool.get("name", "").lower(),
+                    tool.get("id", "").lower(),
+                    tool.get("description", "").lower(),
+                    tool,
+                )
+                for tool in await _gi_call(gi.tools.get_tools)
+            ]
+            _tool_list_cache.set(cache_key, search_entries)
         query_lower = query.lower()
 
         # Filter tools by substring match in name, ID, or description
         matching_tools = [
             tool
-            for tool in all_tools
-            if query_lower in tool.get("name", "").lower()
-            or query_lower in tool.get("id", "").lower()
-            or query_lower in tool.get("description", "").lower()
+            for name, tool_id, description, tool in search_entries
+            if query_lower in name or query_lower in tool_id or query_lower in description
         ]
 
         return {"tools": matching_tools}
@@ -373,7 +1034,202 @@ def search_tools_by_name(query: str) -> dict[str, Any]:
         raise ValueError(format_error("Search tools", e, {"query": query})) from e
 
 
-@mcp.tool()
+# Tool metadata rarely changes between calls, so keep it per (url, api_key)
+_tool_details_cache = _TTLCache(TOOL_CACHE_TTL)
+_tool_panel_cache = _TTLCache(TOOL_CACHE_TTL, maxsize=64)
+# Lowercased (name, id, description, tool) tuples for search_tools_by_name
+_tool_list_cache = _TTLCache(TOOL_CACHE_TTL, maxsize=64)
+# Flattened panel as lowercased (name, description, tool) tuples for search_tools_by_keywords
+_panel_tools_cache = _TTLCache(TOOL_CACHE_TTL, maxsize=64)
+# Tool ID -> lowercased input extensions, seeded from one bulk tool listing and
+# filled in from show_tool as search_tools_by_keywords reaches uncovered tools
+_extension_index_cache = _TTLCache(TOOL_CACHE_TTL, maxsize=64)
+# Galaxy URLs whose bulk tool listing came back without inputs; the multi-MB listing
+# is not requested from them again for the life of the process
+_bulk_tool_inputs_unsupported: set[str] = set()
+# XML test definitions per (url, api_key, tool_id, tool_version)
+_tool_tests_cache = _TTLCache(TOOL_CACHE_TTL)
+# (config, version) pairs from the server's config endpoints
+_server_info_cache = _TTLCache(TOOL_CACHE_TTL, maxsize=64)
+
+
+def _tool_disk_cache_path(state: dict[str, Any], key: tuple[Any, ...]) -> Path | None:
+    """
+    Return the disk cache file for a tool lookup, or None when disk caching is off.
+
+    Entries are keyed by the Galaxy version as well as the credentials, so upgrading
+    the server moves lookups to fresh files instead of serving stale tool metadata.
+    """
+    if TOOL_DISK_CACHE_DIR is None:
+        return None
+    try:
+        version = _get_server_info_cached(state)[1].get("version_major")
+    except Exception as e:
+        logger.debug("Galaxy version unavailable, skipping the tool disk cache: %s", e)
+        return None
+    digest = hashlib.sha256(_dumps([state["url"], state["api_key"], version, *key])).hexdigest()
+    return TOOL_DISK_CACHE_DIR / f"{digest}.json"
+
+
+def _fetch_with_disk_cache(
+    state: dict[str, Any], key: tuple[Any, ...], fetch: Callable[[], _T]
+) -> _T:
+    """Serve ``fetch()`` from the tool disk cache when a fresh entry exists, else store it."""
+    path = _tool_disk_cache_path(state, key)
+    if path is None:
+        return fetch()
+    try:
+        if time.time() - path.stat().st_mtime < TOOL_DISK_CACHE_TTL:
+            data = path.read_bytes()
+            return orjson.loads(data) if orjson is not None else json.loads(data)
+    except (OSError, ValueError):
+        # Missing, unreadable or partially written files are simply refetched
+        pass
+    value = fetch()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.stem}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(_dumps(value))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.debug("Could not write the tool disk cache entry %s: %s", path, e)
+    return value
+
+
+def _show_tool_cached(state: dict[str, Any], tool_id: str, io_details: bool) -> dict[str, Any]:
+    """Fetch tool details through the TTL cache; errors propagate and are not cached."""
+    cache_key = (state["url"], state["api_key"], tool_id, io_details)
+    tool_info = _tool_details_cache.get(cache_key)
+    if tool_info is _TTLCache._MISSING:
+        tool_info = _fetch_with_disk_cache(
+            state,
+            ("show_tool", tool_id, io_details),
+            lambda: state["gi"].tools.show_tool(tool_id, io_details=io_details),
+        )
+        _tool_details_cache.set(cache_key, tool_info)
+    return tool_info
+
+
+def _get_tool_panel_cached(state: dict[str, Any]) -> Any:
+    """Fetch the tool panel through the TTL cache; errors propagate and are not cached."""
+    cache_key = (state["url"], state["api_key"])
+    tool_panel = _tool_panel_cache.get(cache_key)
+    if tool_panel is _TTLCache._MISSING:
+        tool_panel = _fetch_with_disk_cache(
+            state, ("tool_panel",), state["gi"].tools.get_tool_panel
+        )
+        _tool_panel_cache.set(cache_key, tool_panel)
+    return tool_panel
+
+
+def _iter_panel_tools(panel: Any) -> Iterator[dict[str, Any]]:
+    """Yield the tools in a tool panel, in panel order, skipping section wrappers."""
+    # Walk the panel with an explicit stack; children are pushed in reverse
+    # so tools come out in panel order.
+    stack = [panel]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(reversed(node))
+        elif isinstance(node, dict):
+            if "elems" in node:
+                stack.extend(reversed(node["elems"]))
+            else:
+                # Assume this dict represents a tool if no sub-elements exist.
+                yield node
+
+
+def _get_panel_tools_cached(state: dict[str, Any]) -> list[tuple[str, str, dict[str, Any]]]:
+    """Return the flattened tool panel as lowercased (name, description, tool) tuples."""
+    cache_key = (state["url"], state["api_key"])
+    panel_tools = _panel_tools_cache.get(cache_key)
+    if panel_tools is _TTLCache._MISSING:
+        panel_tools = [
+            ((tool.get("name") or "").lower(), (tool.get("description") or "").lower(), tool)
+            for tool in _iter_panel_tools(_get_tool_panel_cached(state))
+        ]
+        _panel_tools_cache.set(cache_key, panel_tools)
+    return panel_tools
+
+
+def _input_extensions(tool_inputs: Any) -> frozenset[str]:
+    """Collect the lowercased data formats accepted by a tool's input specs."""
+    extensions: set[str] = set()
+    for input_spec in tool_inputs or ():
+        if not isinstance(input_spec, dict):
+            continue
+        fmt = input_spec.get("extensions", "")
+        # 'extensions' might be a list or a string.
+        if isinstance(fmt, list):
+            extensions.update(ext.lower() for ext in fmt if isinstance(ext, str) and ext)
+        elif isinstance(fmt, str) and fmt:
+            extensions.add(fmt.lower())
+    return frozenset(extensions)
+
+
+def _get_extension_index(state: dict[str, Any]) -> dict[str, frozenset[str]]:
+    """
+    Return the tool ID -> input extensions index for the connected server.
+
+    The index is seeded from a single ``/api/tools?io_details=true`` listing.
+    Servers whose listing does not include inputs yield an empty index and are
+    remembered, so later indexes for that URL skip the listing altogether;
+    callers add the tools they look up individually.
+    """
+    cache_key = (state["url"], state["api_key"])
+    index = _extension_index_cache.get(cache_key)
+    if index is _TTLCache._MISSING:
+        tools: Any = []
+        if state["url"] and state["api_key"] and state["url"] not in _bulk_tool_inputs_unsupported:
+            try:
+                tools = _galaxy_get(
+                    state["url"],
+                    state["api_key"],
+                    "tools",
+                    {"in_panel": "false", "io_details": "true"},
+                    verify=state["gi"].verify,
+                )
+            except Exception as e:
+                logger.debug("Bulk tool listing unavailable, using per-tool lookups: %s", e)
+        index = {
+            tool["id"]: _input_extensions(tool["inputs"])
+            for tool in tools
+            if isinstance(tool, dict) and "id" in tool and "inputs" in tool
+        }
+        if tools and not index:
+            _bulk_tool_inputs_unsupported.add(state["url"])
+        _extension_index_cache.set(cache_key, index)
+    return index
+
+
+def _get_server_info_cached(state: dict[str, Any]) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Fetch the server config and version through the TTL cache."""
+    cache_key = (state["url"], state["api_key"])
+    server_info = _server_info_cache.get(cache_key)
+    if server_info is _TTLCache._MISSING:
+        gi: GalaxyInstance = state["gi"]
+        server_info = (gi.config.get_config(), gi.config.get_version())
+        _server_info_cache.set(cache_key, server_info)
+    return server_info
+
+
+def clear_tool_cache() -> None:
+    """Drop cached tool details, tool panels, tool lists and server info, in memory and on disk."""
+    if TOOL_DISK_CACHE_DIR is not None:
+        # The directory may be shared, so only remove files named like our entries
+        for path in TOOL_DISK_CACHE_DIR.glob("*.json"):
+            if _SHA256_JSON_NAME.fullmatch(path.name):
+                path.unlink(missing_ok=True)
+    _tool_details_cache.clear()
+    _tool_panel_cache.clear()
+    _tool_list_cache.clear()
+    _panel_tools_cache.clear()
+    _extension_index_cache.clear()
+    _tool_tests_cache.clear()
+    _server_info_cache.clear()
+
+
+@mcp.tool(annotations=_READ_ONLY_TOOL)
 def get_tool_details(tool_id: str, io_details: bool = False) -> dict[str, Any]:
     """
     Get detailed information about a specific tool
@@ -386,19 +1242,70 @@ def get_tool_details(tool_id: str, io_details: bool = False) -> dict[str, Any]:
         Tool details
     """
     state = ensure_connected()
-    gi: GalaxyInstance = state["gi"]
 
     try:
         # Get detailed information about the tool
-        tool_info = gi.tools.show_tool(tool_id, io_details=io_details)
-        return tool_info
+        return _show_tool_cached(state, tool_id, io_details)
     except Exception as e:
         raise ValueError(
             format_error("Get tool details", e, {"tool_id": tool_id, "io_details": io_details})
         ) from e
 
 
-@mcp.tool()
+@mcp.tool(annotations=_READ_ONLY_TOOL)
+def get_tool_details_batch(
+    tool_ids: list[str], io_details: bool = False, max_workers: int = 8
+) -> dict[str, Any]:
+    """
+    Get detailed information about several tools at once, fetching them concurrently
+
+    Args:
+        tool_ids: IDs of the tools to look up
+        io_details: Whether to include input/output details
+        max_workers: Maximum number of concurrent requests to Galaxy (default: 8, capped at
+            GALAXY_MCP_GALAXY_CALL_CONCURRENCY)
+
+    Returns:
+        Dictionary with tool details keyed by tool ID and per-tool error messages
+    """
+    state = ensure_connected()
+    unique_ids = list(dict.fromkeys(tool_ids))
+    tools: dict[str, Any] = {}
+    errors: dict[str, str] = {}
+
+    if unique_ids:
+        workers = max(1, min(max_workers, GALAXY_CALL_CONCURRENCY, len(unique_ids)))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            future_to_id = {
+                executor.submit(_show_tool_cached, state, tool_id, io_details): tool_id
+                for tool_id in unique_ids
+            }
+            for future in concurrent.futures.as_completed(future_to_id):
+                tool_id = future_to_id[future]
+                try:
+                    tools[tool_id] = future.result()
+                except Exception as e:
+                    errors[tool_id] = format_error("Get tool details", e, {"tool_id": tool_id})
+
+    return {"tools": tools, "errors": errors, "count": len(tools)}
+
+
+@mcp.tool(annotations=_WRITE_TOOL)
+def refresh_tool_cache() -> dict[str, Any]:
+    """
+    Discard cached tool details, tool panel structures and tool lists
+
+    Tool metadata is cached in memory for GALAXY_MCP_TOOL_CACHE_TTL seconds (default: 300).
+    Call this after tools are installed or updated on the Galaxy server.
+
+    Returns:
+        Confirmation that the cache was cleared
+    """
+    clear_tool_cache()
+    return {"cleared": True, "ttl_seconds": TOOL_CACHE_TTL}
+
+
+@mcp.tool(annotations=_READ_ONLY_TOOL)
 def get_tool_run_examples(tool_id: str, tool_version: str | None = None) -> dict[str, Any]:
     """
     Return the exact XML test definitions (inputs, outputs, assertions, required files)
@@ -411,10 +1318,15 @@ def get_tool_run_examples(tool_id: str, tool_version: str | None = None) -> dict
     Returns:
         Dictionary containing the list of test cases and summary metadata
     """
-    ensure_connected()
+    state = ensure_connected()
+    gi: GalaxyInstance = state["gi"]
 
     try:
-        test_cases = galaxy_state["gi"].tools.get_tool_tests(tool_id, tool_version=tool_version)
+        cache_key = (state["url"], state["api_key"], tool_id, tool_version)
+        test_cases = _tool_tests_cache.get(cache_key)
+        if test_cases is _TTLCache._MISSING:
+            test_cases = gi.tools.get_tool_tests(tool_id, tool_version=tool_version)
+            _tool_tests_cache.set(cache_key, test_cases)
         response: dict[str, Any] = {
             "tool_id": tool_id,
             "requested_version": tool_version,
@@ -429,7 +1341,7 @@ def get_tool_run_examples(tool_id: str, tool_version: str | None = None) -> dict
         raise ValueError(format_error("Get tool run examples", e, context)) from e
 
 
-@mcp.tool()
+@mcp.tool(annotations=_READ_ONLY_TOOL)
 def get_tool_citations(tool_id: str) -> dict[str, Any]:
     """
     Get citation information for a specific tool
@@ -441,11 +1353,10 @@ def get_tool_citations(tool_id: str) -> dict[str, Any]:
         Tool citation information
     """
     state = ensure_connected()
-    gi: GalaxyInstance = state["gi"]
 
     try:
         # Get the tool information which includes citations
-        tool_info = gi.tools.show_tool(tool_id)
+        tool_info = _show_tool_cached(state, tool_id, False)
 
         # Extract citation information
         citations = tool_info.get("citations", [])
@@ -459,7 +1370,7 @@ def get_tool_citations(tool_id: str) -> dict[str, Any]:
         raise ValueError(format_error("Get tool citations", e, {"tool_id": tool_id})) from e
 
 
-@mcp.tool()
+@mcp.tool(annotations=_WRITE_TOOL)
 def run_tool(history_id: str, tool_id: str, inputs: dict[str, Any]) -> dict[str, Any]:
     """
     Run a tool in Galaxy
@@ -489,26 +1400,51 @@ def run_tool(history_id: str, tool_id: str, inputs: dict[str, Any]) -> dict[str,
         ) from e
 
 
-@mcp.tool()
-def get_tool_panel() -> dict[str, Any]:
+def _keyword_matcher(keywords: list[str]) -> Callable[[str], bool]:
+    """
+    Build a predicate telling whether a lowercase string contains any of the keywords.
+
+    Uses a single Aho-Corasick automaton when pyahocorasick is installed, else one
+    compiled regex alternation.
+    """
+    lowered = {k.lower() for k in keywords}
+    if "" in lowered:
+        # An empty keyword is a substring of everything
+        return lambda text: True
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for keyword in lowered:
+            automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+        return lambda text: next(automaton.iter(text), None) is not None
+    pattern = re.compile("|".join(re.escape(k) for k in lowered))
+    return lambda text: pattern.search(text) is not None
+
+
+@mcp.tool(annotations=_READ_ONLY_TOOL)
+async def get_tool_panel(return_mode: Literal["inline", "ref"] = "inline") -> dict[str, Any]:
     """
     Get the tool panel structure (toolbox)
 
+    Args:
+        return_mode: "inline" to return the panel directly, or "ref" to write it to a
+                    local JSON file and return a reference that fetch_ref can read back
+
     Returns:
-        Tool panel hierarchy
+        Tool panel hierarchy, or a reference with size and sha256 digest
     """
     state = ensure_connected()
-    gi: GalaxyInstance = state["gi"]
 
     try:
         # Get the tool panel structure
-        tool_panel = gi.tools.get_tool_panel()
-        return {"tool_panel": tool_panel}
+        tool_panel = await _gi_call(_get_tool_panel_cached, state)
     except Exception as e:
         raise ValueError(format_error("Get tool panel", e)) from e
 
+    return _maybe_offload({"tool_panel": tool_panel}, force=return_mode == "ref")
+
 
-@mcp.tool()
+@mcp.tool(annotations=_WRITE_TOOL)
 def create_history(history_name: str) -> dict[str, Any]:
     """
     Create a new history in Galaxy
@@ -524,8 +1460,8 @@ def create_history(history_name: str) -> dict[str, Any]:
     return gi.histories.create_history(history_name)
 
 
-@mcp.tool()
-def search_tools_by_keywords(keywords: list[str]) -> dict[str, Any]:
+@mcp.tool(annotations=_READ_ONLY_TOOL)
+def search_tools_by_keywords(keywords: list[str], max_results: int | None = 50) -> dict[str, Any]:
     """
     Recommend Galaxy tools based on a list of keywords.
 
@@ -533,6 +1469,9 @@ def search_tools_by_keywords(keywords: list[str]) -> dict[str, Any]:
         keywords (list[str]): A list of keywords or phrases describing what you're looking for,
             e.g., ["csv", "rna", "alignment", "visualization"]. The search will match tools
             whose name, description, or accepted input formats contain any of these keywords.
+        max_results (int | None): Stop once this many tools have matched (default: 50).
+            Tools matching by name or description are taken first; input formats are only
+            looked up while the cap has not been reached. Pass None to check every tool.
 
     Returns:
         dict: {
@@ -542,82 +1481,92 @@ def search_tools_by_keywords(keywords: list[str]) -> dict[str, Any]:
     """
 
     state = ensure_connected()
-    gi: GalaxyInstance = state["gi"]
 
-    lock = threading.Lock()
+    if not keywords:
+        return {"recommended_tools": [], "count": 0}
 
-    keywords_lower = [k.lower() for k in keywords]
+    # One automaton (or regex) scan per string replaces an any(kw in text ...) loop
+    matches_keyword = _keyword_matcher(keywords)
+    # Extensions are usually whole format names, so exact hits are a set lookup
+    keyword_set = frozenset(k.lower() for k in keywords)
 
     try:
-        tool_panel = gi.tools.get_tool_panel()
-
-        def flatten_tools(panel):
-            tools = []
-            if isinstance(panel, list):
-                for item in panel:
-                    tools.extend(flatten_tools(item))
-            elif isinstance(panel, dict):
-                if "elems" in panel:
-                    for item in panel["elems"]:
-                        tools.extend(flatten_tools(item))
-                else:
-                    # Assume this dict represents a tool if no sub-elements exist.
-                    tools.append(panel)
-            return tools
-
-        all_tools = flatten_tools(tool_panel)
-        recommended_tools = []
-
-        # Separate tools that already match by name/description.
-        tools_to_fetch = []
-        for tool in all_tools:
-            name = (tool.get("name") or "").lower()
-            description = (tool.get("description") or "").lower()
-            if any(kw in name for kw in keywords_lower) or any(
-                kw in description for kw in keywords_lower
-            ):
+        # The panel is flattened and lowercased once per cache period, not per search
+        panel_tools = _get_panel_tools_cached(state)
+        recommended_tools: list[dict[str, Any]] = []
+
+        def cap_reached() -> bool:
+            return max_results is not None and len(recommended_tools) >= max_results
+
+        # Separate tools that already match by name/description. A tool listed under
+        # several panel sections is recommended, or has its inputs checked, only once.
+        matched_ids: set[str] = set()
+        unmatched_by_id: dict[str, dict[str, Any]] = {}
+        for name, description, tool in panel_tools:
+            if cap_reached():
+                # Input formats are not looked up once the cap is met by name alone
+                break
+            tool_id = tool.get("id")
+            if matches_keyword(name) or matches_keyword(description):
+                if not tool_id:
+                    recommended_tools.append(tool)
+                elif tool_id not in matched_ids:
+                    matched_ids.add(tool_id)
+                    recommended_tools.append(tool)
+            elif tool_id and not tool_id.endswith("_label"):
+                unmatched_by_id.setdefault(tool_id, tool)
+        tools_to_fetch = list(unmatched_by_id.values())
+
+        def extensions_match(extensions: frozenset[str]) -> bool:
+            # Fall back to substring matching for partial format names
+            return not keyword_set.isdisjoint(extensions) or any(
+                matches_keyword(ext) for ext in extensions
+            )
+
+        # Match locally against the extension index, leaving per-tool lookups for
+        # the tools it does not cover yet.
+        extension_index = (
+            _get_extension_index(state) if tools_to_fetch and not cap_reached() else {}
+        )
+        remaining = []
+        for tool in tools_to_fetch:
+            if cap_reached():
+                break
+            extensions = extension_index.get(tool["id"])
+            if extensions is None:
+                remaining.append(tool)
+            elif extensions_match(extensions):
                 recommended_tools.append(tool)
-            else:
-                tools_to_fetch.append(tool)
+        tools_to_fetch = remaining
 
-        # Define a helper to check each tool's details.
-        def check_tool(tool):
-            tool_id = tool.get("id")
-            if not tool_id:
-                return None
-            if tool_id.endswith("_label"):
-                return None
+        # Bound once here rather than re-resolved in every worker call
+        show_tool = functools.partial(_show_tool_cached, state)
+
+        def fetch_extensions(tool: dict[str, Any]) -> frozenset[str] | None:
             try:
-                tool_details = gi.tools.show_tool(tool_id, io_details=True)
-                tool_inputs = tool_details.get("inputs", [{}])
-                for input_spec in tool_inputs:
-                    if not isinstance(input_spec, dict):
-                        continue
-                    fmt = input_spec.get("extensions", "")
-                    # 'extensions' might be a list or a string.
-                    if isinstance(fmt, list):
-                        for ext in fmt:
-                            if ext and any(kw in ext.lower() for kw in keywords_lower):
-                                return tool
-                    elif (
-                        isinstance(fmt, str)
-                        and fmt
-                        and any(kw in fmt.lower() for kw in keywords_lower)
-                    ):
-                        return tool
-                return None
+                return _input_extensions(show_tool(tool["id"], True).get("inputs"))
             except Exception:
                 return None
 
-        # Use a thread pool to concurrently check tools that require detail retrieval.
-        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-            future_to_tool = {executor.submit(check_tool, tool): tool for tool in tools_to_fetch}
-            for future in concurrent.futures.as_completed(future_to_tool):
-                result = future.result()
-                if result is not None:
-                    # Use the lock to ensure thread-safe appending.
-                    with lock:
-                        recommended_tools.append(result)
+        # Use a thread pool to concurrently look up tools missing from the index.
+        # The worker count matches the Galaxy session's connection pool size.
+        if tools_to_fetch and not cap_reached():
+            with concurrent.futures.ThreadPoolExecutor(max_workers=32) as executor:
+                # map yields in panel order, so a capped search returns the same tools
+                # each time. Results are collected on the calling thread only, so no
+                # lock is needed.
+                lookups = executor.map(fetch_extensions, tools_to_fetch)
+                for tool, extensions in zip(tools_to_fetch, lookups, strict=True):
+                    if extensions is None:
+                        continue
+                    # Later searches match this tool without another request
+                    extension_index[tool["id"]] = extensions
+                    if extensions_match(extensions):
+                        recommended_tools.append(tool)
+                        if cap_reached():
+                            # Skip the show_tool calls that have not started yet.
+                            executor.shutdown(wait=False, cancel_futures=True)
+                            break
 
         slim_tools = []
         for tool in recommended_tools:
@@ -634,7 +1583,7 @@ def search_tools_by_keywords(keywords: list[str]) -> dict[str, Any]:
         raise ValueError(f"Failed to search tools by keywords: {str(e)}") from e
 
 
-@mcp.tool()
+@mcp.tool(annotations=_READ_ONLY_TOOL)
 def get_server_info() -> dict[str, Any]:
     """
     Get Galaxy server information including version, URL, and configuration details
@@ -643,15 +1592,11 @@ def get_server_info() -> dict[str, Any]:
         Server information including version, URL, and other configuration details
     """
     state = ensure_connected()
-    gi: GalaxyInstance = state["gi"]
     url = state["url"] or normalized_galaxy_url
 
     try:
-        # Get server configuration info
-        config_info = gi.config.get_config()
-
-        # Get server version info
-        version_info = gi.config.get_version()
+        # Server configuration and version rarely change, so both come from the cache
+        config_info, version_info = _get_server_info_cached(state)
 
         # Build comprehensive server info response
         server_info = {
@@ -684,11 +1629,15 @@ def get_server_info() -> dict[str, Any]:
         raise ValueError(f"Failed to get server information: {str(e)}") from e
 
 
-@mcp.tool()
-def get_user() -> dict[str, Any]:
+@mcp.tool(annotations=_READ_ONLY_TOOL)
+async def get_user(force_refresh: bool = False) -> dict[str, Any]:
     """
     Get current user information
 
+    Args:
+        force_refresh: Fetch the user from Galaxy even if a cached copy is available
+                      (e.g. after the quota or preferences changed)
+
     Returns:
         Current user details
     """
@@ -696,14 +1645,20 @@ def get_user() -> dict[str, Any]:
     gi: GalaxyInstance = state["gi"]
 
     try:
-        user_info = gi.users.get_current_user()
+        cache_key = (state["url"], state["api_key"])
+        if force_refresh:
+            _user_cache.discard(cache_key)
+        user_info = _user_cache.get(cache_key)
+        if user_info is _TTLCache._MISSING:
+            user_info = await _gi_call(gi.users.get_current_user)
+            _user_cache.set(cache_key, user_info)
         return user_info
     except Exception as e:
         raise ValueError(f"Failed to get user: {str(e)}") from e
 
 
-@mcp.tool()
-def get_histories(
+@mcp.tool(annotations=_READ_ONLY_TOOL)
+async def get_histories(
     limit: int | None = None, offset: int = 0, name: str | None = None
 ) -> dict[str, Any]:
     """
@@ -722,12 +1677,14 @@ def get_histories(
 
     try:
         # Get histories with pagination and optional filtering
-        histories = gi.histories.get_histories(limit=limit, offset=offset, name=name)
+        page = _gi_call(gi.histories.get_histories, limit=limit, offset=offset, name=name)
 
         # If pagination is used, get total count for metadata
         if limit is not None:
-            # Get total count without pagination
-            all_histories = gi.histories.get_histories(name=name)
+            # Fetch the total count alongside the page rather than after it
+            histories, all_histories = await asyncio.gather(
+                page, _gi_call(gi.histories.get_histories, name=name)
+            )
             total_items = len(all_histories) if all_histories else 0
 
             # Calculate pagination metadata
@@ -755,6 +1712,7 @@ def get_histories(
                 ),
             }
         else:
+            histories = await page
             # No pagination requested, return simple count
             pagination = {
                 "total_items": len(histories),
@@ -771,7 +1729,7 @@ def get_histories(
         )
 
 
-@mcp.tool()
+@mcp.tool(annotations=_READ_ONLY_TOOL)
 def list_history_ids() -> list[dict[str, str]]:
     """
     Get a simplified list of history IDs and names for easy reference
@@ -783,7 +1741,8 @@ def list_history_ids() -> list[dict[str, str]]:
     gi: GalaxyInstance = state["gi"]
 
     try:
-        histories = gi.histories.get_histories()
+        # Ask the server for just the two fields returned here
+        histories = gi.histories.get_histories(keys=["id", "name"])
         if not histories:
             return []
         # Extract just the id and name for convenience
@@ -793,8 +1752,8 @@ def list_history_ids() -> list[dict[str, str]]:
         raise ValueError(f"Failed to list history IDs: {str(e)}") from e
 
 
-@mcp.tool()
-def get_history_details(history_id: str) -> dict[str, Any]:
+@mcp.tool(annotations=_READ_ONLY_TOOL)
+async def get_history_details(history_id: str) -> dict[str, Any]:
     """
     Get history metadata and summary count ONLY - does not return actual datasets
 
@@ -818,14 +1777,17 @@ def get_history_details(history_id: str) -> dict[str, Any]:
     gi: GalaxyInstance = state["gi"]
 
     try:
-        logger.info(f"Getting details for history ID: {history_id}")
-
-        # Get history details
-        history_info = gi.histories.show_history(history_id, contents=False)
-        logger.info(f"Successfully retrieved history info: {history_info.get('name', 'Unknown')}")
+        logger.info("Getting details for history ID: %s", history_id)
+
+        # Get history details and count its contents (datasets and collections)
+        # concurrently. The contents listing only carries IDs, so it stays small
+        # even for large histories.
+        history_info, all_contents = await asyncio.gather(
+            _gi_call(gi.histories.show_history, history_id, contents=False),
+            _gi_call(gi.histories.show_history, history_id, contents=True, keys=["id"]),
+        )
+        logger.info("Successfully retrieved history info: %s", history_info.get("name", "Unknown"))
 
-        # Get total count by calling without limit
-        all_contents = gi.histories.show_history(history_id, contents=True)
         total_items = len(all_contents) if all_contents else 0
 
         return {
@@ -837,7 +1799,7 @@ def get_history_details(history_id: str) -> dict[str, Any]:
             },
         }
     except Exception as e:
-        logger.error(f"Failed to get history details for ID '{history_id}': {str(e)}")
+        logger.error("Failed to get history details for ID '%s': %s", history_id, e)
         if "404" in str(e) or "No route" in str(e):
             raise ValueError(
                 f"History ID '{history_id}' not found. Make sure to pass a valid history ID string."
@@ -845,7 +1807,7 @@ def get_history_details(history_id: str) -> dict[str, Any]:
         raise ValueError(f"Failed to get history details for ID '{history_id}': {str(e)}") from e
 
 
-@mcp.tool()
+@mcp.tool(annotations=_READ_ONLY_TOOL)
 def get_history_contents(
     history_id: str,
     limit: int = 100,
@@ -879,7 +1841,8 @@ def get_history_contents(
 
     Note:
         Performance: This function uses gi.histories.show_history(contents=True) to
-        fetch all items and then paginates client-side. For very large histories,
+        fetch all matching items (deleted and hidden ones are filtered by the server)
+        and then paginates client-side. For very large histories,
         this may be slower than server-side pagination, but it is required to
         include dataset collections alongside datasets.
     """
@@ -888,16 +1851,31 @@ def get_history_contents(
 
     try:
         logger.info(
-            f"Getting contents for history ID: {history_id} "
-            f"(limit={limit}, offset={offset}, order={order})"
+            "Getting contents for history ID: %s (limit=%s, offset=%s, order=%s)",
+            history_id,
+            limit,
+            offset,
+            order,
         )
 
-        # Use show_history with contents=True to get both datasets and collections
-        all_contents_raw = gi.histories.show_history(history_id, contents=True)
+        # Use show_history with contents=True to get both datasets and collections,
+        # letting the server drop deleted and hidden items when they are not wanted
+        all_contents_raw = gi.histories.show_history(
+            history_id,
+            contents=True,
+            deleted=None if deleted else False,
+            visible=True if visible else None,
+        )
 
-        # Add history_content_type field to distinguish datasets from collections
-        all_contents = []
+        # Filter by visibility and deleted status in the same pass that adds the
+        # history_content_type field, in case the server ignored the filters
+        filtered_contents = []
         for item in all_contents_raw:
+            if not deleted and item.get("deleted", False):
+                continue
+            if visible and not item.get("visible", True):
+                continue
+
             # Determine content type based on 'history_content_type' field if present,
             # otherwise infer from 'collection_type' or 'type' field
             if "history_content_type" in item:
@@ -908,17 +1886,7 @@ def get_history_contents(
                 content_type = "dataset"
 
             # Add the field to the item (backward compatible - adds new field)
-            item_with_type = {**item, "history_content_type": content_type}
-            all_contents.append(item_with_type)
-
-        # Filter by visibility and deleted status
-        filtered_contents = all_contents
-        if not deleted:
-            filtered_contents = [
-                item for item in filtered_contents if not item.get("deleted", False)
-            ]
-        if visible:
-            filtered_contents = [item for item in filtered_contents if item.get("visible", True)]
+            filtered_contents.append({**item, "history_content_type": content_type})
 
         # Sort the contents based on order parameter
         def get_sort_key(item):
@@ -947,7 +1915,7 @@ def get_history_contents(
         total_pages = ((total_items - 1) // limit) + 1 if limit > 0 and total_items > 0 else 1
 
         logger.info(
-            f"Retrieved {len(paginated_contents)} items (page {current_page} of {total_pages})"
+            "Retrieved %d items (page %d of %d)", len(paginated_contents), current_page, total_pages
         )
 
         return {
@@ -973,7 +1941,7 @@ def get_history_contents(
             },
         }
     except Exception as e:
-        logger.error(f"Failed to get history contents for ID '{history_id}': {str(e)}")
+        logger.error("Failed to get history contents for ID '%s': %s", history_id, e)
         if "404" in str(e) or "No route" in str(e):
             raise ValueError(
                 f"History ID '{history_id}' not found. Make sure to pass a valid history ID string."
@@ -981,7 +1949,7 @@ def get_history_contents(
         raise ValueError(f"Failed to get history contents for ID '{history_id}': {str(e)}") from e
 
 
-@mcp.tool()
+@mcp.tool(annotations=_READ_ONLY_TOOL)
 def get_job_details(dataset_id: str, history_id: str | None = None) -> dict[str, Any]:
     """
     Get detailed information about the job that created a specific dataset
@@ -1003,49 +1971,39 @@ def get_job_details(dataset_id: str, history_id: str | None = None) -> dict[str,
         raise ValueError("Galaxy connection is missing URL or API key information.")
 
     try:
-        # Get dataset provenance to find the creating job
+        # The dataset summary names its creating job and is much smaller than the
+        # provenance tree, so try it first
         job_id: str | None = None
-        provenance_error: Exception | None = None
-        if history_id:
+        lookup_error: Exception | None = None
+        try:
+            job_id = gi.datasets.show_dataset(dataset_id).get("creating_job")
+        except Exception as exc:
+            lookup_error = exc
+
+        if not job_id and history_id:
+            # Fall back to the dataset provenance when the summary has no job
             try:
                 provenance = gi.histories.show_dataset_provenance(
                     history_id=history_id, dataset_id=dataset_id
                 )
-
-                # Extract job ID from provenance
                 job_id = provenance.get("job_id")
-                if not job_id:
-                    raise ValueError(
-                        f"No job information found for dataset '{dataset_id}'. "
-                        "The dataset may not have been created by a job."
-                    )
-
             except Exception as exc:
-                provenance_error = exc
+                lookup_error = lookup_error or exc
 
         if not job_id:
-            # If provenance fails, try getting dataset details which might contain job info
-            try:
-                dataset_details = gi.datasets.show_dataset(dataset_id)
-                job_id = dataset_details.get("creating_job")
-                if not job_id:
-                    raise ValueError(
-                        f"No job information found for dataset '{dataset_id}'. "
-                        "The dataset may not have been created by a job."
-                    )
-            except Exception as dataset_error:
-                error_detail = str(provenance_error) if provenance_error else str(dataset_error)
-                raise ValueError(
-                    f"Failed to get job information for dataset '{dataset_id}': {error_detail}"
-                ) from (provenance_error or dataset_error)
+            error_detail = (
+                str(lookup_error)
+                if lookup_error
+                else f"No job information found for dataset '{dataset_id}'. "
+                "The dataset may not have been created by a job."
+            )
+            raise ValueError(
+                f"Failed to get job information for dataset '{dataset_id}': {error_detail}"
+            ) from lookup_error
 
         # Get job details using the Galaxy API directly
         # (Bioblend doesn't have a direct method for this)
-        url = f"{base_url}api/jobs/{job_id}"
-        headers = {"x-api-key": api_key}
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()
-        job_info = response.json()
+        job_info = _galaxy_get(base_url, api_key, f"jobs/{job_id}", verify=gi.verify)
 
         return {"job": job_info, "dataset_id": dataset_id, "job_id": job_id}
     except Exception as e:
@@ -1057,7 +2015,50 @@ def get_job_details(dataset_id: str, history_id: str | None = None) -> dict[str,
         raise ValueError(f"Failed to get job details for dataset '{dataset_id}': {str(e)}") from e
 
 
-@mcp.tool()
+# Upper bound on bytes read for a preview, so files without newlines stay cheap
+PREVIEW_MAX_BYTES = 1024 * 1024
+
+
+def _read_dataset_head(
+    base_url: str, api_key: str, dataset_id: str, max_lines: int | None, verify: bool | str = True
+) -> tuple[bytes, bool]:
+    """
+    Stream the start of a dataset's content, stopping after ``max_lines`` lines.
+
+    With ``max_lines=None`` the content is read up to PREVIEW_MAX_BYTES so its lines
+    can be counted. Returns the bytes read and whether they cover the whole dataset.
+    """
+    if max_lines is not None and max_lines <= 0:
+        return b"", False
+    response = _galaxy_http.get(
+        f"{base_url}api/datasets/{dataset_id}/display",
+        headers={"x-api-key": api_key},
+        timeout=HTTP_TIMEOUT,
+        stream=True,
+        verify=verify,
+    )
+    try:
+        response.raise_for_status()
+        buffer = bytearray()
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            buffer += chunk
+            if max_lines is not None:
+                # One byte past the last wanted newline tells us whether more content follows
+                cut = -1
+                for _ in range(max_lines):
+                    cut = buffer.find(b"\n", cut + 1)
+                    if cut == -1:
+                        break
+                if cut != -1 and len(buffer) > cut + 1:
+                    return bytes(buffer[:cut]), False
+            if len(buffer) >= PREVIEW_MAX_BYTES:
+                return bytes(buffer[:PREVIEW_MAX_BYTES]), False
+        return bytes(buffer), True
+    finally:
+        response.close()
+
+
+@mcp.tool(annotations=_READ_ONLY_TOOL)
 def get_dataset_details(
     dataset_id: str, include_preview: bool = True, preview_lines: int = 10
 ) -> dict[str, Any]:
@@ -1087,36 +2088,51 @@ def get_dataset_details(
         # Add content preview if requested and dataset is in 'ok' state
         if include_preview and dataset_info.get("state") == "ok":
             try:
-                # Get dataset content for preview
-                content = gi.datasets.download_dataset(
-                    dataset_id, use_default_filename=False, require_ok_state=False
+                # Stream only the lines needed for the preview when Galaxy's metadata
+                # already knows the line total; otherwise read on (up to
+                # PREVIEW_MAX_BYTES) to count the lines
+                metadata_lines = dataset_info.get("metadata_data_lines")
+                known_total = metadata_lines if isinstance(metadata_lines, int) else None
+                base_url = state["url"] or normalized_galaxy_url or ""
+                content, complete = _read_dataset_head(
+                    base_url,
+                    state["api_key"],
+                    dataset_id,
+                    preview_lines if known_total is not None else None,
+                    verify=gi.verify,
                 )
 
-                # Convert bytes to string if needed
-                if isinstance(content, bytes):
-                    try:
-                        content_str = content.decode("utf-8")
-                    except UnicodeDecodeError:
-                        # For binary files, show first part as hex
-                        content_str = (
-                            f"[Binary content - first 100 bytes as hex: {content[:100].hex()}]"
-                        )
-                else:
-                    content_str = content
-
-                # Get preview lines
-                lines = content_str.split("\n")
-                preview = "\n".join(lines[:preview_lines])
+                try:
+                    # An incremental decoder tolerates a character split at the cut-off
+                    content_str = codecs.getincrementaldecoder("utf-8")().decode(
+                        content, final=complete
+                    )
+                except UnicodeDecodeError:
+                    # For binary files, show first part as hex
+                    content_str = (
+                        f"[Binary content - first 100 bytes as hex: {content[:100].hex()}]"
+                    )
+
+                # Get preview lines; a bounded split only allocates the lines kept,
+                # and counting newlines gives the line total without a list
+                head = content_str.split("\n", max(preview_lines, 0))[:preview_lines]
+                line_count = content_str.count("\n") + 1
 
                 result["preview"] = {
-                    "lines": preview,
-                    "total_lines": len(lines),
-                    "preview_lines": min(preview_lines, len(lines)),
-                    "truncated": len(lines) > preview_lines,
+                    "lines": "\n".join(head),
+                    # Past the preview, rely on the line count Galaxy stores in metadata,
+                    # or on the lines counted before the read limit
+                    "total_lines": (
+                        known_total if not complete and known_total is not None else line_count
+                    ),
+                    "preview_lines": len(head),
+                    "truncated": not complete or line_count > preview_lines,
                 }
 
             except Exception as preview_error:
-                logger.warning(f"Could not get preview for dataset {dataset_id}: {preview_error}")
+                logger.warning(
+                    "Could not get preview for dataset %s: %s", dataset_id, preview_error
+                )
                 result["preview"] = {
                     "error": f"Preview unavailable: {str(preview_error)}",
                     "lines": None,
@@ -1155,7 +2171,7 @@ def get_dataset_details(
         raise ValueError(f"Failed to get dataset details for '{dataset_id}': {str(e)}") from e
 
 
-@mcp.tool()
+@mcp.tool(annotations=_READ_ONLY_TOOL)
 def get_collection_details(collection_id: str, max_elements: int = 100) -> dict[str, Any]:
     """
     Get detailed information about a dataset collection and its members
@@ -1240,7 +2256,7 @@ def get_collection_details(collection_id: str, max_elements: int = 100) -> dict[
         raise ValueError(f"Failed to get collection details for '{collection_id}': {str(e)}") from e
 
 
-@mcp.tool()
+@mcp.tool(annotations=_WRITE_TOOL)
 def download_dataset(
     dataset_id: str,
     file_path: str | None = None,
@@ -1350,8 +2366,8 @@ def download_dataset(
         raise ValueError(f"Failed to download dataset '{dataset_id}': {str(e)}") from e
 
 
-@mcp.tool()
-def upload_file(path: str, history_id: str | None = None) -> dict[str, Any]:
+@mcp.tool(annotations=_WRITE_TOOL)
+async def upload_file(path: str, history_id: str | None = None) -> dict[str, Any]:
     """
     Upload a local file to Galaxy
 
@@ -1374,14 +2390,21 @@ def upload_file(path: str, history_id: str | None = None) -> dict[str, Any]:
                 "Check that the file exists and you have read permissions."
             )
 
-        # BioBlend accepts None for history_id and uses the most recently used history
-        result = gi.tools.upload_file(path, history_id=history_id)  # type: ignore[arg-type]
+        # BioBlend uploads through tus in chunks on Galaxy 22.01+ and falls back to a
+        # streamed multipart upload on older servers. It accepts None for history_id
+        # and then uses the most recently used history.
+        result = await _gi_call(
+            gi.tools.upload_file,
+            path,
+            history_id=history_id,  # type: ignore[arg-type]
+            chunk_size=UPLOAD_CHUNK_SIZE,
+        )
         return result
     except Exception as e:
         raise ValueError(f"Failed to upload file: {str(e)}") from e
 
 
-@mcp.tool()
+@mcp.tool(annotations=_WRITE_TOOL)
 def upload_file_from_url(
     url: str,
     history_id: str | None = None,
@@ -1404,7 +2427,8 @@ def upload_file_from_url(
     Returns:
         Dictionary containing upload status and information about the created dataset(s)
     """
-    ensure_connected()
+    state = ensure_connected()
+    gi: GalaxyInstance = state["gi"]
 
     try:
         # Prepare kwargs for put_url
@@ -1415,7 +2439,7 @@ def upload_file_from_url(
         if file_name:
             kwargs["file_name"] = file_name
 
-        result = galaxy_state["gi"].tools.put_url(url, history_id=history_id, **kwargs)
+        result = gi.tools.put_url(url, history_id=history_id, **kwargs)  # type: ignore[arg-type]
         return result
     except Exception as e:
         raise ValueError(
@@ -1433,7 +2457,7 @@ def upload_file_from_url(
         ) from e
 
 
-@mcp.tool()
+@mcp.tool(annotations=_READ_ONLY_TOOL)
 def get_invocations(
     invocation_id: str | None = None,
     workflow_id: str | None = None,
@@ -1483,36 +2507,178 @@ def get_invocations(
         raise ValueError(f"Failed to get workflow invocations: {str(e)}") from e
 
 
-@lru_cache(maxsize=1)
+_iwc_lock = threading.Lock()
+_iwc_cache: dict[str, Any] = {
+    "url": None,
+    "manifest": None,
+    "fetched_at": 0.0,
+    "etag": None,
+    "last_modified": None,
+}
+_iwc_stats: dict[str, float] = {
+    "hits": 0,
+    "misses": 0,
+    "fetches": 0,
+    "fetch_ms": 0.0,
+    "not_modified": 0,
+}
+
+
 def get_manifest_json() -> list[dict[str, Any]]:
-    response = requests.get("https://iwc.galaxyproject.org/workflow_manifest.json")
-    response.raise_for_status()
-    manifest = response.json()
-    return manifest
+    """
+    Return the IWC manifest, revalidating it once the cached copy is older than the TTL.
+
+    Revalidation is a conditional GET, so an unchanged manifest costs a 304 with no body.
+    """
+    with _iwc_lock:
+        # Entries belong to the URL they were fetched from
+        url = IWC_MANIFEST_URL
+        manifest = _iwc_cache["manifest"] if _iwc_cache["url"] == url else None
+        if manifest is not None and time.monotonic() - _iwc_cache["fetched_at"] < IWC_CACHE_TTL:
+            _iwc_stats["hits"] += 1
+            return manifest
+
+        _iwc_stats["misses"] += 1
+        headers: dict[str, str] = {}
+        if manifest is not None:
+            if _iwc_cache["etag"]:
+                headers["If-None-Match"] = _iwc_cache["etag"]
+            if _iwc_cache["last_modified"]:
+                headers["If-Modified-Since"] = _iwc_cache["last_modified"]
+
+        started = time.perf_counter()
+        response = _http.get(url, headers=headers, timeout=HTTP_TIMEOUT)
+        if response.status_code == 304 and manifest is not None:
+            _iwc_stats["not_modified"] += 1
+            _iwc_cache["fetched_at"] = time.monotonic()
+            return manifest
+
+        response.raise_for_status()
+        manifest = _parse_json_response(response)
+        _iwc_stats["fetches"] += 1
+        _iwc_stats["fetch_ms"] += (time.perf_counter() - started) * 1000
+        _iwc_cache.update(
+            url=url,
+            manifest=manifest,
+            fetched_at=time.monotonic(),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+        return manifest
 
 
-@mcp.tool()
-def get_iwc_workflows() -> dict[str, Any]:
+def clear_iwc_cache() -> None:
+    """Drop the cached IWC manifest so the next lookup fetches a fresh copy."""
+    with _iwc_lock:
+        _iwc_cache.update(url=None, manifest=None, fetched_at=0.0, etag=None, last_modified=None)
+        _iwc_index_cache.update(manifest=None, index=None)
+        _iwc_stats.update(hits=0, misses=0, fetches=0, fetch_ms=0.0, not_modified=0)
+
+
+@dataclass(frozen=True)
+class _IWCIndex:
+    """Workflows flattened out of an IWC manifest, plus a prebuilt search index."""
+
+    workflows: list[dict[str, Any]]
+    # Lowercased "name\0annotation\0tag\0tag..." blob per workflow, its lowercased tags
+    # and the summary search_iwc_workflows returns for it, all built once per manifest
+    search_entries: list[tuple[str, frozenset[str], dict[str, Any]]]
+    by_trs_id: dict[str, dict[str, Any]]
+
+
+_iwc_index_cache: dict[str, Any] = {"manifest": None, "index": None}
+
+
+def _build_iwc_index(manifest: list[dict[str, Any]]) -> _IWCIndex:
+    workflows: list[dict[str, Any]] = []
+    for entry in manifest:
+        if "workflows" in entry:
+            workflows.extend(entry["workflows"])
+
+    search_entries = []
+    for workflow in workflows:
+        definition = workflow.get("definition", {})
+        # NUL separators keep a query from matching across two fields
+        name = definition.get("name", "")
+        annotation = definition.get("annotation", "")
+        tags = definition.get("tags", [])
+        summary = {
+            "trsID": workflow.get("trsID"),
+            "name": name,
+            "description": annotation,
+            "tags": tags,
+        }
+        search_blob = "\0".join([name, annotation, *tags]).lower()
+        search_entries.append((search_blob, frozenset(tag.lower() for tag in tags), summary))
+    # Keep the first occurrence so lookups match the previous linear scan
+    by_trs_id: dict[str, dict[str, Any]] = {}
+    for workflow in workflows:
+        trs_id = workflow.get("trsID")
+        if trs_id:
+            by_trs_id.setdefault(trs_id, workflow)
+
+    return _IWCIndex(workflows=workflows, search_entries=search_entries, by_trs_id=by_trs_id)
+
+
+def _get_iwc_index() -> _IWCIndex:
+    """Return the index for the current manifest, rebuilding it only when the manifest changes."""
+    manifest = get_manifest_json()
+    with _iwc_lock:
+        index = _iwc_index_cache["index"]
+        if index is None or _iwc_index_cache["manifest"] is not manifest:
+            index = _build_iwc_index(manifest)
+            _iwc_index_cache.update(manifest=manifest, index=index)
+        return index
+
+
+@mcp.tool(annotations=_READ_ONLY_TOOL)
+def get_iwc_workflows(return_mode: Literal["inline", "ref"] = "inline") -> dict[str, Any]:
     """
     Fetch all workflows from the IWC (Interactive Workflow Composer)
 
+    Args:
+        return_mode: "inline" to return the workflows directly, or "ref" to write them to a
+                    local JSON file and return a reference that fetch_ref can read back
+
     Returns:
-        Complete workflow manifest from IWC
+        Complete workflow manifest from IWC, or a reference with size and sha256 digest
     """
     try:
-        manifest = get_manifest_json()
-        # Collect workflows from all manifest entries
-        all_workflows = []
-        for entry in manifest:
-            if "workflows" in entry:
-                all_workflows.extend(entry["workflows"])
-
-        return {"workflows": all_workflows}
+        # Copy so callers cannot mutate the cached index
+        workflows = list(_get_iwc_index().workflows)
     except Exception as e:
         raise ValueError(f"Failed to fetch IWC workflows: {str(e)}") from e
+    return _maybe_offload({"workflows": workflows}, force=return_mode == "ref")
+
+
+@mcp.tool(annotations=_READ_ONLY_TOOL)
+def fetch_ref(ref: str) -> dict[str, Any]:
+    """
+    Load a payload previously offloaded by a tool called with return_mode="ref"
+
+    Args:
+        ref: The "ref" value (file:// URI) returned by the offloading tool
+
+    Returns:
+        The original tool result
+    """
+    parsed = urlsplit(ref)
+    path = Path(url2pathname(parsed.path))
+    directory = _offload_dir().resolve()
+    if (
+        parsed.scheme != "file"
+        or path.parent.resolve() != directory
+        or not _SHA256_JSON_NAME.fullmatch(path.name)
+    ):
+        raise ValueError(f"Unknown reference {ref!r}: only offloaded result files can be read")
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError as e:
+        raise ValueError(f"Reference {ref!r} no longer exists") from e
+    return orjson.loads(data) if orjson is not None else json.loads(data)
 
 
-@mcp.tool()
+@mcp.tool(annotations=_READ_ONLY_TOOL)
 def search_iwc_workflows(query: str) -> dict[str, Any]:
     """
     Search for workflows in the IWC manifest
@@ -1524,45 +2690,36 @@ def search_iwc_workflows(query: str) -> dict[str, Any]:
         List of matching workflows
     """
     try:
-        # Get the full manifest
-        manifest = get_iwc_workflows.fn()["workflows"]
-
-        # Filter workflows based on the search query
-        results = []
+        # One substring test per workflow against its prebuilt lowercase search blob,
+        # short-circuited by a set lookup when the query is exactly one of the tags
         query = query.lower()
-
-        for workflow in manifest:
-            # Check if query matches name, description or tags (case-insensitive)
-            definition = workflow.get("definition", {})
-            name = definition.get("name", "")
-            description = definition.get("annotation", "")
-            tags = definition.get("tags", [])
-
-            # Lowercase for matching
-            name_lower = name.lower()
-            description_lower = description.lower()
-            tags_lower = [tag.lower() for tag in tags]
-
-            if (
-                query in name_lower
-                or query in description_lower
-                or (tags_lower and any(query in tag for tag in tags_lower))
-            ):
-                results.append(
-                    {
-                        "trsID": workflow["trsID"],
-                        "name": name,
-                        "description": description,
-                        "tags": tags,
-                    }
-                )
+        results = [
+            summary
+            for search_blob, tags, summary in _get_iwc_index().search_entries
+            if query in tags or query in search_blob
+        ]
 
         return {"workflows": results, "count": len(results)}
     except Exception as e:
         raise ValueError(f"Failed to search IWC workflows: {str(e)}") from e
 
 
-@mcp.tool()
+@mcp.tool(annotations=_WRITE_TOOL)
+def refresh_iwc_cache() -> dict[str, Any]:
+    """
+    Discard the cached IWC workflow manifest
+
+    The manifest is cached in memory for GALAXY_MCP_IWC_CACHE_TTL seconds (default: 300).
+    Call this to pick up newly published IWC workflows before the cache expires.
+
+    Returns:
+        Confirmation that the cache was cleared
+    """
+    clear_iwc_cache()
+    return {"cleared": True, "ttl_seconds": IWC_CACHE_TTL}
+
+
+@mcp.tool(annotations=_WRITE_TOOL)
 def import_workflow_from_iwc(trs_id: str) -> dict[str, Any]:
     """
     Import a workflow from IWC to the user's Galaxy instance
@@ -1577,16 +2734,8 @@ def import_workflow_from_iwc(trs_id: str) -> dict[str, Any]:
     gi: GalaxyInstance = state["gi"]
 
     try:
-        # Get the workflow manifest
-        manifest = get_iwc_workflows.fn()["workflows"]
-
         # Find the specified workflow
-        workflow = None
-        for wf in manifest:
-            if wf.get("trsID") == trs_id:
-                workflow = wf
-                break
-
+        workflow = _get_iwc_index().by_trs_id.get(trs_id)
         if not workflow:
             raise ValueError(
                 f"Workflow with trsID '{trs_id}' not found in IWC manifest. "
@@ -1610,7 +2759,7 @@ def import_workflow_from_iwc(trs_id: str) -> dict[str, Any]:
         raise ValueError(f"Failed to import workflow from IWC: {str(e)}") from e
 
 
-@mcp.tool()
+@mcp.tool(annotations=_READ_ONLY_TOOL)
 def list_workflows(
     workflow_id: str | None = None, name: str | None = None, published: bool = False
 ) -> dict[str, Any]:
@@ -1625,10 +2774,11 @@ def list_workflows(
     Returns:
         Dictionary containing list of workflows with their IDs, names, and metadata
     """
-    ensure_connected()
+    state = ensure_connected()
+    gi: GalaxyInstance = state["gi"]
 
     try:
-        workflows = galaxy_state["gi"].workflows.get_workflows(
+        workflows = gi.workflows.get_workflows(
             workflow_id=workflow_id, name=name, published=published
         )
         return {"workflows": workflows}
@@ -1642,7 +2792,7 @@ def list_workflows(
         ) from e
 
 
-@mcp.tool()
+@mcp.tool(annotations=_READ_ONLY_TOOL)
 def get_workflow_details(workflow_id: str, version: int | None = None) -> dict[str, Any]:
     """
     Get detailed information about a specific workflow
@@ -1654,12 +2804,11 @@ def get_workflow_details(workflow_id: str, version: int | None = None) -> dict[s
     Returns:
         Dictionary containing detailed workflow information including steps, inputs, and parameters
     """
-    ensure_connected()
+    state = ensure_connected()
+    gi: GalaxyInstance = state["gi"]
 
     try:
-        workflow = galaxy_state["gi"].workflows.show_workflow(
-            workflow_id=workflow_id, version=version
-        )
+        workflow = gi.workflows.show_workflow(workflow_id=workflow_id, version=version)
         return {"workflow": workflow}
     except Exception as e:
         raise ValueError(
@@ -1669,7 +2818,7 @@ def get_workflow_details(workflow_id: str, version: int | None = None) -> dict[s
         ) from e
 
 
-@mcp.tool()
+@mcp.tool(annotations=_WRITE_TOOL)
 def invoke_workflow(
     workflow_id: str,
     inputs: dict[str, Any] | None = None,
@@ -1699,16 +2848,17 @@ def invoke_workflow(
     Returns:
         Dictionary containing workflow invocation information including invocation ID
     """
-    ensure_connected()
+    state = ensure_connected()
+    gi: GalaxyInstance = state["gi"]
 
     try:
-        invocation = galaxy_state["gi"].workflows.invoke_workflow(
+        invocation = gi.workflows.invoke_workflow(
             workflow_id=workflow_id,
             inputs=inputs,
             params=params,
             history_id=history_id,
             history_name=history_name,
-            inputs_by=inputs_by,
+            inputs_by=inputs_by,  # type: ignore[arg-type]
             parameters_normalized=parameters_normalized,
         )
         return {"invocation": invocation}
@@ -1727,7 +2877,7 @@ def invoke_workflow(
         ) from e
 
 
-@mcp.tool()
+@mcp.tool(annotations=_DESTRUCTIVE_TOOL)
 def cancel_workflow_invocation(invocation_id: str) -> dict[str, Any]:
     """
     Cancel a running workflow invocation
@@ -1738,10 +2888,11 @@ def cancel_workflow_invocation(invocation_id: str) -> dict[str, Any]:
     Returns:
         Dictionary containing cancellation status and updated invocation information
     """
-    ensure_connected()
+    state = ensure_connected()
+    gi: GalaxyInstance = state["gi"]
 
     try:
-        result = galaxy_state["gi"].workflows.cancel_invocation(invocation_id)
+        result = gi.workflows.cancel_invocation(invocation_id)  # type: ignore[call-arg]
         return {"cancelled": True, "invocation": result}
     except Exception as e:
         raise ValueError(
@@ -1749,6 +2900,38 @@ def cancel_workflow_invocation(invocation_id: str) -> dict[str, Any]:
         ) from e
 
 
+def prefetch_caches(state: dict[str, Any] | None = None) -> threading.Thread | None:
+    """
+    Warm the tool panel and IWC manifest caches in a background thread.
+
+    Long-lived servers hide these fetches behind startup or connect(). Set
+    GALAXY_MCP_DISABLE_PREFETCH=1 (or pass --disable-prefetch) when the server is
+    spawned per tool call and the work would be wasted.
+
+    Returns:
+        The started daemon thread, or None when prefetching is disabled
+    """
+    if os.environ.get("GALAXY_MCP_DISABLE_PREFETCH") == "1":
+        return None
+    # Snapshot the connection so a later connect() doesn't change what is warmed
+    state = dict(state if state is not None else galaxy_state)
+
+    def warm() -> None:
+        if state["connected"] and state["gi"]:
+            try:
+                _get_panel_tools_cached(state)
+            except Exception as e:
+                logger.debug("Tool panel prefetch failed: %s", e)
+        try:
+            get_manifest_json()
+        except Exception as e:
+            logger.debug("IWC manifest prefetch failed: %s", e)
+
+    thread = threading.Thread(target=warm, name="galaxy-mcp-prefetch", daemon=True)
+    thread.start()
+    return thread
+
+
 def run_http_server(
     *,
     host: str | None = None,
@@ -14,6 +14,7 @@ from bioblend.galaxy import GalaxyInstance
 def mock_galaxy_instance():
     """Mock GalaxyInstance for tests"""
     mock_gi = Mock(spec=GalaxyInstance)
+    mock_gi.verify = True
 
     # Mock histories
     mock_histories = Mock()
@@ -93,13 +94,31 @@ def mock_galaxy_instance():
     return mock_gi
 
 
+@pytest.fixture(autouse=True)
+def _disable_prefetch(monkeypatch):
+    """Keep connect() from warming caches in background threads during tests"""
+    monkeypatch.setenv("GALAXY_MCP_DISABLE_PREFETCH", "1")
+
+
 @pytest.fixture(autouse=True)
 def _reset_galaxy_state():
     """Reset galaxy state for each test"""
-    from galaxy_mcp.server import galaxy_state, get_manifest_json
-
-    # Clear lru_cache to prevent test pollution
-    get_manifest_json.cache_clear()
+    from galaxy_mcp.auth import clear_session_cache
+    from galaxy_mcp.server import (
+        _bulk_tool_inputs_unsupported,
+        clear_galaxy_instance_cache,
+        clear_iwc_cache,
+        clear_tool_cache,
+        galaxy_state,
+    )
+
+    # Clear cached IWC manifest, Galaxy clients, tool metadata and OAuth sessions to
+    # prevent test pollution
+    clear_iwc_cache()
+    clear_galaxy_instance_cache()
+    clear_tool_cache()
+    clear_session_cache()
+    _bulk_tool_inputs_unsupported.clear()
 
     # Save original state
     original_state = galaxy_state.copy()
@@ -2,12 +2,32 @@
 Test Galaxy connection and authentication
 """
 
+import os
 from unittest.mock import patch
 
+import bioblend.galaxyclient
 import pytest
+import requests
+import responses
+from bioblend import ConnectionError as BioblendConnectionError
 from galaxy_mcp.auth import GalaxyCredentials
+from galaxy_mcp.server import (
+    _galaxy_http,
+    _get_cached_galaxy_instance,
+    _get_galaxy_instance,
+    _load_dotenv_if_changed,
+    _new_galaxy_instance,
+    prefetch_caches,
+)
 
-from .test_helpers import connect_fn, ensure_connected, galaxy_state, get_server_info_fn
+from .test_helpers import (
+    connect_fn,
+    ensure_connected,
+    galaxy_state,
+    get_cache_stats_fn,
+    get_server_info_fn,
+    get_user_fn,
+)
 
 
 @pytest.mark.usefixtures("_test_env")
@@ -93,6 +113,146 @@ class TestConnection:
             url=credentials.galaxy_url, key=credentials.api_key
         )
 
+    def test_connect_reuses_cached_galaxy_instance(self, mock_galaxy_instance):
+        """Repeated connect() calls with the same credentials reuse one client."""
+        with patch(
+            "galaxy_mcp.server.GalaxyInstance", return_value=mock_galaxy_instance
+        ) as mock_constructor:
+            first = connect_fn(url="https://cached.galaxy", api_key="cached-key")
+            second = connect_fn(url="https://cached.galaxy/", api_key="cached-key")
+
+        assert first["connected"] is True
+        assert second["connected"] is True
+        mock_constructor.assert_called_once_with(url="https://cached.galaxy/", key="cached-key")
+        assert mock_galaxy_instance.users.get_current_user.call_count == 2
+        gi_stats = get_cache_stats_fn()["galaxy_instances"]
+        assert (gi_stats["hits"], gi_stats["misses"], gi_stats["size"]) == (1, 1, 1)
+        assert gi_stats["avg_init_ms"] >= 0
+
+    def test_galaxy_instance_cache_evicts_least_recently_used(self):
+        """The client cache is bounded and drops the least recently used credentials."""
+        with patch("galaxy_mcp.server._GI_CACHE_MAXSIZE", 2):
+            for key in ("key1", "key2"):
+                _get_galaxy_instance("https://lru.galaxy/", key)
+            _get_galaxy_instance("https://lru.galaxy/", "key1")
+            _get_galaxy_instance("https://lru.galaxy/", "key3")
+
+            assert _get_cached_galaxy_instance("https://lru.galaxy/", "key1") is not None
+            assert _get_cached_galaxy_instance("https://lru.galaxy/", "key2") is None
+
+        gi_stats = get_cache_stats_fn()["galaxy_instances"]
+        assert (gi_stats["hits"], gi_stats["misses"], gi_stats["size"]) == (2, 4, 2)
+
+    def test_connect_does_not_cache_failed_login(self, mock_galaxy_instance):
+        """A client whose credential check fails is not kept for later calls."""
+        mock_galaxy_instance.users.get_current_user.side_effect = Exception("401 Unauthorized")
+
+        with patch("galaxy_mcp.server.GalaxyInstance", return_value=mock_galaxy_instance):
+            with pytest.raises(ValueError, match="Failed to connect"):
+                connect_fn(url="https://cached.galaxy/", api_key="bad-key")
+
+        assert get_cache_stats_fn()["galaxy_instances"]["size"] == 0
+
+    def test_get_user_reuses_user_fetched_by_connect(self, mock_galaxy_instance):
+        """get_user serves the user validated by connect() until the cache expires."""
+        with patch("galaxy_mcp.server.GalaxyInstance", return_value=mock_galaxy_instance):
+            connected = connect_fn(url="https://cached.galaxy/", api_key="cached-key")
+            first = get_user_fn()
+            second = get_user_fn()
+
+        assert first == second == connected["user"]
+        mock_galaxy_instance.users.get_current_user.assert_called_once_with()
+        assert get_cache_stats_fn()["users"]["hits"] == 2
+
+    def test_get_user_force_refresh_bypasses_cache(self, mock_galaxy_instance):
+        """force_refresh refetches the user and stores the fresh copy."""
+        with patch("galaxy_mcp.server.GalaxyInstance", return_value=mock_galaxy_instance):
+            connect_fn(url="https://cached.galaxy/", api_key="cached-key")
+            mock_galaxy_instance.users.get_current_user.return_value = {"username": "renamed"}
+            refreshed = get_user_fn(force_refresh=True)
+            cached = get_user_fn()
+
+        assert refreshed == cached == {"username": "renamed"}
+        assert mock_galaxy_instance.users.get_current_user.call_count == 2
+
+    def test_connect_failure_drops_cached_user(self, mock_galaxy_instance):
+        """A failed connect() forgets the user cached for those credentials."""
+        with patch("galaxy_mcp.server.GalaxyInstance", return_value=mock_galaxy_instance):
+            connect_fn(url="https://cached.galaxy/", api_key="cached-key")
+            mock_galaxy_instance.users.get_current_user.side_effect = Exception("401 Unauthorized")
+            with pytest.raises(ValueError, match="Failed to connect"):
+                connect_fn(url="https://cached.galaxy/", api_key="cached-key")
+
+        assert get_cache_stats_fn()["users"]["size"] == 0
+
+    def test_connect_remembers_rejected_credentials(self, mock_galaxy_instance):
+        """Credentials Galaxy refused are not re-sent while the rejection is cached."""
+        mock_galaxy_instance.users.get_current_user.side_effect = Exception("401 Unauthorized")
+        with patch("galaxy_mcp.server.GalaxyInstance", return_value=mock_galaxy_instance):
+            for _ in range(3):
+                with pytest.raises(ValueError, match="401 Unauthorized.*API key is valid"):
+                    connect_fn(url="https://cached.galaxy/", api_key="bad-key")
+
+            mock_galaxy_instance.users.get_current_user.side_effect = None
+            connected = connect_fn(url="https://cached.galaxy/", api_key="good-key")
+
+        assert connected["connected"] is True
+        assert mock_galaxy_instance.users.get_current_user.call_count == 2
+        assert get_cache_stats_fn()["rejected_credentials"]["hits"] == 2
+
+    def test_connect_rejects_malformed_url(self, mock_galaxy_instance):
+        """A URL without an http(s) scheme is rejected before creating a client."""
+        with patch(
+            "galaxy_mcp.server.GalaxyInstance", return_value=mock_galaxy_instance
+        ) as mock_constructor:
+            with pytest.raises(ValueError, match="Invalid Galaxy URL"):
+                connect_fn(url="ftp://galaxy.example", api_key="key")
+
+        mock_constructor.assert_not_called()
+        assert galaxy_state["connected"] is False
+
+    def test_connect_reuses_startup_dotenv_path(self, mock_galaxy_instance, tmp_path):
+        """Missing credentials are re-read from the .env found at startup without a new search."""
+        env_file = tmp_path / ".env"
+        env_file.write_text("GALAXY_URL=https://dotenv.galaxy/\n")
+
+        def fake_load_dotenv(path, override=False):
+            os.environ["GALAXY_URL"] = "https://dotenv.galaxy/"
+            os.environ["GALAXY_API_KEY"] = "dotenv-key"
+
+        with patch.dict("os.environ", {"GALAXY_MCP_DISABLE_PREFETCH": "1"}, clear=True):
+            with patch.dict("galaxy_mcp.server._env_credentials", {"url": None, "api_key": None}):
+                with patch("galaxy_mcp.server.dotenv_path", str(env_file)):
+                    with patch("galaxy_mcp.server.find_dotenv") as mock_find:
+                        with patch(
+                            "galaxy_mcp.server.load_dotenv", side_effect=fake_load_dotenv
+                        ) as mock_load:
+                            with patch(
+                                "galaxy_mcp.server.GalaxyInstance",
+                                return_value=mock_galaxy_instance,
+                            ):
+                                result = connect_fn()
+
+        assert result["connected"] is True
+        mock_find.assert_not_called()
+        mock_load.assert_called_once_with(str(env_file), override=True)
+
+    def test_dotenv_is_reloaded_only_when_modified(self, tmp_path):
+        """An unchanged .env file is not parsed again; an edited one is."""
+        env_file = tmp_path / ".env"
+        env_file.write_text("GALAXY_URL=https://dotenv.galaxy/\n")
+
+        with patch.dict("galaxy_mcp.server._dotenv_mtimes", {}, clear=True):
+            with patch("galaxy_mcp.server.load_dotenv") as mock_load:
+                assert _load_dotenv_if_changed(str(env_file)) is True
+                assert _load_dotenv_if_changed(str(env_file)) is False
+                mtime = env_file.stat().st_mtime_ns
+                os.utime(env_file, ns=(mtime + 1_000_000_000, mtime + 1_000_000_000))
+                assert _load_dotenv_if_changed(str(env_file)) is True
+                assert _load_dotenv_if_changed(str(tmp_path / "missing.env")) is False
+
+        assert mock_load.call_count == 2
+
     def test_get_server_info_success(self, mock_galaxy_instance):
         """Test successful server info retrieval"""
         # Mock server config and version responses
@@ -131,6 +291,21 @@ class TestConnection:
             mock_galaxy_instance.config.get_config.assert_called_once()
             mock_galaxy_instance.config.get_version.assert_called_once()
 
+    def test_get_server_info_is_cached(self, mock_galaxy_instance):
+        """Repeated server info calls reuse the cached config and version"""
+        mock_galaxy_instance.config.get_version.return_value = {"version_major": "23.1"}
+
+        with patch.dict(
+            galaxy_state,
+            {"connected": True, "gi": mock_galaxy_instance, "url": "https://galaxy.test/"},
+        ):
+            first = get_server_info_fn()
+            second = get_server_info_fn()
+
+        assert first == second
+        mock_galaxy_instance.config.get_config.assert_called_once()
+        mock_galaxy_instance.config.get_version.assert_called_once()
+
     def test_get_server_info_not_connected(self):
         """Test server info fails when not connected"""
         with patch.dict(galaxy_state, {"connected": False}):
@@ -144,3 +319,90 @@ class TestConnection:
         with patch.dict(galaxy_state, {"connected": True, "gi": mock_galaxy_instance}):
             with pytest.raises(ValueError, match="Failed to get server information"):
                 get_server_info_fn()
+
+
+@responses.activate
+def test_galaxy_requests_retry_transient_errors():
+    """BioBlend GETs retry 503s on the pooled Galaxy session before succeeding."""
+    responses.add(responses.GET, "https://retry.galaxy/api/users/current", status=503)
+    responses.add(
+        responses.GET, "https://retry.galaxy/api/users/current", json={"id": "user1"}, status=200
+    )
+
+    gi = _new_galaxy_instance("https://retry.galaxy/", "key")
+    with patch("urllib3.util.retry.Retry.sleep"):
+        assert gi.users.get_current_user() == {"id": "user1"}
+
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_galaxy_requests_decode_json_with_orjson():
+    """BioBlend GET responses on the pooled session are decoded by orjson when installed."""
+    orjson = pytest.importorskip("orjson")
+    responses.add(responses.GET, "https://json.galaxy/api/tools", json=[{"id": "cat1"}], status=200)
+
+    gi = _new_galaxy_instance("https://json.galaxy/", "key")
+    with patch("galaxy_mcp.server.orjson.loads", wraps=orjson.loads) as mock_loads:
+        assert gi.tools.get_tools() == [{"id": "cat1"}]
+
+    mock_loads.assert_called_once()
+
+
+@responses.activate
+def test_galaxy_writes_use_the_pooled_session():
+    """BioBlend POSTs go through the shared Galaxy session and are not retried."""
+    responses.add(responses.POST, "https://write.galaxy/api/histories", status=503)
+
+    gi = _new_galaxy_instance("https://write.galaxy/", "key")
+    with patch("galaxy_mcp.server._galaxy_http.post", wraps=_galaxy_http.post) as mock_post:
+        with pytest.raises(BioblendConnectionError):
+            gi.histories.create_history(name="pooled")
+
+    mock_post.assert_called_once()
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_galaxy_write_errors_keep_bioblend_semantics():
+    """Pooled PUTs decode JSON and report failures as BioBlend ConnectionErrors."""
+    responses.add(
+        responses.PUT, "https://write.galaxy/api/histories/h1", json={"id": "h1"}, status=200
+    )
+    responses.add(responses.DELETE, "https://write.galaxy/api/histories/h1", status=403)
+
+    gi = _new_galaxy_instance("https://write.galaxy/", "key")
+    assert gi.histories.update_history("h1", name="renamed") == {"id": "h1"}
+    with pytest.raises(BioblendConnectionError):
+        gi.histories.delete_history("h1")
+
+
+def test_pooled_session_does_not_patch_bioblend():
+    """Only clients made by the server use the pooled session; BioBlend itself is untouched."""
+    assert bioblend.galaxyclient.requests is requests
+
+
+def test_connect_prefetches_tool_panel_and_iwc_manifest(mock_galaxy_instance, monkeypatch):
+    """A successful connect() warms the tool panel and IWC caches in the background."""
+    monkeypatch.delenv("GALAXY_MCP_DISABLE_PREFETCH")
+    started = []
+
+    def record_prefetch(state):
+        thread = prefetch_caches(state)
+        started.append(thread)
+        return thread
+
+    with patch("galaxy_mcp.server.GalaxyInstance", return_value=mock_galaxy_instance):
+        with patch("galaxy_mcp.server.prefetch_caches", side_effect=record_prefetch):
+            with patch("galaxy_mcp.server.get_manifest_json") as mock_manifest:
+                connect_fn(url="https://prefetch.galaxy/", api_key="prefetch-key")
+                started[0].join(timeout=5)
+
+    mock_galaxy_instance.tools.get_tool_panel.assert_called_once_with()
+    mock_manifest.assert_called_once_with()
+
+
+def test_prefetch_can_be_disabled(monkeypatch):
+    """GALAXY_MCP_DISABLE_PREFETCH=1 turns background cache warming off."""
+    monkeypatch.setenv("GALAXY_MCP_DISABLE_PREFETCH", "1")
+    assert prefetch_caches() is None
@@ -6,6 +6,8 @@ from unittest.mock import Mock, patch
 
 import pytest
 
+from galaxy_mcp.server import UPLOAD_CHUNK_SIZE
+
 from .test_helpers import (
     download_dataset_fn,
     galaxy_state,
@@ -16,29 +18,49 @@ from .test_helpers import (
 )
 
 
+def mock_display_response(content: bytes, chunk_size: int = 4) -> Mock:
+    """Build a streamed /display response that yields content in small chunks"""
+    response = Mock()
+    response.iter_content.return_value = (
+        content[i : i + chunk_size] for i in range(0, len(content), chunk_size)
+    )
+    return response
+
+
+def connected_state(gi: Mock) -> dict:
+    return {
+        "connected": True,
+        "gi": gi,
+        "url": "https://galaxy.example.com/",
+        "api_key": "test_api_key",
+    }
+
+
 class TestDatasetOperations:
     """Test dataset operations"""
 
-    def test_upload_file(self, mock_galaxy_instance):
+    def test_upload_file(self, mock_galaxy_instance, tmp_path):
         """Test file upload to history"""
         mock_galaxy_instance.tools.upload_file.return_value = {
             "outputs": [{"id": "new_dataset_1", "name": "test.txt"}]
         }
+        upload_path = tmp_path / "test.txt"
+        upload_path.write_text("test content")
 
         with patch.dict(galaxy_state, {"connected": True, "gi": mock_galaxy_instance}):
-            with patch("os.path.exists", return_value=True):
-                result = upload_file_fn("/path/to/test.txt", "test_history_1")
+            result = upload_file_fn(str(upload_path), "test_history_1")
 
-                assert result["outputs"][0]["id"] == "new_dataset_1"
-                assert result["outputs"][0]["name"] == "test.txt"
-                mock_galaxy_instance.tools.upload_file.assert_called_once()
+            assert result["outputs"][0]["id"] == "new_dataset_1"
+            assert result["outputs"][0]["name"] == "test.txt"
+            mock_galaxy_instance.tools.upload_file.assert_called_once_with(
+                str(upload_path), history_id="test_history_1", chunk_size=UPLOAD_CHUNK_SIZE
+            )
 
     def test_upload_file_not_found(self, mock_galaxy_instance):
         """Test upload with non-existent file"""
         with patch.dict(galaxy_state, {"connected": True, "gi": mock_galaxy_instance}):
-            with patch("os.path.exists", return_value=False):
-                with pytest.raises(ValueError, match="File not found"):
-                    upload_file_fn("/nonexistent/file.txt", "test_history_1")
+            with pytest.raises(ValueError, match="File not found"):
+                upload_file_fn("/nonexistent/file.txt", "test_history_1")
 
     def test_get_dataset_details_with_preview(self, mock_galaxy_instance):
         """Test getting dataset details with preview"""
@@ -57,10 +79,11 @@ class TestDatasetOperations:
         mock_content = b"line1\nline2\nline3\nline4\nline5\n"
 
         mock_galaxy_instance.datasets.show_dataset.return_value = mock_dataset_info
-        mock_galaxy_instance.datasets.download_dataset.return_value = mock_content
+        response = mock_display_response(mock_content)
 
-        with patch.dict(galaxy_state, {"connected": True, "gi": mock_galaxy_instance}):
-            result = get_dataset_details_fn(dataset_id, include_preview=True, preview_lines=3)
+        with patch.dict(galaxy_state, connected_state(mock_galaxy_instance)):
+            with patch("galaxy_mcp.server._galaxy_http.get", return_value=response) as mock_get:
+                result = get_dataset_details_fn(dataset_id, include_preview=True, preview_lines=3)
 
             assert result["dataset_id"] == dataset_id
             assert result["dataset"]["name"] == "test_data.txt"
@@ -69,6 +92,80 @@ class TestDatasetOperations:
             assert result["preview"]["truncated"] is True
 
             mock_galaxy_instance.datasets.show_dataset.assert_called_once_with(dataset_id)
+            mock_galaxy_instance.datasets.download_dataset.assert_not_called()
+            assert mock_get.call_args.args[0] == (
+                "https://galaxy.example.com/api/datasets/dataset123/display"
+            )
+            assert mock_get.call_args.kwargs["stream"] is True
+            assert mock_get.call_args.kwargs["verify"] is True
+            response.close.assert_called_once()
+
+    def test_get_dataset_details_preview_stops_reading_early(self, mock_galaxy_instance):
+        """Test the preview stops streaming once it has enough lines"""
+        dataset_id = "dataset123"
+        mock_galaxy_instance.datasets.show_dataset.return_value = {
+            "id": dataset_id,
+            "state": "ok",
+            "metadata_data_lines": 1000,
+        }
+        chunks = [b"a\nb\nc\n", b"d\n"] + [b"never read\n"] * 1000
+        response = Mock()
+        response.iter_content.return_value = iter(chunks)
+
+        with patch.dict(galaxy_state, connected_state(mock_galaxy_instance)):
+            with patch("galaxy_mcp.server._galaxy_http.get", return_value=response):
+                result = get_dataset_details_fn(dataset_id, include_preview=True, preview_lines=2)
+
+        assert result["preview"]["lines"] == "a\nb"
+        assert result["preview"]["total_lines"] == 1000
+        assert result["preview"]["truncated"] is True
+        # Only the first chunk was consumed
+        assert next(response.iter_content.return_value) == b"d\n"
+
+    def test_get_dataset_details_preview_of_short_dataset(self, mock_galaxy_instance):
+        """Test a dataset shorter than the preview is counted in full"""
+        dataset_id = "dataset123"
+        mock_galaxy_instance.datasets.show_dataset.return_value = {"id": dataset_id, "state": "ok"}
+        response = mock_display_response(b"line1\nline2\nline3\nline4\nline5\n")
+
+        with patch.dict(galaxy_state, connected_state(mock_galaxy_instance)):
+            with patch("galaxy_mcp.server._galaxy_http.get", return_value=response):
+                result = get_dataset_details_fn(dataset_id, include_preview=True)
+
+        assert result["preview"]["total_lines"] == 6  # 5 lines + empty line at end
+        assert result["preview"]["truncated"] is False
+
+    def test_get_dataset_details_preview_counts_lines_past_read_limit(self, mock_galaxy_instance):
+        """Test total_lines stays an integer when metadata has no line count"""
+        dataset_id = "dataset123"
+        mock_galaxy_instance.datasets.show_dataset.return_value = {"id": dataset_id, "state": "ok"}
+        response = mock_display_response(b"a\nb\nc\nd\ne\nf\n")
+
+        with patch.dict(galaxy_state, connected_state(mock_galaxy_instance)):
+            with patch("galaxy_mcp.server._galaxy_http.get", return_value=response):
+                with patch("galaxy_mcp.server.PREVIEW_MAX_BYTES", 8):
+                    result = get_dataset_details_fn(dataset_id, preview_lines=2)
+
+        assert result["preview"]["lines"] == "a\nb"
+        assert result["preview"]["total_lines"] == 5
+        assert result["preview"]["truncated"] is True
+
+    def test_get_dataset_details_zero_preview_lines_skips_read(self, mock_galaxy_instance):
+        """Test a zero-line preview with a known line total reads nothing"""
+        dataset_id = "dataset123"
+        mock_galaxy_instance.datasets.show_dataset.return_value = {
+            "id": dataset_id,
+            "state": "ok",
+            "metadata_data_lines": 42,
+        }
+
+        with patch.dict(galaxy_state, connected_state(mock_galaxy_instance)):
+            with patch("galaxy_mcp.server._galaxy_http.get") as mock_get:
+                result = get_dataset_details_fn(dataset_id, preview_lines=0)
+
+        assert result["preview"]["lines"] == ""
+        assert result["preview"]["total_lines"] == 42
+        mock_get.assert_not_called()
 
     def test_get_dataset_details_no_preview(self, mock_galaxy_instance):
         """Test getting dataset details without preview"""
@@ -108,10 +205,11 @@ class TestDatasetOperations:
         mock_content = b"\x89PNG\r\n\x1a\n\x00\x00\x00"
 
         mock_galaxy_instance.datasets.show_dataset.return_value = mock_dataset_info
-        mock_galaxy_instance.datasets.download_dataset.return_value = mock_content
+        response = mock_display_response(mock_content)
 
-        with patch.dict(galaxy_state, {"connected": True, "gi": mock_galaxy_instance}):
-            result = get_dataset_details_fn(dataset_id, include_preview=True)
+        with patch.dict(galaxy_state, connected_state(mock_galaxy_instance)):
+            with patch("galaxy_mcp.server._galaxy_http.get", return_value=response):
+                result = get_dataset_details_fn(dataset_id, include_preview=True)
 
             assert result["dataset_id"] == dataset_id
             assert "[Binary content" in result["preview"]["lines"]
@@ -1,10 +1,13 @@
 """Tests for search_tools_by_keywords functionality"""
 
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from .test_helpers import galaxy_state, search_tools_by_keywords_fn
+from galaxy_mcp.server import _extension_index_cache, _tool_details_cache
+
+from .test_helpers import galaxy_state, get_tool_panel_fn, search_tools_by_keywords_fn
 
 
 class TestSearchTools:
@@ -169,3 +172,207 @@ class TestSearchTools:
             tool_ids = [tool["id"] for tool in result["recommended_tools"]]
             assert "tool1" in tool_ids
             assert "tool2" not in tool_ids
+
+    def test_search_tools_reuses_cached_tool_details(self, mock_galaxy_instance, mock_tool_panel):
+        """Test repeated keyword searches do not refetch tool input details"""
+        mock_galaxy_instance.tools.get_tool_panel.return_value = mock_tool_panel
+        mock_galaxy_instance.tools.show_tool.return_value = {"inputs": [{"extensions": ["bam"]}]}
+
+        with patch.dict(galaxy_state, {"connected": True, "gi": mock_galaxy_instance}):
+            first = search_tools_by_keywords_fn(["bam"])
+            calls_after_first = mock_galaxy_instance.tools.show_tool.call_count
+            second = search_tools_by_keywords_fn(["bam"])
+
+        assert first["count"] == second["count"] == 4
+        assert calls_after_first == 4
+        assert mock_galaxy_instance.tools.show_tool.call_count == calls_after_first
+
+    def test_search_tools_preserves_panel_order(self, mock_galaxy_instance, mock_tool_panel):
+        """Test nested sections are flattened in panel order"""
+        mock_galaxy_instance.tools.get_tool_panel.return_value = mock_tool_panel
+
+        with patch.dict(galaxy_state, {"connected": True, "gi": mock_galaxy_instance}):
+            result = search_tools_by_keywords_fn(["a"])
+            assert search_tools_by_keywords_fn([]) == {"recommended_tools": [], "count": 0}
+
+        assert [tool["id"] for tool in result["recommended_tools"]] == [
+            "csv_tool",
+            "tabular_tool",
+            "fasta_tool",
+            "generic_tool",
+        ]
+
+    def test_search_tools_stops_at_max_results(self, mock_galaxy_instance, mock_tool_panel):
+        """Test name matches count toward max_results and skip input-format lookups"""
+        mock_galaxy_instance.tools.get_tool_panel.return_value = mock_tool_panel
+        mock_galaxy_instance.tools.show_tool.return_value = {"inputs": [{"extensions": ["csv"]}]}
+
+        with patch.dict(galaxy_state, {"connected": True, "gi": mock_galaxy_instance}):
+            capped = search_tools_by_keywords_fn(["csv"], max_results=1)
+            assert mock_galaxy_instance.tools.show_tool.call_count == 0
+            unlimited = search_tools_by_keywords_fn(["csv"], max_results=None)
+
+        assert [tool["id"] for tool in capped["recommended_tools"]] == ["csv_tool"]
+        assert unlimited["count"] == 4
+
+    def test_search_tools_reuses_cached_tool_panel(self, mock_galaxy_instance, mock_tool_panel):
+        """Test keyword searches and get_tool_panel share one cached panel fetch"""
+        mock_galaxy_instance.tools.get_tool_panel.return_value = mock_tool_panel
+
+        with patch.dict(galaxy_state, {"connected": True, "gi": mock_galaxy_instance}):
+            search_tools_by_keywords_fn(["csv"])
+            search_tools_by_keywords_fn(["fasta"])
+            panel = get_tool_panel_fn()
+
+        assert panel["tool_panel"] == mock_tool_panel
+        mock_galaxy_instance.tools.get_tool_panel.assert_called_once_with()
+
+    @pytest.mark.parametrize("use_automaton", [True, False])
+    def test_search_tools_matches_with_and_without_pyahocorasick(
+        self, mock_galaxy_instance, mock_tool_panel, use_automaton
+    ):
+        """Test keyword matching gives the same results with the regex fallback"""
+        mock_galaxy_instance.tools.get_tool_panel.return_value = mock_tool_panel
+        mock_galaxy_instance.tools.show_tool.return_value = {"inputs": [{"extensions": ["bam"]}]}
+
+        with patch.dict(galaxy_state, {"connected": True, "gi": mock_galaxy_instance}):
+            if use_automaton:
+                pytest.importorskip("ahocorasick")
+                result = search_tools_by_keywords_fn(["FASTA", "tabular"])
+            else:
+                with patch("galaxy_mcp.server.ahocorasick", None):
+                    result = search_tools_by_keywords_fn(["FASTA", "tabular"])
+
+        assert sorted(tool["id"] for tool in result["recommended_tools"]) == [
+            "fasta_tool",
+            "tabular_tool",
+        ]
+
+    def test_search_tools_uses_bulk_tool_inputs(self, mock_galaxy_instance, mock_tool_panel):
+        """Test inputs from one bulk tool listing replace per-tool show_tool calls"""
+        mock_galaxy_instance.tools.get_tool_panel.return_value = mock_tool_panel
+        mock_galaxy_instance.tools.show_tool.return_value = {"inputs": [{"extensions": ["bam"]}]}
+        bulk_listing = [
+            {"id": "csv_tool", "inputs": [{"extensions": ["csv"]}]},
+            {"id": "tabular_tool", "inputs": [{"extensions": "tabular"}]},
+            {"id": "fasta_tool", "inputs": [{"extensions": ["bam", "sam"]}]},
+        ]
+        state = {
+            "connected": True,
+            "gi": mock_galaxy_instance,
+            "url": "https://galaxy.example.com/",
+            "api_key": "test_api_key",
+        }
+
+        with patch.dict(galaxy_state, state):
+            with patch("galaxy_mcp.server._galaxy_get", return_value=bulk_listing) as mock_get:
+                result = search_tools_by_keywords_fn(["bam"])
+                search_tools_by_keywords_fn(["sam"])
+
+        assert sorted(tool["id"] for tool in result["recommended_tools"]) == [
+            "fasta_tool",
+            "generic_tool",
+        ]
+        mock_get.assert_called_once_with(
+            "https://galaxy.example.com/",
+            "test_api_key",
+            "tools",
+            {"in_panel": "false", "io_details": "true"},
+            verify=mock_galaxy_instance.verify,
+        )
+        # Only the tool missing from the bulk listing is looked up individually
+        mock_galaxy_instance.tools.show_tool.assert_called_once_with(
+            "generic_tool", io_details=True
+        )
+
+    def test_search_tools_skips_bulk_listing_without_inputs(
+        self, mock_galaxy_instance, mock_tool_panel
+    ):
+        """Test a bulk listing without inputs is not requested again from that server"""
+        mock_galaxy_instance.tools.get_tool_panel.return_value = mock_tool_panel
+        mock_galaxy_instance.tools.show_tool.return_value = {"inputs": [{"extensions": ["bam"]}]}
+        state = {
+            "connected": True,
+            "gi": mock_galaxy_instance,
+            "url": "https://galaxy.example.com/",
+            "api_key": "test_api_key",
+        }
+
+        with patch.dict(galaxy_state, state):
+            with patch(
+                "galaxy_mcp.server._galaxy_get", return_value=[{"id": "csv_tool"}]
+            ) as mock_get:
+                search_tools_by_keywords_fn(["bam"])
+                # Even once the cached index expires, the listing is not fetched again
+                _extension_index_cache.clear()
+                result = search_tools_by_keywords_fn(["bam"])
+
+        mock_get.assert_called_once()
+        assert result["recommended_tools"]
+
+    def test_search_tools_indexes_looked_up_extensions(self, mock_galaxy_instance, mock_tool_panel):
+        """Test extensions found via show_tool are reused once tool details expire"""
+        mock_galaxy_instance.tools.get_tool_panel.return_value = mock_tool_panel
+        mock_galaxy_instance.tools.show_tool.return_value = {"inputs": [{"extensions": ["bam"]}]}
+
+        with patch.dict(galaxy_state, {"connected": True, "gi": mock_galaxy_instance}):
+            first = search_tools_by_keywords_fn(["bam"], max_results=None)
+            calls = mock_galaxy_instance.tools.show_tool.call_count
+            _tool_details_cache.clear()
+            second = search_tools_by_keywords_fn(["bam"], max_results=None)
+
+        assert sorted(tool["id"] for tool in first["recommended_tools"]) == sorted(
+            tool["id"] for tool in second["recommended_tools"]
+        )
+        assert mock_galaxy_instance.tools.show_tool.call_count == calls
+
+    def test_search_tools_capped_lookups_follow_panel_order(
+        self, mock_galaxy_instance, mock_tool_panel
+    ):
+        """Test a capped search keeps the first matches in panel order, not completion order"""
+        mock_galaxy_instance.tools.get_tool_panel.return_value = mock_tool_panel
+
+        def show_tool(tool_id, io_details=False):
+            if tool_id == "csv_tool":
+                time.sleep(0.05)
+            return {"inputs": [{"extensions": ["bam"]}]}
+
+        mock_galaxy_instance.tools.show_tool.side_effect = show_tool
+
+        with patch.dict(galaxy_state, {"connected": True, "gi": mock_galaxy_instance}):
+            result = search_tools_by_keywords_fn(["bam"], max_results=2)
+
+        assert [tool["id"] for tool in result["recommended_tools"]] == [
+            "csv_tool",
+            "tabular_tool",
+        ]
+
+    def test_search_tools_recommends_duplicate_panel_entries_once(self, mock_galaxy_instance):
+        """Test a tool matched by name in several sections is only recommended once"""
+        shared_tool = {"id": "csv_parser", "name": "CSV Parser", "description": "Parse files"}
+        mock_galaxy_instance.tools.get_tool_panel.return_value = [
+            {"id": "section_a", "elems": [shared_tool]},
+            {"id": "section_b", "elems": [dict(shared_tool)]},
+        ]
+
+        with patch.dict(galaxy_state, {"connected": True, "gi": mock_galaxy_instance}):
+            result = search_tools_by_keywords_fn(["csv"])
+
+        assert [tool["id"] for tool in result["recommended_tools"]] == ["csv_parser"]
+        assert result["count"] == 1
+        mock_galaxy_instance.tools.show_tool.assert_not_called()
+
+    def test_search_tools_checks_duplicate_panel_entries_once(self, mock_galaxy_instance):
+        """Test a tool listed in several sections is only looked up once"""
+        shared_tool = {"id": "bam_sorter", "name": "Sorter", "description": "Sort files"}
+        mock_galaxy_instance.tools.get_tool_panel.return_value = [
+            {"id": "section_a", "elems": [shared_tool]},
+            {"id": "section_b", "elems": [dict(shared_tool)]},
+        ]
+        mock_galaxy_instance.tools.show_tool.return_value = {"inputs": [{"extensions": ["bam"]}]}
+
+        with patch.dict(galaxy_state, {"connected": True, "gi": mock_galaxy_instance}):
+            result = search_tools_by_keywords_fn(["bam"])
+
+        assert [tool["id"] for tool in result["recommended_tools"]] == ["bam_sorter"]
+        mock_galaxy_instance.tools.show_tool.assert_called_once_with("bam_sorter", io_details=True)
@@ -1,5 +1,9 @@
 """Test helpers for FastMCP2 functions"""
 
+import asyncio
+import functools
+import inspect
+
 # Import all the wrapped functions from server
 from galaxy_mcp.server import (
     cancel_workflow_invocation,
@@ -7,7 +11,9 @@ from galaxy_mcp.server import (
     create_history,
     download_dataset,
     ensure_connected,
+    fetch_ref,
     galaxy_state,
+    get_cache_stats,
     get_collection_details,
     get_dataset_details,
     get_histories,
@@ -19,6 +25,7 @@ from galaxy_mcp.server import (
     get_server_info,
     get_tool_citations,
     get_tool_details,
+    get_tool_details_batch,
     get_tool_panel,
     get_tool_run_examples,
     get_user,
@@ -27,6 +34,9 @@ from galaxy_mcp.server import (
     invoke_workflow,
     list_history_ids,
     list_workflows,
+    refresh_iwc_cache,
+    refresh_tool_cache,
+    reset_cache_stats,
     run_tool,
     search_iwc_workflows,
     search_tools_by_keywords,
@@ -39,15 +49,26 @@ from galaxy_mcp.server import (
 # FastMCP2 wraps functions in FunctionTool objects - extract the underlying functions
 # for testing purposes
 def get_function(tool_or_function):
-    """Extract the underlying function from a FastMCP2 FunctionTool if needed"""
-    if hasattr(tool_or_function, "fn"):
-        return tool_or_function.fn
-    return tool_or_function
+    """Extract the underlying function from a FastMCP2 FunctionTool if needed
+
+    Async tools are wrapped so tests can call every tool synchronously.
+    """
+    fn = tool_or_function.fn if hasattr(tool_or_function, "fn") else tool_or_function
+    if inspect.iscoroutinefunction(fn):
+
+        @functools.wraps(fn)
+        def run(*args, **kwargs):
+            return asyncio.run(fn(*args, **kwargs))
+
+        return run
+    return fn
 
 
 # Create function aliases for testing
 cancel_workflow_invocation_fn = get_function(cancel_workflow_invocation)
 connect_fn = get_function(connect)
+fetch_ref_fn = get_function(fetch_ref)
+get_cache_stats_fn = get_function(get_cache_stats)
 create_history_fn = get_function(create_history)
 download_dataset_fn = get_function(download_dataset)
 search_tools_by_keywords_fn = get_function(search_tools_by_keywords)
@@ -62,6 +83,7 @@ get_job_details_fn = get_function(get_job_details)
 get_server_info_fn = get_function(get_server_info)
 get_tool_citations_fn = get_function(get_tool_citations)
 get_tool_details_fn = get_function(get_tool_details)
+get_tool_details_batch_fn = get_function(get_tool_details_batch)
 get_tool_run_examples_fn = get_function(get_tool_run_examples)
 get_tool_panel_fn = get_function(get_tool_panel)
 get_user_fn = get_function(get_user)
@@ -70,6 +92,9 @@ import_workflow_from_iwc_fn = get_function(import_workflow_from_iwc)
 invoke_workflow_fn = get_function(invoke_workflow)
 list_history_ids_fn = get_function(list_history_ids)
 list_workflows_fn = get_function(list_workflows)
+refresh_iwc_cache_fn = get_function(refresh_iwc_cache)
+refresh_tool_cache_fn = get_function(refresh_tool_cache)
+reset_cache_stats_fn = get_function(reset_cache_stats)
 run_tool_fn = get_function(run_tool)
 search_iwc_workflows_fn = get_function(search_iwc_workflows)
 search_tools_fn = get_function(search_tools_by_name)
@@ -80,6 +105,8 @@ upload_file_from_url_fn = get_function(upload_file_from_url)
 __all__ = [
     "cancel_workflow_invocation_fn",
     "connect_fn",
+    "fetch_ref_fn",
+    "get_cache_stats_fn",
     "create_history_fn",
     "download_dataset_fn",
     "search_tools_by_keywords_fn",
@@ -94,6 +121,7 @@ __all__ = [
     "get_server_info_fn",
     "get_tool_citations_fn",
     "get_tool_details_fn",
+    "get_tool_details_batch_fn",
     "get_tool_run_examples_fn",
     "get_tool_panel_fn",
     "get_user_fn",
@@ -102,6 +130,9 @@ __all__ = [
     "invoke_workflow_fn",
     "list_history_ids_fn",
     "list_workflows_fn",
+    "refresh_iwc_cache_fn",
+    "refresh_tool_cache_fn",
+    "reset_cache_stats_fn",
     "run_tool_fn",
     "search_iwc_workflows_fn",
     "search_tools_fn",
@@ -2,6 +2,7 @@
 Test history-related operations
 """
 
+import threading
 from unittest.mock import patch
 
 import pytest
@@ -41,6 +42,25 @@ class TestHistoryOperations:
             assert result["histories"] == []
             assert result["pagination"]["total_items"] == 0
 
+    def test_get_histories_fetches_page_and_total_concurrently(self, mock_galaxy_instance):
+        """Test the page and the total count are fetched in parallel worker threads"""
+        # Both calls must be in flight at once to get past the barrier
+        barrier = threading.Barrier(2, timeout=5)
+        histories = [{"id": f"history_{i}", "name": f"History {i}"} for i in range(5)]
+
+        def get_histories(limit=None, offset=0, name=None):
+            barrier.wait()
+            return histories[offset : offset + limit] if limit is not None else histories
+
+        mock_galaxy_instance.histories.get_histories.side_effect = get_histories
+
+        with patch.dict(galaxy_state, {"connected": True, "gi": mock_galaxy_instance}):
+            result = get_histories_fn(limit=2)
+
+        assert [h["id"] for h in result["histories"]] == ["history_0", "history_1"]
+        assert result["pagination"]["total_items"] == 5
+        assert result["pagination"]["has_next"] is True
+
     def test_list_history_ids_fn(self, mock_galaxy_instance):
         """Test list_history_ids returns simplified list"""
         with patch.dict(galaxy_state, {"connected": True, "gi": mock_galaxy_instance}):
@@ -50,13 +70,19 @@ class TestHistoryOperations:
             assert len(history_ids) == 2
             assert history_ids[0] == {"id": "test_history_1", "name": "Test History 1"}
             assert history_ids[1] == {"id": "test_history_2", "name": "Test History 2"}
+            mock_galaxy_instance.histories.get_histories.assert_called_once_with(
+                keys=["id", "name"]
+            )
 
     def test_get_history_details_fn(self, mock_galaxy_instance):
         """Test get_history_details with valid ID"""
-        mock_galaxy_instance.histories.show_history.side_effect = [
-            {"id": "test_history_1", "name": "Test History 1", "state": "ok"},  # History info
-            ["dataset1", "dataset2"],  # All contents for count
-        ]
+        history_info = {"id": "test_history_1", "name": "Test History 1", "state": "ok"}
+        # Both lookups run concurrently, so answer by argument rather than call order
+        mock_galaxy_instance.histories.show_history.side_effect = (
+            lambda history_id, contents, **kwargs: (
+                ["dataset1", "dataset2"] if contents else history_info
+            )
+        )
 
         with patch.dict(galaxy_state, {"connected": True, "gi": mock_galaxy_instance}):
             result = get_history_details_fn("test_history_1")
@@ -67,6 +93,9 @@ class TestHistoryOperations:
             assert result["contents_summary"]["total_items"] == 2
             assert "get_history_contents(" in result["contents_summary"]["note"]
             assert "create_time-dsc" in result["contents_summary"]["note"]
+            mock_galaxy_instance.histories.show_history.assert_any_call(
+                "test_history_1", contents=True, keys=["id"]
+            )
 
     def test_get_history_details_with_dict_string(self, mock_galaxy_instance):
         """Test get_history_details treats dict string as regular ID (should fail)"""
@@ -185,9 +214,28 @@ class TestHistoryOperations:
 
             # Verify show_history was called
             mock_galaxy_instance.histories.show_history.assert_called_once_with(
-                "test_history_1", contents=True
+                "test_history_1", contents=True, deleted=False, visible=True
             )
 
+    def test_get_history_contents_filters_deleted_and_hidden(self, mock_galaxy_instance):
+        """Test filters are sent to the server and still applied to what it returns"""
+        mock_galaxy_instance.histories.show_history.return_value = [
+            {"id": "dataset1", "hid": 1, "visible": True, "deleted": False},
+            {"id": "dataset2", "hid": 2, "visible": False, "deleted": False},
+            {"id": "dataset3", "hid": 3, "visible": True, "deleted": True},
+        ]
+
+        with patch.dict(galaxy_state, {"connected": True, "gi": mock_galaxy_instance}):
+            from tests.test_helpers import get_history_contents_fn
+
+            result = get_history_contents_fn("test_history_1", visible=False)
+
+        assert [item["id"] for item in result["contents"]] == ["dataset1", "dataset2"]
+        assert result["pagination"]["total_items"] == 2
+        mock_galaxy_instance.histories.show_history.assert_called_once_with(
+            "test_history_1", contents=True, deleted=False, visible=None
+        )
+
     def test_get_history_contents_with_collections(self, mock_galaxy_instance):
         """Test get_history_contents returns both datasets and collections with proper type flags"""
         # Mock show_history to return both datasets and collections
@@ -241,5 +289,5 @@ class TestHistoryOperations:
             assert result["contents"][2]["id"] == "dataset2"
 
             mock_galaxy_instance.histories.show_history.assert_called_once_with(
-                "test_history_1", contents=True
+                "test_history_1", contents=True, deleted=False, visible=True
             )
@@ -2,10 +2,14 @@
 Integration tests for complete workflows
 """
 
+import json
 from unittest.mock import Mock, patch
 
 import pytest
 
+from galaxy_mcp import server
+from galaxy_mcp.server import _serialize_tool_result, get_session
+
 from .test_helpers import (
     create_history_fn,
     galaxy_state,
@@ -36,9 +40,9 @@ class TestIntegration:
                 "outputs": [{"id": "uploaded_dataset_1", "name": "input.fasta"}]
             }
 
-            with patch("os.path.exists", return_value=True):
+            with patch("os.stat", return_value=Mock(st_size=2048)):
                 dataset = upload_file_fn("/path/to/input.fasta", history["id"])
-                assert dataset["outputs"][0]["id"] == "uploaded_dataset_1"
+            assert dataset["outputs"][0]["id"] == "uploaded_dataset_1"
 
             # 3. Run a tool on the uploaded file
 
@@ -70,8 +74,7 @@ class TestIntegration:
             mock_response.raise_for_status.return_value = None
 
             # Mock the IWC API
-            mock_iwc_response = Mock()
-            mock_iwc_response.json.return_value = [
+            iwc_manifest = [
                 {
                     "workflows": [
                         {
@@ -81,9 +84,12 @@ class TestIntegration:
                     ]
                 }
             ]
+            mock_iwc_response = Mock()
+            mock_iwc_response.json.return_value = iwc_manifest
+            mock_iwc_response.content = json.dumps(iwc_manifest).encode("utf-8")
             mock_iwc_response.raise_for_status.return_value = None
 
-            with patch("requests.get", return_value=mock_iwc_response):
+            with patch.object(get_session(), "get", return_value=mock_iwc_response):
                 mock_galaxy_instance.workflows.import_workflow_dict.return_value = {
                     "id": "imported_workflow_1",
                     "name": "RNA-seq Pipeline",
@@ -116,6 +122,29 @@ class TestIntegration:
 
             # Test error in workflow import
 
-            with patch("requests.get", side_effect=Exception("Network error")):
+            with patch.object(get_session(), "get", side_effect=Exception("Network error")):
                 with pytest.raises(ValueError, match="Failed to import workflow from IWC"):
                     import_workflow_from_iwc_fn("nonexistent-workflow")
+
+    def test_tool_result_serializer(self):
+        """Test tool results serialize to plain JSON, including values orjson rejects"""
+        pytest.importorskip("orjson")
+
+        payload = {"workflows": [{"trsID": "wf", "tags": ["a"]}], 1: "non-str key"}
+        assert json.loads(_serialize_tool_result(payload)) == {
+            "workflows": [{"trsID": "wf", "tags": ["a"]}],
+            "1": "non-str key",
+        }
+        assert json.loads(_serialize_tool_result({"big": 2**70})) == {"big": 2**70}
+
+    def test_tools_declare_read_only_hints(self):
+        """Test read-only tools are marked cacheable and state-changing tools are not"""
+        for tool in (server.get_tool_panel, server.get_iwc_workflows, server.get_tool_details):
+            assert tool.annotations.readOnlyHint is True
+            assert tool.annotations.idempotentHint is True
+
+        for tool in (server.run_tool, server.upload_file, server.import_workflow_from_iwc):
+            assert tool.annotations.readOnlyHint is False
+            assert tool.annotations.destructiveHint is False
+
+        assert server.cancel_workflow_invocation.annotations.destructiveHint is True
@@ -1,5 +1,7 @@
 """Tests for job operations"""
 
+from unittest.mock import patch
+
 import pytest
 import responses
 from galaxy_mcp.server import galaxy_state
@@ -11,7 +13,7 @@ class TestJobOperations:
     def setup_method(self):
         """Set up test environment before each test"""
         galaxy_state["connected"] = True
-        galaxy_state["gi"] = type("MockGI", (), {})()
+        galaxy_state["gi"] = type("MockGI", (), {"verify": True})()
         galaxy_state["url"] = "http://localhost:8080/"
         galaxy_state["api_key"] = "test_key"
 
@@ -28,7 +30,7 @@ class TestJobOperations:
         job_id = "job456"
 
         # Mock the bioblend provenance call
-        mock_gi = type("MockGI", (), {})()
+        mock_gi = type("MockGI", (), {"verify": True})()
         mock_histories = type("MockHistories", (), {})()
         mock_histories.show_dataset_provenance = lambda history_id, dataset_id: {"job_id": job_id}
         mock_gi.histories = mock_histories
@@ -55,7 +57,7 @@ class TestJobOperations:
         job_id = "job456"
 
         # Mock the bioblend calls
-        mock_gi = type("MockGI", (), {})()
+        mock_gi = type("MockGI", (), {"verify": True})()
         mock_histories = type("MockHistories", (), {})()
         mock_datasets = type("MockDatasets", (), {})()
 
@@ -82,12 +84,53 @@ class TestJobOperations:
         assert result["dataset_id"] == dataset_id
         assert result["job_id"] == job_id
 
+    @responses.activate
+    def test_get_job_details_skips_provenance_when_dataset_names_job(self):
+        """Test the provenance tree is not fetched when the dataset has a creating job"""
+        job_id = "job456"
+
+        def show_dataset_provenance(history_id, dataset_id):
+            raise AssertionError("provenance should not be fetched")
+
+        mock_gi = type("MockGI", (), {"verify": True})()
+        mock_gi.histories = type("MockHistories", (), {})()
+        mock_gi.histories.show_dataset_provenance = show_dataset_provenance
+        mock_gi.datasets = type("MockDatasets", (), {})()
+        mock_gi.datasets.show_dataset = lambda dataset_id: {"creating_job": job_id}
+        galaxy_state["gi"] = mock_gi
+
+        responses.add(
+            responses.GET,
+            f"http://localhost:8080/api/jobs/{job_id}",
+            json={"id": job_id, "tool_id": "test_tool", "state": "ok"},
+            status=200,
+        )
+
+        result = get_job_details_fn("dataset123", history_id="history789")
+
+        assert result["job_id"] == job_id
+
+    def test_get_job_details_honors_tls_verify(self):
+        """Test the direct job lookup uses the client's TLS verification setting"""
+        mock_gi = type("MockGI", (), {"verify": "/etc/ssl/galaxy-ca.pem"})()
+        mock_gi.datasets = type("MockDatasets", (), {})()
+        mock_gi.datasets.show_dataset = lambda dataset_id: {"creating_job": "job456"}
+        galaxy_state["gi"] = mock_gi
+
+        with patch("galaxy_mcp.server._galaxy_http.get") as mock_get:
+            mock_get.return_value.content = b'{"id": "job456"}'
+            mock_get.return_value.json.return_value = {"id": "job456"}
+            result = get_job_details_fn("dataset123")
+
+        assert result["job"] == {"id": "job456"}
+        assert mock_get.call_args.kwargs["verify"] == "/etc/ssl/galaxy-ca.pem"
+
     def test_get_job_details_no_job_found(self):
         """Test error when no job information is found"""
         dataset_id = "dataset123"
 
         # Mock the bioblend calls to return no job info
-        mock_gi = type("MockGI", (), {})()
+        mock_gi = type("MockGI", (), {"verify": True})()
         mock_histories = type("MockHistories", (), {})()
         mock_datasets = type("MockDatasets", (), {})()
 
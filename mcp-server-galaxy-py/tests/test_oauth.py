@@ -1,10 +1,26 @@
 """Tests for OAuth-aware functionality."""
 
+import asyncio
+import base64
+import json
+from types import SimpleNamespace
 from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
 
+import httpx
 import pytest
-from galaxy_mcp.auth import GalaxyCredentials
+from cryptography.fernet import Fernet, InvalidToken
+from galaxy_mcp.auth import (
+    AUTH_CODE_TTL_SECONDS,
+    GalaxyAuthenticationError,
+    GalaxyCredentials,
+    GalaxyOAuthProvider,
+    _accepts_gzip,
+    _TokenCipher,
+    get_active_session,
+)
 from galaxy_mcp.server import _OAuthPublicRoutes, ensure_connected
+from mcp.shared.auth import OAuthClientInformationFull
 from starlette.applications import Starlette
 from starlette.responses import JSONResponse, PlainTextResponse
 from starlette.testclient import TestClient
@@ -98,3 +114,451 @@ def test_oauth_public_routes_expose_login_and_metadata():
     # Unsupported methods should flow through to Starlette and return 404
     fallback_response = client.post("/.well-known/oauth-protected-resource")
     assert fallback_response.status_code == 404
+
+
+@pytest.mark.parametrize("use_rfernet", [True, False])
+def test_token_cipher_is_interchangeable_with_cryptography_fernet(use_rfernet, monkeypatch):
+    """Tokens from either Fernet backend decrypt with the other; bad tokens raise InvalidToken."""
+    if use_rfernet:
+        pytest.importorskip("rfernet")
+    else:
+        monkeypatch.setattr("galaxy_mcp.auth.rfernet", None)
+    key = Fernet.generate_key()
+    cipher = _TokenCipher(key)
+
+    assert Fernet(key).decrypt(cipher.encrypt(b"payload").encode()) == b"payload"
+    assert cipher.decrypt(Fernet(key).encrypt(b"payload").decode()) == b"payload"
+    with pytest.raises(InvalidToken):
+        cipher.decrypt("not-a-token")
+
+
+def test_access_tokens_round_trip_through_provider():
+    """Issued access tokens decode back to their Galaxy session payload."""
+    provider = GalaxyOAuthProvider(
+        base_url="https://mcp.example.com",
+        galaxy_url="https://galaxy.example.com",
+        session_secret="test-secret",
+    )
+    galaxy_payload = {"url": "https://galaxy.example.com/", "api_key": "key", "username": "u"}
+    tokens = asyncio.run(
+        provider._issue_tokens(
+            client_id="client", scopes=["galaxy:full"], galaxy_payload=galaxy_payload
+        )
+    )
+
+    payload = provider.decode_access_token(tokens.access_token)
+    assert payload is not None
+    assert payload["galaxy"] == galaxy_payload
+    # A refresh token is not accepted where an access token is expected
+    assert provider.decode_access_token(tokens.refresh_token) is None
+
+    # Fernet's random IV keeps re-issued tokens distinct without a payload nonce
+    again = asyncio.run(
+        provider._issue_tokens(
+            client_id="client", scopes=["galaxy:full"], galaxy_payload=galaxy_payload
+        )
+    )
+    assert again.access_token != tokens.access_token
+    assert "nonce" not in payload
+
+
+def test_decrypted_tokens_are_cached_until_expiry(monkeypatch):
+    """Repeated loads of the same token skip decryption; expired payloads are not cached."""
+    provider = GalaxyOAuthProvider(
+        base_url="https://mcp.example.com",
+        galaxy_url="https://galaxy.example.com",
+        session_secret="test-secret",
+    )
+    tokens = asyncio.run(
+        provider._issue_tokens(
+            client_id="client", scopes=["galaxy:full"], galaxy_payload={"api_key": "key"}
+        )
+    )
+    expired = provider._encrypt_payload({"typ": "access", "exp": 0, "client_id": "client"})
+
+    calls = []
+    real_decrypt = provider._fernet.decrypt
+    monkeypatch.setattr(
+        provider._fernet, "decrypt", lambda token: calls.append(token) or real_decrypt(token)
+    )
+
+    for _ in range(3):
+        assert provider.decode_access_token(tokens.access_token) is not None
+        assert provider.decode_access_token(expired) is None
+    assert calls.count(tokens.access_token) == 1
+    assert calls.count(expired) == 3
+
+    # The cache key includes the expected type, so a cached access token is still
+    # rejected where a refresh token is expected.
+    with pytest.raises(InvalidToken):
+        provider._decrypt_payload(tokens.access_token, expected_type="refresh")
+
+
+def test_token_payloads_decode_with_either_json_backend(monkeypatch):
+    """Tokens minted with orjson decode with the stdlib json fallback and vice versa."""
+    orjson = pytest.importorskip("orjson")
+    provider = GalaxyOAuthProvider(
+        base_url="https://mcp.example.com",
+        galaxy_url="https://galaxy.example.com",
+        session_secret="test-secret",
+    )
+    payload = {"typ": "access", "exp": 1e12, "client_id": "client", "name": "Ünïcode"}
+
+    minted_with_orjson = provider._encrypt_payload(payload)
+    monkeypatch.setattr("galaxy_mcp.auth.orjson", None)
+    assert provider._decrypt_payload(minted_with_orjson, expected_type="access") == payload
+
+    minted_with_json = provider._encrypt_payload(payload)
+    monkeypatch.setattr("galaxy_mcp.auth.orjson", orjson)
+    assert provider._decrypt_payload(minted_with_json, expected_type="access") == payload
+
+
+def test_pending_authorization_transactions_expire_and_are_capped():
+    """Abandoned login flows are pruned by age and by count."""
+    provider = GalaxyOAuthProvider(
+        base_url="https://mcp.example.com",
+        galaxy_url="https://galaxy.example.com",
+        session_secret="test-secret",
+    )
+    client = SimpleNamespace(client_id="client")
+    params = SimpleNamespace(
+        redirect_uri="https://client.example.com/callback",
+        redirect_uri_provided_explicitly=True,
+        state="state",
+        code_challenge="challenge",
+        code_challenge_method="S256",
+        scopes=["galaxy:full"],
+    )
+
+    def start_flow() -> str:
+        login_url = asyncio.run(provider.authorize(client, params))
+        return parse_qs(urlparse(login_url).query)["txn"][0]
+
+    with patch("galaxy_mcp.auth.time.time", return_value=1_000.0):
+        stale = start_flow()
+    with patch("galaxy_mcp.auth.time.time", return_value=1_000.0 + AUTH_CODE_TTL_SECONDS + 1):
+        with patch("galaxy_mcp.auth.MAX_PENDING_TRANSACTIONS", 3):
+            flows = [start_flow() for _ in range(5)]
+
+        assert stale not in provider._transactions
+        assert list(provider._transactions) == flows[-3:]
+        assert provider._get_transaction(flows[-1]) is not None
+    with patch("galaxy_mcp.auth.time.time", return_value=1_000.0 + 3 * AUTH_CODE_TTL_SECONDS):
+        assert provider._get_transaction(flows[-1]) is None
+
+
+def test_get_api_key_uses_pooled_async_client():
+    """Logins exchange Galaxy credentials for an API key over the provider's httpx client."""
+    provider = GalaxyOAuthProvider(
+        base_url="https://mcp.example.com",
+        galaxy_url="https://galaxy.example.com",
+        session_secret="test-secret",
+    )
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(str(request.url))
+        if request.headers["authorization"] == "Basic " + base64.b64encode(b"user:good").decode():
+            return httpx.Response(200, json={"api_key": "minted-key"})
+        return httpx.Response(401)
+
+    async def login_twice():
+        provider._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        key = await provider._get_api_key("user", "good")
+        with pytest.raises(GalaxyAuthenticationError):
+            await provider._get_api_key("user", "bad")
+        await provider.aclose()
+        return key
+
+    assert asyncio.run(login_twice()) == "minted-key"
+    assert seen == ["https://galaxy.example.com/api/authenticate/baseauth"] * 2
+
+    # A repeat login with the same credentials is served from the short-lived cache,
+    # while failed logins are never cached.
+    seen.clear()
+    assert asyncio.run(login_twice()) == "minted-key"
+    assert seen == ["https://galaxy.example.com/api/authenticate/baseauth"]
+    assert provider._http is None
+
+
+def test_concurrent_logins_are_bounded():
+    """Login flows run side by side, but only MAX_CONCURRENT_LOGINS talk to Galaxy at once."""
+    with patch("galaxy_mcp.auth.MAX_CONCURRENT_LOGINS", 2):
+        provider = GalaxyOAuthProvider(
+            base_url="https://mcp.example.com",
+            galaxy_url="https://galaxy.example.com",
+            session_secret="test-secret",
+        )
+    client = SimpleNamespace(client_id="client")
+    params = SimpleNamespace(
+        redirect_uri="https://client.example.com/callback",
+        redirect_uri_provided_explicitly=True,
+        state="state",
+        code_challenge="challenge",
+        code_challenge_method="S256",
+        scopes=["galaxy:full"],
+    )
+    in_flight = 0
+    peak = 0
+
+    async def fake_get_api_key(username, password):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return f"key-{username}"
+
+    async def fake_get_user_info(api_key):
+        return {"username": api_key, "email": None}
+
+    async def login_all():
+        txn_ids = []
+        for _ in range(5):
+            login_url = await provider.authorize(client, params)
+            txn_ids.append(parse_qs(urlparse(login_url).query)["txn"][0])
+        return await asyncio.gather(
+            *(
+                provider._authenticate_and_complete(txn_id, f"user{i}", "pw")
+                for i, txn_id in enumerate(txn_ids)
+            )
+        )
+
+    with (
+        patch.object(provider, "_get_api_key", side_effect=fake_get_api_key),
+        patch.object(provider, "_get_user_info", side_effect=fake_get_user_info),
+    ):
+        redirects = asyncio.run(login_all())
+
+    assert peak == 2
+    assert all(url.startswith("https://client.example.com/callback?code=") for url in redirects)
+
+
+def test_get_user_info_queries_current_user_directly():
+    """The login user lookup is one GET to /api/users/current authenticated by API key."""
+    provider = GalaxyOAuthProvider(
+        base_url="https://mcp.example.com",
+        galaxy_url="https://galaxy.example.com",
+        session_secret="test-secret",
+    )
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert str(request.url) == "https://galaxy.example.com/api/users/current"
+        if request.headers.get("x-api-key") == "good-key":
+            return httpx.Response(200, json={"username": "alice", "email": "a@example.com"})
+        return httpx.Response(403)
+
+    async def look_up_users():
+        provider._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        user = await provider._get_user_info("good-key")
+        with pytest.raises(GalaxyAuthenticationError):
+            await provider._get_user_info("bad-key")
+        await provider.aclose()
+        return user
+
+    assert asyncio.run(look_up_users()) == {"username": "alice", "email": "a@example.com"}
+
+
+def test_client_registry_round_trips_through_disk(tmp_path):
+    """Registered clients are persisted together and loaded back by a fresh provider."""
+    registry = tmp_path / "clients.json"
+
+    def make_provider() -> GalaxyOAuthProvider:
+        return GalaxyOAuthProvider(
+            base_url="https://mcp.example.com",
+            galaxy_url="https://galaxy.example.com",
+            session_secret="test-secret",
+            client_registry_path=registry,
+        )
+
+    client = OAuthClientInformationFull(
+        client_id="client-b", redirect_uris=["https://client.example.com/callback"]
+    )
+    other = OAuthClientInformationFull(
+        client_id="client-a", redirect_uris=["https://other.example.com/callback"]
+    )
+    provider = make_provider()
+
+    async def register_both():
+        with patch.object(
+            provider, "_persist_client_registry", wraps=provider._persist_client_registry
+        ) as persist:
+            await provider.register_client(client)
+            await provider.register_client(other)
+            assert not registry.exists()
+            await provider.aclose()
+        return persist.await_count
+
+    # Registrations in quick succession are coalesced into a single write
+    assert asyncio.run(register_both()) == 1
+    stored = json.loads(registry.read_text())
+    assert [entry["client_id"] for entry in stored] == ["client-a", "client-b"]
+    reloaded = asyncio.run(make_provider().get_client("client-b"))
+    assert reloaded is not None
+    assert [str(uri) for uri in reloaded.redirect_uris] == ["https://client.example.com/callback"]
+
+
+def test_authorization_code_exchange_decrypts_the_code_once(monkeypatch):
+    """Loading and then exchanging a code reuses the cached payload."""
+    provider = GalaxyOAuthProvider(
+        base_url="https://mcp.example.com",
+        galaxy_url="https://galaxy.example.com",
+        session_secret="test-secret",
+    )
+    code = provider._encrypt_payload(
+        {
+            "typ": "authorization_code",
+            "client_id": "client",
+            "scopes": ["galaxy:full"],
+            "code_challenge": "challenge",
+            "redirect_uri": "https://client.example.com/callback",
+            "redirect_uri_provided_explicitly": True,
+            "galaxy": {"api_key": "key"},
+            "exp": 1e12,
+        }
+    )
+    client = SimpleNamespace(client_id="client")
+    calls = []
+    real_decrypt = provider._fernet.decrypt
+    monkeypatch.setattr(
+        provider._fernet, "decrypt", lambda token: calls.append(token) or real_decrypt(token)
+    )
+
+    async def load_and_exchange():
+        authorization_code = await provider.load_authorization_code(client, code)
+        return await provider.exchange_authorization_code(client, authorization_code)
+
+    tokens = asyncio.run(load_and_exchange())
+    assert calls == [code]
+    assert provider.decode_access_token(tokens.access_token)["galaxy"] == {"api_key": "key"}
+
+
+def test_login_handler_rejects_missing_or_unknown_transactions():
+    """The login page answers plain-text 400s when the transaction is absent or stale."""
+    provider = GalaxyOAuthProvider(
+        base_url="https://mcp.example.com",
+        galaxy_url="https://galaxy.example.com",
+        session_secret="test-secret",
+    )
+    client = TestClient(Starlette(routes=provider.get_routes()))
+
+    missing = client.get("/galaxy-auth/login")
+    assert missing.status_code == 400
+    assert missing.text == "Missing transaction identifier."
+    assert missing.headers["content-type"].startswith("text/plain")
+
+    stale = client.get("/galaxy-auth/login", params={"txn": "unknown"})
+    assert stale.status_code == 400
+    assert stale.text == "Authorization request is no longer valid."
+
+
+def test_active_session_credentials_are_cached_per_token():
+    """Repeated tool calls with one bearer token reuse the decoded credentials."""
+    provider = GalaxyOAuthProvider(
+        base_url="https://mcp.example.com",
+        galaxy_url="https://galaxy.example.com",
+        session_secret="test-secret",
+    )
+    galaxy_payload = {"url": "https://galaxy.example.com/", "api_key": "key", "username": "u"}
+    tokens = asyncio.run(
+        provider._issue_tokens(
+            client_id="client", scopes=["galaxy:full"], galaxy_payload=galaxy_payload
+        )
+    )
+    access_token = SimpleNamespace(token=tokens.access_token)
+
+    with (
+        patch("galaxy_mcp.auth._AUTH_PROVIDER", provider),
+        patch.object(provider, "decode_access_token", wraps=provider.decode_access_token) as decode,
+    ):
+        first, api_key = get_active_session(lambda: access_token)
+        second, _ = get_active_session(lambda: access_token)
+        assert decode.call_count == 1
+        assert second is first
+        assert api_key == "key"
+
+        asyncio.run(provider.revoke_token(access_token))
+        get_active_session(lambda: access_token)
+        assert decode.call_count == 2
+
+
+def test_login_form_escapes_dynamic_fields():
+    """The error message and scopes are HTML-escaped when rendered into the login page."""
+    provider = GalaxyOAuthProvider(
+        base_url="https://mcp.example.com",
+        galaxy_url="https://galaxy.example.com",
+        session_secret="test-secret",
+    )
+    transaction = SimpleNamespace(scopes=["galaxy:full", "<b>extra</b>"])
+
+    body = provider._render_login_form(transaction, error="<script>alert(1)</script>").body
+
+    assert b"&lt;script&gt;alert(1)&lt;/script&gt;" in body
+    assert b"galaxy:full, &lt;b&gt;extra&lt;/b&gt;" in body
+    assert b"<script>" not in body
+    assert b"Sign in to <strong>https://galaxy.example.com</strong>" in body
+
+
+def test_default_login_page_is_served_precompressed():
+    """Error-free logins with the default scopes get a cached gzip body."""
+    provider = GalaxyOAuthProvider(
+        base_url="https://mcp.example.com",
+        galaxy_url="https://galaxy.example.com",
+        session_secret="test-secret",
+    )
+    params = SimpleNamespace(
+        redirect_uri="https://client.example.com/callback",
+        redirect_uri_provided_explicitly=True,
+        state="state",
+        code_challenge="challenge",
+        code_challenge_method="S256",
+        scopes=None,
+    )
+    login_url = asyncio.run(provider.authorize(SimpleNamespace(client_id="client"), params))
+    txn = parse_qs(urlparse(login_url).query)["txn"][0]
+    client = TestClient(Starlette(routes=provider.get_routes()))
+
+    compressed = client.get(
+        "/galaxy-auth/login", params={"txn": txn}, headers={"accept-encoding": "gzip"}
+    )
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.text.encode() == provider._login_page_body(("galaxy:full",), None)
+
+    with_error = client.get(
+        "/galaxy-auth/login",
+        params={"txn": txn, "error": "Try again"},
+        headers={"accept-encoding": "gzip"},
+    )
+    assert "content-encoding" not in with_error.headers
+    assert "Try again" in with_error.text
+
+    plain = client.get(
+        "/galaxy-auth/login", params={"txn": txn}, headers={"accept-encoding": "identity"}
+    )
+    assert "content-encoding" not in plain.headers
+    assert plain.text == compressed.text
+
+    refused = client.get(
+        "/galaxy-auth/login", params={"txn": txn}, headers={"accept-encoding": "gzip;q=0, br"}
+    )
+    assert "content-encoding" not in refused.headers
+    assert refused.text == compressed.text
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("gzip", True),
+        ("br, GZIP;q=0.5", True),
+        ("*", True),
+        ("gzip;q=0", False),
+        ("gzip; q=0.0, *", False),
+        ("identity", False),
+        ("*;q=0", False),
+        ("gzip;q=bogus", False),
+        ("", False),
+    ],
+)
+def test_accepts_gzip_honors_q_values(header, expected):
+    """Only codings with a positive q-value count as accepted."""
+    assert _accepts_gzip(header) is expected
@@ -2,13 +2,29 @@
 Test tool-related operations
 """
 
+import concurrent.futures
+import hashlib
 from unittest.mock import patch
 
 import pytest
 
+from galaxy_mcp.server import (
+    _dumps,
+    _private_offload_dir,
+    _server_info_cache,
+    _tool_details_cache,
+)
+
 from .test_helpers import (
+    fetch_ref_fn,
     galaxy_state,
+    get_cache_stats_fn,
+    get_tool_details_batch_fn,
+    get_tool_details_fn,
+    get_tool_panel_fn,
     get_tool_run_examples_fn,
+    refresh_tool_cache_fn,
+    reset_cache_stats_fn,
     run_tool_fn,
     search_tools_fn,
 )
@@ -135,6 +151,18 @@ class TestToolOperations:
             "tool1", tool_version="1.0"
         )
 
+    def test_get_tool_run_examples_is_cached(self, mock_galaxy_instance):
+        """Test definitions are fetched once per tool version"""
+        mock_galaxy_instance.tools.get_tool_tests.return_value = [{"name": "Test-1"}]
+
+        with patch.dict(galaxy_state, {"connected": True, "gi": mock_galaxy_instance}):
+            get_tool_run_examples_fn("tool1", "1.0")
+            result = get_tool_run_examples_fn("tool1", "1.0")
+            get_tool_run_examples_fn("tool1", "2.0")
+
+        assert result["test_cases"] == [{"name": "Test-1"}]
+        assert mock_galaxy_instance.tools.get_tool_tests.call_count == 2
+
     def test_get_tool_run_examples_no_version(self, mock_galaxy_instance):
         """Test retrieving tool run examples without specifying version"""
         mock_galaxy_instance.tools.get_tool_tests.return_value = []
@@ -156,3 +184,206 @@ class TestToolOperations:
         with patch.dict(galaxy_state, {"connected": True, "gi": mock_galaxy_instance}):
             with pytest.raises(ValueError, match="Get tool run examples failed"):
                 get_tool_run_examples_fn("tool1")
+
+    def test_get_tool_details_is_cached(self, mock_galaxy_instance):
+        """Test repeated tool detail lookups are served from the cache"""
+        mock_galaxy_instance.tools.show_tool.return_value = {"id": "tool1", "name": "Tool 1"}
+
+        with patch.dict(
+            galaxy_state,
+            {"connected": True, "gi": mock_galaxy_instance, "url": "https://galaxy.test/"},
+        ):
+            first = get_tool_details_fn("tool1")
+            second = get_tool_details_fn("tool1")
+            get_tool_details_fn("tool1", io_details=True)
+
+        assert first == second == {"id": "tool1", "name": "Tool 1"}
+        assert mock_galaxy_instance.tools.show_tool.call_count == 2
+        mock_galaxy_instance.tools.show_tool.assert_any_call("tool1", io_details=False)
+        mock_galaxy_instance.tools.show_tool.assert_any_call("tool1", io_details=True)
+
+    def test_get_tool_details_error_not_cached(self, mock_galaxy_instance):
+        """Test failed tool lookups are retried on the next call"""
+        mock_galaxy_instance.tools.show_tool.side_effect = [
+            Exception("404 Not Found"),
+            {"id": "tool1"},
+        ]
+
+        with patch.dict(galaxy_state, {"connected": True, "gi": mock_galaxy_instance}):
+            with pytest.raises(ValueError, match="Get tool details failed"):
+                get_tool_details_fn("tool1")
+            assert get_tool_details_fn("tool1") == {"id": "tool1"}
+
+    def test_get_tool_panel_cache_refresh(self, mock_galaxy_instance):
+        """Test the tool panel is cached until refresh_tool_cache is called"""
+        mock_galaxy_instance.tools.get_tool_panel.return_value = [{"id": "section1"}]
+
+        with patch.dict(galaxy_state, {"connected": True, "gi": mock_galaxy_instance}):
+            get_tool_panel_fn()
+            result = get_tool_panel_fn()
+            assert mock_galaxy_instance.tools.get_tool_panel.call_count == 1
+
+            assert refresh_tool_cache_fn()["cleared"] is True
+            get_tool_panel_fn()
+
+        assert result == {"tool_panel": [{"id": "section1"}]}
+        assert mock_galaxy_instance.tools.get_tool_panel.call_count == 2
+
+    def test_get_tool_details_batch(self, mock_galaxy_instance):
+        """Test fetching several tools at once, collecting per-tool errors"""
+
+        def show_tool(tool_id, io_details=False):
+            if tool_id == "missing":
+                raise Exception("404 Not Found")
+            return {"id": tool_id, "io": io_details}
+
+        mock_galaxy_instance.tools.show_tool.side_effect = show_tool
+
+        with patch.dict(galaxy_state, {"connected": True, "gi": mock_galaxy_instance}):
+            result = get_tool_details_batch_fn(["tool1", "tool2", "tool1", "missing"], True)
+
+        assert result["count"] == 2
+        assert result["tools"] == {
+            "tool1": {"id": "tool1", "io": True},
+            "tool2": {"id": "tool2", "io": True},
+        }
+        assert "missing" in result["errors"]
+        assert "Resource not found" in result["errors"]["missing"]
+        assert mock_galaxy_instance.tools.show_tool.call_count == 3
+
+    def test_get_tool_details_batch_caps_workers(self, mock_galaxy_instance):
+        """Test a client-supplied max_workers cannot exceed the Galaxy call limit"""
+        mock_galaxy_instance.tools.show_tool.side_effect = lambda tool_id, io_details: {
+            "id": tool_id
+        }
+        tool_ids = [f"tool{i}" for i in range(50)]
+
+        with patch.dict(galaxy_state, {"connected": True, "gi": mock_galaxy_instance}):
+            with patch("galaxy_mcp.server.GALAXY_CALL_CONCURRENCY", 4):
+                with patch(
+                    "galaxy_mcp.server.concurrent.futures.ThreadPoolExecutor",
+                    wraps=concurrent.futures.ThreadPoolExecutor,
+                ) as mock_executor:
+                    result = get_tool_details_batch_fn(tool_ids, max_workers=10000)
+
+        assert result["count"] == 50
+        mock_executor.assert_called_once_with(max_workers=4)
+
+    def test_cache_stats_track_tool_lookups(self, mock_galaxy_instance):
+        """Test tool cache hits and misses are reported and can be reset"""
+        mock_galaxy_instance.tools.show_tool.return_value = {"id": "tool1"}
+
+        with patch.dict(galaxy_state, {"connected": True, "gi": mock_galaxy_instance}):
+            get_tool_details_fn("tool1")
+            get_tool_details_fn("tool1")
+
+        stats = get_cache_stats_fn()
+        assert stats["tool_details"]["hits"] == 1
+        assert stats["tool_details"]["misses"] == 1
+        assert stats["tool_details"]["size"] == 1
+        assert set(stats) >= {"galaxy_instances", "iwc_manifest", "tool_details", "tool_panel"}
+
+        assert reset_cache_stats_fn() == {"reset": True}
+        stats = get_cache_stats_fn()
+        assert stats["tool_details"]["hits"] == 0
+        assert stats["tool_details"]["size"] == 1
+
+    def test_tool_details_persist_on_disk(self, mock_galaxy_instance, tmp_path):
+        """Test tool details are reused from disk until the Galaxy version changes"""
+        mock_galaxy_instance.tools.show_tool.return_value = {"id": "tool1", "name": "Tool 1"}
+        mock_galaxy_instance.config.get_version.return_value = {"version_major": "24.1"}
+        unrelated = tmp_path / "settings.json"
+        unrelated.write_text("{}")
+
+        with patch("galaxy_mcp.server.TOOL_DISK_CACHE_DIR", tmp_path):
+            with patch.dict(galaxy_state, {"connected": True, "gi": mock_galaxy_instance}):
+                first = get_tool_details_fn("tool1")
+                # A restarted server starts with empty in-memory caches
+                _tool_details_cache.clear()
+                second = get_tool_details_fn("tool1")
+                assert mock_galaxy_instance.tools.show_tool.call_count == 1
+
+                mock_galaxy_instance.config.get_version.return_value = {"version_major": "24.2"}
+                _tool_details_cache.clear()
+                _server_info_cache.clear()
+                get_tool_details_fn("tool1")
+                assert mock_galaxy_instance.tools.show_tool.call_count == 2
+
+                refresh_tool_cache_fn()
+
+        assert first == second == {"id": "tool1", "name": "Tool 1"}
+        # Files the cache did not write survive a refresh
+        assert list(tmp_path.glob("*.json")) == [unrelated]
+
+    def test_get_tool_panel_ref_mode(self, mock_galaxy_instance, tmp_path):
+        """Test the tool panel can be offloaded to disk and fetched back"""
+        panel = [{"id": "section1", "elems": [{"id": "tool1"}]}]
+        mock_galaxy_instance.tools.get_tool_panel.return_value = panel
+
+        with patch("galaxy_mcp.server.OFFLOAD_DIR", tmp_path):
+            with patch.dict(galaxy_state, {"connected": True, "gi": mock_galaxy_instance}):
+                result = get_tool_panel_fn(return_mode="ref")
+
+            assert result["ref"].startswith("file://")
+            assert result["keys"] == ["tool_panel"]
+            assert (tmp_path / f"{result['sha256']}.json").stat().st_size == result["bytes"]
+            assert fetch_ref_fn(result["ref"]) == {"tool_panel": panel}
+
+            with pytest.raises(ValueError, match="Unknown reference"):
+                fetch_ref_fn((tmp_path.parent / "other.json").as_uri())
+
+    def test_get_tool_panel_ref_mode_uses_private_directory(
+        self, mock_galaxy_instance, tmp_path, monkeypatch
+    ):
+        """Test ref mode without an offload directory writes to a private per-process one"""
+        panel = [{"id": "section1"}]
+        mock_galaxy_instance.tools.get_tool_panel.return_value = panel
+        monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+        _private_offload_dir.cache_clear()
+        try:
+            with patch.dict(galaxy_state, {"connected": True, "gi": mock_galaxy_instance}):
+                result = get_tool_panel_fn(return_mode="ref")
+            directory = _private_offload_dir()
+        finally:
+            _private_offload_dir.cache_clear()
+
+        assert directory.parent == tmp_path
+        assert directory.stat().st_mode & 0o777 == 0o700
+        assert (directory / f"{result['sha256']}.json").exists()
+
+    def test_offload_replaces_files_it_did_not_write(self, mock_galaxy_instance, tmp_path):
+        """Test a file planted under the expected digest name is overwritten, not served"""
+        panel = [{"id": "section1"}]
+        mock_galaxy_instance.tools.get_tool_panel.return_value = panel
+        digest = hashlib.sha256(_dumps({"tool_panel": panel})).hexdigest()
+        (tmp_path / f"{digest}.json").write_text('{"tool_panel": "planted"}')
+
+        with patch("galaxy_mcp.server.OFFLOAD_DIR", tmp_path):
+            with patch.dict(galaxy_state, {"connected": True, "gi": mock_galaxy_instance}):
+                result = get_tool_panel_fn(return_mode="ref")
+            assert fetch_ref_fn(result["ref"]) == {"tool_panel": panel}
+
+    def test_get_tool_panel_offloads_above_threshold(self, mock_galaxy_instance, tmp_path):
+        """Test large panels are offloaded automatically once a directory is configured"""
+        mock_galaxy_instance.tools.get_tool_panel.return_value = [{"id": "section1"}]
+
+        with patch("galaxy_mcp.server.OFFLOAD_DIR", tmp_path):
+            with patch.dict(galaxy_state, {"connected": True, "gi": mock_galaxy_instance}):
+                assert "tool_panel" in get_tool_panel_fn()
+                with patch("galaxy_mcp.server.OFFLOAD_THRESHOLD", 10):
+                    assert "ref" in get_tool_panel_fn()
+
+    def test_search_tools_reuses_cached_tool_list(self, mock_galaxy_instance):
+        """Test repeated searches filter a cached tool list until forced to refresh"""
+        mock_galaxy_instance.tools.get_tools.return_value = [
+            {"id": "bwa", "name": "BWA", "description": "Map reads"},
+            {"id": "samtools_sort", "name": "Samtools sort", "description": "Sort BAM"},
+        ]
+
+        with patch.dict(galaxy_state, {"connected": True, "gi": mock_galaxy_instance}):
+            assert [t["id"] for t in search_tools_fn("bwa")["tools"]] == ["bwa"]
+            assert [t["id"] for t in search_tools_fn("SORT")["tools"]] == ["samtools_sort"]
+            assert mock_galaxy_instance.tools.get_tools.call_count == 1
+
+            search_tools_fn("bwa", force_refresh=True)
+            assert mock_galaxy_instance.tools.get_tools.call_count == 2
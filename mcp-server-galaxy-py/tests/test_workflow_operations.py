@@ -5,6 +5,10 @@ Test workflow-related operations
 from unittest.mock import patch
 
 import pytest
+import responses
+
+from galaxy_mcp import server
+from galaxy_mcp.server import IWC_MANIFEST_URL, get_manifest_json, get_session
 
 from .test_helpers import (
     cancel_workflow_invocation_fn,
@@ -15,6 +19,7 @@ from .test_helpers import (
     import_workflow_from_iwc_fn,
     invoke_workflow_fn,
     list_workflows_fn,
+    refresh_iwc_cache_fn,
     search_iwc_workflows_fn,
 )
 
@@ -40,6 +45,88 @@ class TestWorkflowOperations:
             assert len(result["workflows"]) == 2
             assert result["workflows"][0]["trs_id"] == "workflow1"
 
+    @responses.activate
+    def test_get_manifest_json_uses_shared_session(self):
+        """Test the IWC manifest is fetched through the pooled HTTP session"""
+        responses.add(
+            responses.GET,
+            IWC_MANIFEST_URL,
+            json=[{"workflows": [{"trsID": "workflow1"}]}],
+            status=200,
+        )
+
+        with patch.object(get_session(), "get", wraps=get_session().get) as mock_get:
+            manifest = get_manifest_json()
+
+        assert manifest == [{"workflows": [{"trsID": "workflow1"}]}]
+        mock_get.assert_called_once()
+        assert mock_get.call_args.args[0] == IWC_MANIFEST_URL
+
+    @responses.activate
+    def test_get_manifest_json_is_cached(self):
+        """Test repeat manifest lookups are served from memory until refreshed"""
+        responses.add(responses.GET, IWC_MANIFEST_URL, json=[{"workflows": []}], status=200)
+
+        get_manifest_json()
+        get_manifest_json()
+        assert len(responses.calls) == 1
+
+        result = refresh_iwc_cache_fn()
+        assert result["cleared"] is True
+
+        get_manifest_json()
+        assert len(responses.calls) == 2
+
+    @responses.activate
+    def test_get_manifest_json_refetches_after_ttl(self):
+        """Test the manifest is fetched again once the TTL has elapsed"""
+        responses.add(responses.GET, IWC_MANIFEST_URL, json=[{"workflows": []}], status=200)
+
+        with patch("galaxy_mcp.server.IWC_CACHE_TTL", 0):
+            get_manifest_json()
+            get_manifest_json()
+
+        assert len(responses.calls) == 2
+
+    @responses.activate
+    def test_get_manifest_json_revalidates_with_etag(self):
+        """Test an expired manifest is revalidated and reused on 304 Not Modified"""
+        manifest = [{"workflows": [{"trsID": "wf-1"}]}]
+        responses.add(
+            responses.GET,
+            IWC_MANIFEST_URL,
+            json=manifest,
+            status=200,
+            headers={"ETag": '"v1"', "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"},
+        )
+        responses.add(responses.GET, IWC_MANIFEST_URL, status=304)
+
+        with patch("galaxy_mcp.server.IWC_CACHE_TTL", 0):
+            first = get_manifest_json()
+            second = get_manifest_json()
+
+        assert first == manifest
+        assert second is first
+        assert "If-None-Match" not in responses.calls[0].request.headers
+        assert responses.calls[1].request.headers["If-None-Match"] == '"v1"'
+        assert (
+            responses.calls[1].request.headers["If-Modified-Since"]
+            == "Wed, 01 Jan 2025 00:00:00 GMT"
+        )
+
+    @responses.activate
+    def test_get_manifest_json_is_keyed_by_url(self):
+        """Test a cached manifest is not served for a different manifest URL"""
+        mirror_url = "https://mirror.example.org/workflow_manifest.json"
+        responses.add(responses.GET, IWC_MANIFEST_URL, json=[{"workflows": []}], status=200)
+        responses.add(responses.GET, mirror_url, json=[{"workflows": [{"trsID": "m"}]}])
+
+        assert get_manifest_json() == [{"workflows": []}]
+        with patch("galaxy_mcp.server.IWC_MANIFEST_URL", mirror_url):
+            assert get_manifest_json() == [{"workflows": [{"trsID": "m"}]}]
+
+        assert [call.request.url for call in responses.calls] == [IWC_MANIFEST_URL, mirror_url]
+
     def test_search_iwc_workflows_fn(self):
         """Test searching IWC workflows"""
         # Mock the manifest data that get_manifest_json returns
@@ -76,6 +163,51 @@ class TestWorkflowOperations:
             assert "RNA-seq" in result["workflows"][0]["name"]
             assert result["workflows"][0]["trsID"] == "workflow-rna-seq"
 
+    def test_search_iwc_workflows_reuses_index(self):
+        """Test the lowercased search index is built once per manifest"""
+        mock_manifest = [
+            {
+                "workflows": [
+                    {
+                        "trsID": "workflow-chip",
+                        "definition": {"name": "ChIP-seq", "annotation": "", "tags": ["Peaks"]},
+                    }
+                ]
+            }
+        ]
+
+        with patch("galaxy_mcp.server.get_manifest_json", return_value=mock_manifest):
+            with patch(
+                "galaxy_mcp.server._build_iwc_index", wraps=server._build_iwc_index
+            ) as mock_build:
+                assert search_iwc_workflows_fn("peaks")["count"] == 1
+                assert search_iwc_workflows_fn("CHIP")["count"] == 1
+                assert search_iwc_workflows_fn("rna")["count"] == 0
+
+        mock_build.assert_called_once()
+
+    def test_search_iwc_workflows_does_not_match_across_fields(self):
+        """Test a query only matches within a single name, description or tag"""
+        mock_manifest = [
+            {
+                "workflows": [
+                    {
+                        "trsID": "workflow-rna",
+                        "definition": {
+                            "name": "RNA",
+                            "annotation": "seq",
+                            "tags": ["transcriptomics", "QC"],
+                        },
+                    }
+                ]
+            }
+        ]
+
+        with patch("galaxy_mcp.server.get_manifest_json", return_value=mock_manifest):
+            assert search_iwc_workflows_fn("transcript")["count"] == 1
+            assert search_iwc_workflows_fn("rnaseq")["count"] == 0
+            assert search_iwc_workflows_fn("icsqc")["count"] == 0
+
     def test_import_workflow_from_iwc_fn(self, mock_galaxy_instance):
         """Test importing workflow from IWC"""
         # Mock the manifest data that get_manifest_json returns
@@ -99,6 +231,17 @@ class TestWorkflowOperations:
                 assert result["imported_workflow"]["id"] == "imported_workflow_1"
                 assert result["imported_workflow"]["name"] == "Test Workflow"
 
+    def test_import_workflow_from_iwc_unknown_trs_id(self, mock_galaxy_instance):
+        """Test importing a workflow that is not in the IWC manifest"""
+        mock_manifest = [{"workflows": [{"trsID": "other-workflow", "definition": {}}]}]
+
+        with patch("galaxy_mcp.server.get_manifest_json", return_value=mock_manifest):
+            with patch.dict(galaxy_state, {"connected": True, "gi": mock_galaxy_instance}):
+                with pytest.raises(ValueError, match="not found in IWC manifest"):
+                    import_workflow_from_iwc_fn("test-workflow")
+
+        mock_galaxy_instance.workflows.import_workflow_dict.assert_not_called()
+
     def test_get_invocations_fn(self, mock_galaxy_instance):
         """Test getting workflow invocations"""
         mock_galaxy_instance.invocations.get_invocations.return_value = [